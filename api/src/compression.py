@@ -0,0 +1,122 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+A pure ASGI middleware (like disconnect handling, it must not wrap the request
+receive channel): complete bodies of at least `minimum_size` bytes are
+compressed with brotli (when the `brotli` package is installed) or gzip.
+Streaming responses (more than one body message) pass through unchanged.
+"""
+
+from __future__ import annotations
+
+import gzip
+from typing import Optional
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _accepted(header: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (None: send identity)."""
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        # Ties keep the earlier (better-compressing) candidate.
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = DEFAULT_MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+
+        start = None
+
+        async def _send(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            response_start, start = start, None
+            body = message.get("body", b"")
+            headers = [(k, v) for k, v in response_start.get("headers", ())]
+            names = {k.lower() for k, _ in headers}
+            content_type = next((v.decode("latin-1") for k, v in headers if k.lower() == b"content-type"), "")
+            eligible = (
+                b"content-encoding" not in names
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+                and response_start["status"] not in (204, 304)
+            )
+            if eligible:
+                headers = _add_vary(headers)
+            if eligible and encoding and not message.get("more_body") and len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers = [(k, v) for k, v in headers if k.lower() != b"content-length"]
+                headers += [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ]
+                message = {**message, "body": body}
+            await send({**response_start, "headers": headers})
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+
+def _add_vary(headers: list) -> list:
+    for i, (k, v) in enumerate(headers):
+        if k.lower() == b"vary":
+            if b"accept-encoding" in v.lower() or v.strip() == b"*":
+                return headers
+            headers[i] = (k, v + b", Accept-Encoding")
+            return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
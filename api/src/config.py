@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 
 DEFAULT_OLLAMA_URL = "http://host.docker.internal:11434"
@@ -10,6 +11,30 @@ DEFAULT_OLLAMA_MODEL = "html-model:latest"
 class Settings:
     ollama_url: str
     ollama_model: str
+    # None => warm up every registered format; () => skip warm-up.
+    parser_warmup: Optional[Tuple[str, ...]] = None
+    parse_workers: int = 2
+    # Run extraction in sandboxed, recycled worker processes (see pipeline/sandbox.py).
+    parser_sandbox: bool = True
+    parser_cpu_seconds: int = 30
+    parser_memory_mb: int = 1024
+    # Memory one document may take (0: no per-document budget); see runtime/memory.py.
+    parser_doc_memory_mb: float = 0
+    parser_timeout_seconds: float = 60.0
+    parser_max_jobs_per_worker: int = 50
+    # Shared secret for /debug/* and per-request profiling; None disables them.
+    debug_token: Optional[str] = None
+
+
+def _parse_suffixes(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    suffixes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        if part:
+            suffixes.append(part if part.startswith(".") else f".{part}")
+    return tuple(suffixes)
 
 
 def get_settings() -> Settings:
@@ -17,10 +42,31 @@ def get_settings() -> Settings:
     Environment variables:
     - OLLAMA_URL (default: http://host.docker.internal:11434)
     - OLLAMA_MODEL (default: html-model:latest)
+    - PARSER_WARMUP (default: all formats; comma-separated suffixes, e.g. "pdf,docx"; empty disables)
+    - PARSE_WORKERS (default: CPU count, max 4): concurrent /parse extractions; extra uploads queue
+    - PARSER_SANDBOX (default: 1): parse in isolated worker processes; 0 parses in-process
+    - PARSER_CPU_SECONDS (default: 30): CPU time per document
+    - PARSER_MEMORY_MB (default: 1024): address-space limit per worker process
+    - PARSER_DOC_MEMORY_MB (default: 0 = none): memory budget per document; larger ones are rejected when sandboxed
+    - MEMORY_TRACE (default: 0): record peak Python allocation per extraction with tracemalloc (slow)
+    - PARSER_TIMEOUT_SECONDS (default: 60): wall-clock limit per document
+    - PARSER_MAX_JOBS_PER_WORKER (default: 50): documents before a worker is recycled
+    - DEBUG_TOKEN (default: unset): enables debug endpoints / request profiling for callers sending it
     """
     ollama_url = os.getenv("OLLAMA_URL", DEFAULT_OLLAMA_URL).rstrip("/")
     ollama_model = os.getenv("OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL)
-    return Settings(ollama_url=ollama_url, ollama_model=ollama_model)
-
-
-
+    parser_warmup = _parse_suffixes(os.getenv("PARSER_WARMUP"))
+    parse_workers = max(1, int(os.getenv("PARSE_WORKERS") or min(4, os.cpu_count() or 1)))
+    return Settings(
+        ollama_url=ollama_url,
+        ollama_model=ollama_model,
+        parser_warmup=parser_warmup,
+        parse_workers=parse_workers,
+        parser_sandbox=os.getenv("PARSER_SANDBOX", "1").strip().lower() not in ("0", "false", "no", ""),
+        parser_cpu_seconds=int(os.getenv("PARSER_CPU_SECONDS") or 30),
+        parser_memory_mb=int(os.getenv("PARSER_MEMORY_MB") or 1024),
+        parser_doc_memory_mb=float(os.getenv("PARSER_DOC_MEMORY_MB") or 0),
+        parser_timeout_seconds=float(os.getenv("PARSER_TIMEOUT_SECONDS") or 60),
+        parser_max_jobs_per_worker=int(os.getenv("PARSER_MAX_JOBS_PER_WORKER") or 50),
+        debug_token=os.getenv("DEBUG_TOKEN") or None,
+    )
@@ -0,0 +1,94 @@
+"""
+Debug endpoints and authentication for request profiling.
+
+Everything here is disabled unless DEBUG_TOKEN is set, and callers must send
+the token in the X-Debug-Token header.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from backend.src.runtime.cache import get_cache  # type: ignore
+from backend.src.runtime.profiling import StackSampler  # type: ignore
+
+from .config import get_settings
+from .responses import FastJSONResponse
+
+TOKEN_HEADER = "X-Debug-Token"
+# Sent (with a valid token) to profile a single request.
+PROFILE_HEADER = "X-Debug-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_CACHE_SIZE = 32
+PROFILE_TTL_SECONDS = 3600
+
+MAX_SAMPLE_SECONDS = 60.0
+DEFAULT_SAMPLE_HZ = 100
+MAX_SAMPLE_HZ = 1000
+# One sampling session per process at a time.
+_sampling = threading.Lock()
+
+router = APIRouter(prefix="/debug")
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    expected = get_settings().debug_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
+
+
+def profile_store():
+    return get_cache("profiles", maxsize=PROFILE_CACHE_SIZE, ttl_seconds=PROFILE_TTL_SECONDS)
+
+
+def _error(code: str, message: str, status_code: int) -> FastJSONResponse:
+    return FastJSONResponse(status_code=status_code, content={"ok": False, "error": {"code": code, "message": message}})
+
+
+def _denied() -> FastJSONResponse:
+    # Unconfigured and bad-token look the same from outside.
+    return _error("NOT_FOUND", "Not found", 404)
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, request: Request):
+    """cProfile report (text, sorted by cumulative time) of a profiled request."""
+    if not is_authorized(request.headers.get(TOKEN_HEADER)):
+        return _denied()
+    report = profile_store().get(profile_id)
+    if report is None:
+        return _error("PROFILE_NOT_FOUND", "Unknown or expired profile", 404)
+    return PlainTextResponse(report)
+
+
+@router.get("/profile")
+async def sample_profile(request: Request, seconds: float = 5.0, hz: int = DEFAULT_SAMPLE_HZ):
+    """
+    Sample the stacks of every thread in this worker process for `seconds` at
+    `hz` samples per second; returns collapsed stacks (flamegraph input).
+
+    Sandboxed parser processes are not included; their time shows up as the
+    parse thread waiting in ParserPool.run.
+    """
+    if not is_authorized(request.headers.get(TOKEN_HEADER)):
+        return _denied()
+    if not 0 < seconds <= MAX_SAMPLE_SECONDS:
+        return _error("BAD_REQUEST", f"seconds must be in (0, {MAX_SAMPLE_SECONDS:g}]", 400)
+    if not 1 <= hz <= MAX_SAMPLE_HZ:
+        return _error("BAD_REQUEST", f"hz must be between 1 and {MAX_SAMPLE_HZ}", 400)
+    if not _sampling.acquire(blocking=False):
+        return _error("PROFILER_BUSY", "A sampling session is already running", 409)
+    try:
+        sampler = StackSampler(1.0 / hz)
+        # Sample from a worker thread so the event loop keeps serving (and shows up in the samples).
+        await asyncio.to_thread(sampler.run, seconds)
+    finally:
+        _sampling.release()
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
@@ -0,0 +1,78 @@
+"""Run blocking work off the event loop; abandon it on client disconnect or deadline."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+
+from backend.src.runtime import metrics  # type: ignore
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.deadline import Deadline, DeadlineExceeded  # type: ignore
+from backend.src.runtime.timing import bind  # type: ignore
+
+POLL_INTERVAL_SECONDS = 0.25
+
+CANCELLED_TOTAL = metrics.counter(
+    "resumeai_cancelled_total",
+    "Work abandoned because the client disconnected (stage: queued or running).",
+    ("endpoint", "stage"),
+)
+DEADLINE_EXCEEDED_TOTAL = metrics.counter(
+    "resumeai_deadline_exceeded_total",
+    "Work abandoned because its request deadline ran out.",
+    ("endpoint",),
+)
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def run_cancellable(
+    request: Request,
+    endpoint: str,
+    fn: Callable[[CancelToken], Any],
+    *,
+    executor: Optional[Executor] = None,
+    deadline: Optional[Deadline] = None,
+) -> Any:
+    """
+    Run `fn(token)` in `executor` while watching for the client to go away.
+
+    On disconnect the token is cancelled (aborting upstream I/O / extraction),
+    a still-queued job is dropped from the executor, and ClientDisconnected is raised.
+    If `deadline` passes first, the job is abandoned the same way and
+    DeadlineExceeded is raised instead.
+    """
+    token = CancelToken()
+    started = threading.Event()
+
+    def _job() -> Any:
+        started.set()
+        token.raise_if_cancelled()
+        return fn(token)
+
+    loop = asyncio.get_running_loop()
+    # bind(): keep the request's timing collector (and profiler) in the worker thread.
+    future = loop.run_in_executor(executor, bind(_job))
+    while True:
+        timeout = POLL_INTERVAL_SECONDS
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        done, _ = await asyncio.wait({future}, timeout=timeout)
+        if done:
+            return future.result()
+        if deadline is not None and deadline.expired:
+            token.cancel()
+            future.cancel()
+            DEADLINE_EXCEEDED_TOTAL.inc(endpoint=endpoint)
+            raise DeadlineExceeded()
+        if await request.is_disconnected():
+            token.cancel()
+            future.cancel()
+            CANCELLED_TOTAL.inc(endpoint=endpoint, stage="running" if started.is_set() else "queued")
+            raise ClientDisconnected()
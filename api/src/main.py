@@ -1,10 +1,13 @@
 """FastAPI application for resume parsing API."""
 
+import logging
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 # Ensure the repository root (containing `backend/`) is importable regardless of
 # where uvicorn is started from (prevents PIPELINE_UNAVAILABLE in /parse).
@@ -12,9 +15,50 @@ _REPO_ROOT = Path(__file__).resolve().parents[2]
 if (_REPO_ROOT / "backend").exists():
     sys.path.insert(0, str(_REPO_ROOT))
 
-from .routes import router
+from .compression import CompressionMiddleware
+from .config import get_settings
+from .debug import PROFILE_ID_HEADER
+from .debug import router as debug_router
+from .responses import FastJSONResponse
+from .server_timing import ServerTimingMiddleware
+from .routes import get_parser_pool, router, shutdown_parser_pool
 
-app = FastAPI(title="ResumeAI API", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Load the parsing pipeline (pdfminer, python-docx, ...) before serving so the
+    # first /parse request doesn't pay for the imports.
+    settings = get_settings()
+    suffixes = settings.parser_warmup
+    if suffixes != ():
+        try:
+            from backend.src.resume.parse_service import warm_up  # type: ignore
+
+            # With the sandbox on, extraction only runs in the parser workers (which
+            # warm themselves up), so keep pdfminer & co. out of every API worker.
+            timings = warm_up(() if settings.parser_sandbox else suffixes)
+            logger.info("Parser warm-up done: %s", {k: round(v, 3) for k, v in timings.items()})
+        except Exception as e:
+            # /parse reports PIPELINE_UNAVAILABLE per request; don't block startup.
+            logger.warning("Parser warm-up failed: %s", e)
+        try:
+            pool = get_parser_pool()
+            if pool is not None:
+                pool.prestart()
+        except Exception as e:
+            logger.warning("Parser worker start-up failed: %s", e)
+    yield
+    shutdown_parser_pool()
+
+
+app = FastAPI(
+    title="ResumeAI API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -28,14 +72,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", PROFILE_ID_HEADER],
 )
 
+# gzip/brotli for larger JSON bodies (parse results with full tips)
+app.add_middleware(CompressionMiddleware)
+
+# Per-stage durations on every response (outermost, so `total` covers everything)
+app.add_middleware(ServerTimingMiddleware)
+
 # Include routes
 app.include_router(router)
+app.include_router(debug_router)
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"ok": True}
+    """
+    Health check endpoint. Also reports the Ollama circuit breaker (`closed`,
+    `open` while failing fast, `half_open` while probing); the API itself stays
+    healthy either way.
+    """
+    from backend.src.llm import ollama_client  # type: ignore
+
+    return {"ok": True, "ollama": {"circuit": ollama_client.breaker_for(ollama_client.get_settings()).snapshot()}}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text-format metrics for this worker process."""
+    from backend.src.runtime.metrics import render  # type: ignore
 
+    return render()
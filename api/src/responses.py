@@ -0,0 +1,11 @@
+"""JSON response class used by the API (orjson when installed)."""
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    FastJSONResponse = JSONResponse  # type: ignore[misc,assignment]
+
+__all__ = ["FastJSONResponse"]
@@ -1,180 +1,398 @@
 """API routes for resume parsing."""
 
+import asyncio
+import functools
+import hashlib
+import json
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File
-from fastapi.responses import JSONResponse
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 
+from backend.src.runtime.deadline import Deadline, DeadlineExceeded  # type: ignore
+from backend.src.runtime.timing import bind, stage  # type: ignore
+
+from .config import get_settings
+from .disconnect import ClientDisconnected, run_cancellable
+from .responses import FastJSONResponse
+
 router = APIRouter()
 
+# Bounded pool for CPU-bound extraction; uploads beyond the limit queue here and
+# can be dropped before starting if their client disconnects.
+_parse_executor = ThreadPoolExecutor(max_workers=get_settings().parse_workers, thread_name_prefix="parse")
+
+# Sandboxed worker processes doing the actual extraction (one per executor thread).
+_parser_pool = None
+
+# Status code logged for requests abandoned by the client (nginx convention).
+CLIENT_CLOSED_REQUEST = 499
+
+# Optional per-request deadline: header or `?deadline_ms=` query parameter.
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+MAX_DEADLINE_MS = 10 * 60 * 1000
+# Time kept back from the LLM stage so the heuristic fallback can still answer in budget.
+FALLBACK_RESERVE_SECONDS = 0.05
+# Share of the deadline given to text extraction when a request also runs the LLM.
+EXTRACTION_BUDGET_FRACTION = 0.4
+
 ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_SCORE = 1000
 
+# Compact responses (`?compact=1`) send tips as refs into the cacheable /tips/catalog.
+TIPS_CATALOG_PATH = "/tips/catalog"
+TIPS_CATALOG_MAX_AGE_SECONDS = 24 * 60 * 60
+_tips_catalog_body: Optional[bytes] = None
+_tips_catalog_etag: Optional[str] = None
+
 
 class AnalyzeRequest(BaseModel):
-    cv_text: str
+    # Either the CV text itself or the `resume_id` returned by /parse.
+    cv_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    # Either the job text itself or the `job_id` returned by /jobs.
+    job_text: Optional[str] = None
+    job_id: Optional[str] = None
+    # Analyse per section and only send sections changed since a previous run.
+    incremental: bool = False
+    # Model tier: "quick", "deep", or "auto" (picked from input size and load).
+    tier: str = "auto"
+    # Map-reduce: analyse long inputs in parallel chunks and merge the results.
+    chunked: bool = False
+
+
+class JobRequest(BaseModel):
     job_text: str
+    # Model tier for the requirement extraction (see AnalyzeRequest.tier).
+    tier: str = "auto"
+
+
+class RankRequest(BaseModel):
+    job_text: str
+    k: int = 10
+    # "lexical": weighted term overlap; "semantic": embedding similarity (Ollama embeddings).
+    mode: str = "lexical"
+
+
+class _Failure(Exception):
+    """Carries an error response out of a helper shared by several endpoints."""
 
+    def __init__(self, response: Response):
+        super().__init__(response.status_code)
+        self.response = response
 
-def _error(code: str, message: str, *, details=None, status_code: int = 500) -> JSONResponse:
+
+def get_parser_pool():
+    """The shared ParserPool, or None when PARSER_SANDBOX is disabled."""
+    global _parser_pool
+    settings = get_settings()
+    if not settings.parser_sandbox:
+        return None
+    if _parser_pool is None:
+        from backend.src.pipeline.sandbox import ParserPool, SandboxLimits  # type: ignore
+
+        _parser_pool = ParserPool(
+            settings.parse_workers,
+            SandboxLimits(
+                cpu_seconds=settings.parser_cpu_seconds,
+                memory_bytes=settings.parser_memory_mb * 1024 * 1024,
+                document_memory_bytes=int(settings.parser_doc_memory_mb * 1024 * 1024),
+                wall_seconds=settings.parser_timeout_seconds,
+                max_jobs_per_worker=settings.parser_max_jobs_per_worker,
+            ),
+        )
+    return _parser_pool
+
+
+def shutdown_parser_pool() -> None:
+    global _parser_pool
+    if _parser_pool is not None:
+        _parser_pool.close()
+        _parser_pool = None
+
+
+def _error_payload(code: str, message: str, *, details=None) -> dict:
     payload = {"ok": False, "error": {"code": code, "message": message}}
     if details is not None:
         payload["error"]["details"] = details
-    return JSONResponse(status_code=status_code, content=payload)
+    return payload
 
 
-@router.post("/analyze")
-async def analyze(req: AnalyzeRequest):
-    cv_text = (req.cv_text or "").strip()
-    job_text = (req.job_text or "").strip()
-    if not cv_text or not job_text:
-        return _error(
-            "BAD_REQUEST",
-            "cv_text and job_text are required",
-            details={"cv_text": bool(cv_text), "job_text": bool(job_text)},
-            status_code=400,
-        )
+def _error(code: str, message: str, *, details=None, status_code: int = 500) -> FastJSONResponse:
+    return FastJSONResponse(status_code=status_code, content=_error_payload(code, message, details=details))
+
+
+def _ollama_status(code) -> int:
+    # An open circuit means we didn't even try: unavailable, not a bad gateway.
+    return 503 if code == "OLLAMA_CIRCUIT_OPEN" else 502
+
+
+def _compact(request: Request) -> bool:
+    return request.query_params.get("compact", "").strip().lower() in ("1", "true", "yes")
+
+
+def _tips_catalog() -> tuple[bytes, str]:
+    """Serialized tip catalog and its ETag (computed once; the catalog is static)."""
+    global _tips_catalog_body, _tips_catalog_etag
+    if _tips_catalog_body is None:
+        from backend.src.resume.score_service import TIP_CATALOG  # type: ignore
+
+        body = json.dumps({"ok": True, "tips": TIP_CATALOG}, sort_keys=True, separators=(",", ":")).encode()
+        _tips_catalog_etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        _tips_catalog_body = body
+    return _tips_catalog_body, _tips_catalog_etag
+
+
+def _score_payload(stored, compact: bool) -> tuple[int, list[dict], dict]:
+    """Score + tips (full or compact) of a StoredResume and the extra keys a compact response carries."""
+    from backend.src.resume.score_service import compact_tip, render_tip, score_refs  # type: ignore
+
+    with stage("score"):
+        score_value, refs = score_refs(stored.normalized, stored.text)
+    if not compact:
+        return score_value, [render_tip(t) for t in refs], {}
+    _body, etag = _tips_catalog()
+    extra = {"tips_catalog": {"url": TIPS_CATALOG_PATH, "etag": etag}}
+    return score_value, [compact_tip(t) for t in refs], extra
+
+
+def _request_deadline(request: Request) -> Deadline | None:
+    """Parse the optional deadline; raises ValueError if it is malformed."""
+    raw = request.headers.get(DEADLINE_HEADER) or request.query_params.get("deadline_ms")
+    if raw is None or not raw.strip():
+        return None
+    ms = int(raw)
+    if ms <= 0 or ms > MAX_DEADLINE_MS:
+        raise ValueError(f"deadline must be between 1 and {MAX_DEADLINE_MS} ms")
+    return Deadline.after(ms / 1000.0)
+
+
+def _deadline_error(e: ValueError) -> FastJSONResponse:
+    return _error("BAD_REQUEST", "Invalid deadline", details=str(e), status_code=400)
+
+
+def _degraded_analysis(cv_text: str, normalized: Optional[dict] = None) -> dict:
+    """Deterministic score + tips for the CV, used when the LLM misses its budget."""
+    from backend.src.resume.parse_service import parse_text  # type: ignore
+    from backend.src.resume.score_service import score  # type: ignore
+
+    normalized = normalized if normalized is not None else parse_text(cv_text)
+    with stage("score"):
+        score_value, tips = score(normalized, cv_text)
+    return {
+        "ok": True,
+        "score": score_value,
+        "tips": tips,
+        "analysis": None,
+        "tier": None,
+        "model": None,
+        "degraded": True,
+        "degraded_reason": "DEADLINE_EXCEEDED",
+    }
+
+
+def _tier_error(tier: Optional[str]) -> Optional[Response]:
+    """The 400 response for an unknown analysis tier, or None."""
+    try:
+        from backend.src.llm.tiers import REQUESTABLE  # type: ignore
+    except Exception as e:
+        return _error("INTERNAL_ERROR", "Internal error", details=str(e), status_code=500)
+    if (tier or "").strip().lower() in REQUESTABLE:
+        return None
+    return _error(
+        "BAD_REQUEST", f"tier must be one of {', '.join(REQUESTABLE)}", details={"tier": tier}, status_code=400
+    )
+
+
+async def _run_analysis(
+    request: Request,
+    endpoint: str,
+    cv_text: str,
+    job_text: str,
+    deadline: Optional[Deadline],
+    *,
+    normalized: Optional[dict] = None,
+    incremental: bool = False,
+    chunked: bool = False,
+    tier: str = "auto",
+) -> tuple[int, dict]:
+    """
+    Run the LLM analysis and map domain errors to (status_code, payload).
+    The payload names the tier and model that served it.
 
+    ClientDisconnected propagates so each endpoint can drop the response.
+    """
     try:
+        from backend.src.llm import tiers  # type: ignore
         from backend.src.llm.analyze_service import DomainError, analyze  # type: ignore
+        from backend.src.llm.chunked_analysis import InputTooLarge, analyze_chunked, plan_chunks  # type: ignore
+        from backend.src.llm.section_analysis import analyze_incremental  # type: ignore
 
-        result = analyze(cv_text, job_text)
-        return {
+        llm_deadline = deadline.slice(reserve=FALLBACK_RESERVE_SECONDS) if deadline is not None else None
+        sections = normalized.get("sections") if normalized is not None else None
+        # The tier is picked for the largest single prompt (a chunk's, when chunked).
+        prompt_chars = len(cv_text) + len(job_text)
+        plan = None
+        if chunked:
+            plan = plan_chunks(cv_text, job_text, sections=sections)
+            prompt_chars = plan.prompt_chars
+        model_tier = tiers.resolve(tier, prompt_chars)
+
+        def _job(token):
+            if chunked:
+                return analyze_chunked(
+                    cv_text, job_text, plan=plan, cancel=token, deadline=llm_deadline, tier=model_tier
+                )
+            if incremental:
+                return analyze_incremental(
+                    cv_text, job_text, sections=sections, cancel=token, deadline=llm_deadline, tier=model_tier
+                )
+            return analyze(cv_text, job_text, cancel=token, deadline=llm_deadline, tier=model_tier)
+
+        # Closing the tab (or running out of budget) aborts the Ollama request so
+        # the model stops generating.
+        result = await run_cancellable(request, endpoint, _job, deadline=llm_deadline)
+        return 200, {
             "ok": True,
             "score": result.score,
             "tips": [t.model_dump() for t in result.tips],
             "analysis": result.analysis,
+            "tier": model_tier.name,
+            "model": model_tier.model,
+            "degraded": False,
         }
+    except DeadlineExceeded:
+        try:
+            return 200, _degraded_analysis(cv_text, normalized)
+        except Exception as e:
+            return 504, _error_payload("DEADLINE_EXCEEDED", "Deadline exceeded", details=str(e))
+    except InputTooLarge as e:
+        return 413, _error_payload(e.code, e.message, details=e.details)
     except DomainError as e:
         # Preserve previous contract: invalid JSON parse => code only (no message).
         if e.code == "INVALID_MODEL_OUTPUT" and e.message is None and e.details is None:
-            return JSONResponse(
-                status_code=502,
-                content={"ok": False, "error": {"code": "INVALID_MODEL_OUTPUT"}},
-            )
-        return _error(str(e.code), e.message or "Invalid model output", details=e.details, status_code=502)
+            return 502, {"ok": False, "error": {"code": "INVALID_MODEL_OUTPUT"}}
+        return 502, _error_payload(str(e.code), e.message or "Invalid model output", details=e.details)
+    except ClientDisconnected:
+        raise
     except RuntimeError as e:
         code = e.args[0] if len(e.args) > 0 else "OLLAMA_ERROR"
         details = e.args[1] if len(e.args) > 1 else None
-        return _error(
-            str(code),
-            "Ollama request failed",
-            details=details,
-            status_code=502,
-        )
+        return _ollama_status(code), _error_payload(str(code), "Ollama request failed", details=details)
     except Exception as e:
-        return _error("INTERNAL_ERROR", "Internal error", details=str(e), status_code=500)
+        return 500, _error_payload("INTERNAL_ERROR", "Internal error", details=str(e))
 
 
-@router.post("/parse")
-async def parse_resume_endpoint(file: UploadFile = File(...)):
+async def _parse_upload(request: Request, file: UploadFile, endpoint: str, deadline: Optional[Deadline]):
     """
-    Parse a resume file and return normalized data.
-    
-    Accepts: PDF, DOC, DOCX files via multipart/form-data
-    Returns: JSON with normalized resume data
+    Validate an upload and return its StoredResume, parsing it unless the same
+    file (by content hash) is already in the resume store.
+
+    Raises:
+        _Failure: With the error response to return
+        ClientDisconnected: If the client went away while parsing
     """
     # Validate file extension
     file_ext = Path(file.filename or "").suffix.lower()
     if file_ext not in ALLOWED_EXTENSIONS:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "ok": False,
-                "error": {
-                    "code": "UNSUPPORTED_FILE_TYPE",
-                    "message": f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-                }
-            }
-        )
-    
-    # Save uploaded file to temporary location
-    temp_path = None
-    try:
-        # Read file content to check size
-        content = await file.read()
-        
-        # Validate file size
-        if len(content) > MAX_FILE_SIZE:
-            return JSONResponse(
+        raise _Failure(
+            _error(
+                "UNSUPPORTED_FILE_TYPE",
+                f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
                 status_code=400,
-                content={
-                    "ok": False,
-                    "error": {
-                        "code": "FILE_TOO_LARGE",
-                        "message": f"File size exceeds maximum of {MAX_FILE_SIZE / (1024 * 1024):.0f}MB"
-                    }
-                }
             )
-        
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            temp_file.write(content)
-            temp_path = temp_file.name
-        
-        # Parse resume
-        try:
-            try:
-                from backend.src.resume.parse_service import parse  # type: ignore
-                from backend.src.resume.score_service import score  # type: ignore
-            except Exception as e:
-                return JSONResponse(
-                    status_code=500,
-                    content={
-                        "ok": False,
-                        "error": {
-                            "code": "PIPELINE_UNAVAILABLE",
-                            "message": "Resume parsing pipeline is not available in this environment",
-                            "details": str(e),
-                        },
-                    },
-                )
+        )
 
-            normalized_data = parse(temp_path)
-            score_value, tips = score(normalized_data)
-            
-            return {
-                "ok": True,
-                "data": normalized_data,
-                "score": {"value": score_value, "max": MAX_SCORE},
-                "tips": tips,
-            }
-        except FileNotFoundError as e:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "ok": False,
-                    "error": {
-                        "code": "FILE_NOT_FOUND",
-                        "message": str(e)
-                    }
-                }
-            )
-        except ValueError as e:
-            return JSONResponse(
+    # Read file content to check size
+    with stage("spool"):
+        content = await file.read()
+
+    # Validate file size
+    if len(content) > MAX_FILE_SIZE:
+        raise _Failure(
+            _error(
+                "FILE_TOO_LARGE",
+                f"File size exceeds maximum of {MAX_FILE_SIZE / (1024 * 1024):.0f}MB",
                 status_code=400,
-                content={
-                    "ok": False,
-                    "error": {
-                        "code": "PARSING_FAILED",
-                        "message": str(e)
-                    }
-                }
             )
-        except Exception as e:
-            return JSONResponse(
+        )
+
+    try:
+        from backend.src.pipeline.extractors import UnsafeDocument  # type: ignore
+        from backend.src.pipeline.sandbox import ParserKilled  # type: ignore
+        from backend.src.resume import store  # type: ignore
+        from backend.src.resume.parse_service import parse_with_text  # type: ignore
+        from backend.src.runtime.memory import MemoryBudgetExceeded  # type: ignore
+    except Exception as e:
+        raise _Failure(
+            _error(
+                "PIPELINE_UNAVAILABLE",
+                "Resume parsing pipeline is not available in this environment",
+                details=str(e),
                 status_code=500,
-                content={
-                    "ok": False,
-                    "error": {
-                        "code": "INTERNAL_ERROR",
-                        "message": f"Internal error: {str(e)}"
-                    }
-                }
             )
+        )
+
+    resume_id = store.resume_id_for(content)
+    cached = store.get(resume_id)
+    if cached is not None:
+        return cached
+
+    # Save uploaded file to temporary location
+    temp_path = None
+    try:
+        with stage("spool"), tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
+            temp_file.write(content)
+            temp_path = temp_file.name
+
+        pool = get_parser_pool()
+
+        def _parse_job(token):
+            if pool is None:
+                return parse_with_text(temp_path, cancel=token)
+            # Cancellation (disconnect / deadline) kills the worker process.
+            return pool.run(parse_with_text, temp_path, cancel=token)
+
+        text, normalized_data = await run_cancellable(
+            request,
+            endpoint,
+            _parse_job,
+            executor=_parse_executor,
+            deadline=deadline,
+        )
+        return store.put(resume_id, text, normalized_data)
+    except ClientDisconnected:
+        raise
+    except DeadlineExceeded:
+        raise _Failure(
+            _error("DEADLINE_EXCEEDED", "Resume parsing did not finish within the deadline", status_code=504)
+        )
+    except ParserKilled as e:
+        raise _Failure(
+            _error(e.code, "Resume parsing was stopped: " + e.message, details={"reason": e.reason}, status_code=422)
+        )
+    except UnsafeDocument as e:
+        raise _Failure(_error("UNSAFE_DOCUMENT", str(e), status_code=422))
+    except MemoryBudgetExceeded as e:
+        raise _Failure(
+            _error(
+                e.code,
+                str(e),
+                details={"budget_bytes": e.budget_bytes, "used_bytes": e.used_bytes},
+                status_code=422,
+            )
+        )
+    except FileNotFoundError as e:
+        raise _Failure(_error("FILE_NOT_FOUND", str(e), status_code=404))
+    except ValueError as e:
+        raise _Failure(_error("PARSING_FAILED", str(e), status_code=400))
+    except Exception as e:
+        raise _Failure(_error("INTERNAL_ERROR", f"Internal error: {str(e)}", status_code=500))
     finally:
         # Clean up temporary file
         if temp_path and os.path.exists(temp_path):
@@ -183,3 +401,316 @@ async def parse_resume_endpoint(file: UploadFile = File(...)):
             except Exception:
                 pass
 
+
+@router.post("/analyze")
+async def analyze(req: AnalyzeRequest, request: Request):
+    job_text = (req.job_text or "").strip()
+    if req.resume_id and (req.cv_text or "").strip():
+        return _error(
+            "BAD_REQUEST",
+            "Send either resume_id or cv_text, not both",
+            details={"resume_id": True, "cv_text": True},
+            status_code=400,
+        )
+    if req.job_id and job_text:
+        return _error(
+            "BAD_REQUEST",
+            "Send either job_id or job_text, not both",
+            details={"job_id": True, "job_text": True},
+            status_code=400,
+        )
+    if req.job_id:
+        # A registered job: prompt with its extracted requirements, not the posting.
+        try:
+            from backend.src.resume import jobs  # type: ignore
+        except Exception as e:
+            return _error("INTERNAL_ERROR", "Internal error", details=str(e), status_code=500)
+        job = jobs.get(req.job_id)
+        if job is None:
+            return _error(
+                "JOB_NOT_FOUND",
+                "Unknown or expired job_id; register the job with /jobs again",
+                details={"job_id": req.job_id},
+                status_code=404,
+            )
+        job_text = jobs.prompt_text(job)
+    normalized = None
+    if req.resume_id:
+        # Reuse text extracted by an earlier /parse instead of receiving it again.
+        try:
+            from backend.src.resume import store  # type: ignore
+        except Exception as e:
+            return _error("INTERNAL_ERROR", "Internal error", details=str(e), status_code=500)
+        stored = store.get(req.resume_id)
+        if stored is None:
+            return _error(
+                "RESUME_NOT_FOUND",
+                "Unknown or expired resume_id; upload the file to /parse again",
+                details={"resume_id": req.resume_id},
+                status_code=404,
+            )
+        cv_text, normalized = stored.text, stored.normalized
+    else:
+        cv_text = (req.cv_text or "").strip()
+    if not cv_text or not job_text:
+        return _error(
+            "BAD_REQUEST",
+            "cv_text and job_text are required",
+            details={"cv_text": bool(cv_text), "job_text": bool(job_text)},
+            status_code=400,
+        )
+    tier_error = _tier_error(req.tier)
+    if tier_error is not None:
+        return tier_error
+    try:
+        deadline = _request_deadline(request)
+    except ValueError as e:
+        return _deadline_error(e)
+
+    try:
+        status_code, payload = await _run_analysis(
+            request,
+            "analyze",
+            cv_text,
+            job_text,
+            deadline,
+            normalized=normalized,
+            incremental=req.incremental,
+            chunked=req.chunked,
+            tier=req.tier,
+        )
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    if status_code != 200:
+        return FastJSONResponse(status_code=status_code, content=payload)
+    return payload
+
+
+@router.post("/parse")
+async def parse_resume_endpoint(request: Request, file: UploadFile = File(...)):
+    """
+    Parse a resume file and return normalized data.
+
+    Accepts: PDF, DOC, DOCX files via multipart/form-data
+    Returns: JSON with normalized resume data and a `resume_id` usable with /analyze
+    """
+    try:
+        deadline = _request_deadline(request)
+    except ValueError as e:
+        return _deadline_error(e)
+
+    try:
+        stored = await _parse_upload(request, file, "parse", deadline)
+        score_value, tips, extra = _score_payload(stored, _compact(request))
+    except _Failure as f:
+        return f.response
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except Exception as e:
+        return _error("INTERNAL_ERROR", f"Internal error: {str(e)}", status_code=500)
+
+    return {
+        "ok": True,
+        "resume_id": stored.resume_id,
+        "data": stored.normalized,
+        "score": {"value": score_value, "max": MAX_SCORE},
+        "tips": tips,
+        **extra,
+    }
+
+
+@router.post("/parse-and-analyze")
+async def parse_and_analyze(
+    request: Request,
+    file: UploadFile = File(...),
+    job_text: str = Form(...),
+    tier: str = Form("auto"),
+    chunked: bool = Form(False),
+):
+    """
+    Parse a resume file, then run the deterministic score and the LLM analysis
+    concurrently on the extracted text.
+
+    Returns: the /parse payload plus `llm` (the /analyze payload, or its error).
+    """
+    job_text = (job_text or "").strip()
+    if not job_text:
+        return _error("BAD_REQUEST", "job_text is required", details={"job_text": False}, status_code=400)
+    tier_error = _tier_error(tier)
+    if tier_error is not None:
+        return tier_error
+    try:
+        deadline = _request_deadline(request)
+    except ValueError as e:
+        return _deadline_error(e)
+
+    extraction_deadline = deadline.slice(EXTRACTION_BUDGET_FRACTION) if deadline is not None else None
+    try:
+        stored = await _parse_upload(request, file, "parse_and_analyze", extraction_deadline)
+
+        loop = asyncio.get_running_loop()
+        (score_value, tips, extra), (_llm_status, llm_payload) = await asyncio.gather(
+            loop.run_in_executor(None, bind(_score_payload), stored, _compact(request)),
+            _run_analysis(
+                request,
+                "parse_and_analyze",
+                stored.text,
+                job_text,
+                deadline,
+                normalized=stored.normalized,
+                chunked=chunked,
+                tier=tier,
+            ),
+        )
+    except _Failure as f:
+        return f.response
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except Exception as e:
+        return _error("INTERNAL_ERROR", f"Internal error: {str(e)}", status_code=500)
+
+    return {
+        "ok": True,
+        "resume_id": stored.resume_id,
+        "data": stored.normalized,
+        "score": {"value": score_value, "max": MAX_SCORE},
+        "tips": tips,
+        "llm": llm_payload,
+        **extra,
+    }
+
+
+@router.post("/jobs")
+async def register_job(req: JobRequest, request: Request):
+    """
+    Register a job description: extract its requirements with one LLM pass
+    and return a `job_id` for /analyze. Registering the same text again
+    returns the stored job without calling the model.
+
+    Returns: `job_id`, `requirements`, and `created` (false for a known job)
+    """
+    job_text = (req.job_text or "").strip()
+    if not job_text:
+        return _error("BAD_REQUEST", "job_text is required", details={"job_text": False}, status_code=400)
+    tier_error = _tier_error(req.tier)
+    if tier_error is not None:
+        return tier_error
+    try:
+        deadline = _request_deadline(request)
+    except ValueError as e:
+        return _deadline_error(e)
+
+    try:
+        from backend.src.llm import tiers  # type: ignore
+        from backend.src.llm.analyze_service import DomainError  # type: ignore
+        from backend.src.resume import jobs  # type: ignore
+
+        model_tier = tiers.resolve(req.tier, len(job_text))
+        job, created = await run_cancellable(
+            request,
+            "jobs",
+            lambda token: jobs.register(job_text, cancel=token, deadline=deadline, tier=model_tier),
+            deadline=deadline,
+        )
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except DeadlineExceeded:
+        return _error("DEADLINE_EXCEEDED", "Requirement extraction did not finish within the deadline", status_code=504)
+    except DomainError as e:
+        return _error(str(e.code), e.message or "Invalid model output", details=e.details, status_code=502)
+    except RuntimeError as e:
+        code = e.args[0] if len(e.args) > 0 else "OLLAMA_ERROR"
+        details = e.args[1] if len(e.args) > 1 else None
+        return _error(str(code), "Ollama request failed", details=details, status_code=_ollama_status(code))
+    except Exception as e:
+        return _error("INTERNAL_ERROR", f"Internal error: {str(e)}", status_code=500)
+
+    return {"ok": True, "job_id": job.job_id, "requirements": job.requirements, "created": created}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """The requirements of a registered job."""
+    try:
+        from backend.src.resume import jobs  # type: ignore
+    except Exception as e:
+        return _error("INTERNAL_ERROR", "Internal error", details=str(e), status_code=500)
+    job = jobs.get(job_id)
+    if job is None:
+        return _error("JOB_NOT_FOUND", "Unknown or expired job_id", details={"job_id": job_id}, status_code=404)
+    return {"ok": True, "job_id": job.job_id, "requirements": job.requirements}
+
+
+@router.post("/rank")
+async def rank_candidates(request: Request, req: RankRequest):
+    """
+    Rank resumes parsed so far (see /parse) against a job description, without
+    an LLM call per candidate.
+
+    Returns: the top `k` candidates (resume_id, name, score, and in lexical mode
+    the matched terms per field); in semantic mode also `pending`, the resumes
+    not embedded yet (embedding continues in the background)
+    """
+    if req.mode not in ("lexical", "semantic"):
+        return _error(
+            "BAD_REQUEST", "mode must be lexical or semantic", details={"mode": req.mode}, status_code=400
+        )
+    try:
+        from backend.src.resume import ranking  # type: ignore
+
+        if req.mode == "semantic":
+            from backend.src.resume import semantic  # type: ignore
+    except Exception as e:
+        return _error("INTERNAL_ERROR", "Internal error", details=str(e), status_code=500)
+
+    job_text = (req.job_text or "").strip()
+    if not job_text:
+        return _error("BAD_REQUEST", "job_text is required", details={"job_text": False}, status_code=400)
+    if not 1 <= req.k <= ranking.MAX_K:
+        return _error(
+            "BAD_REQUEST", f"k must be between 1 and {ranking.MAX_K}", details={"k": req.k}, status_code=400
+        )
+
+    try:
+        deadline = _request_deadline(request)
+    except ValueError as e:
+        return _deadline_error(e)
+
+    rank = functools.partial(semantic.rank, deadline=deadline) if req.mode == "semantic" else ranking.rank
+    try:
+        loop = asyncio.get_running_loop()
+        candidates, indexed = await loop.run_in_executor(None, bind(rank), job_text, req.k)
+    except DeadlineExceeded:
+        return _error("DEADLINE_EXCEEDED", "Ranking did not finish within the deadline", status_code=504)
+    except RuntimeError as e:
+        code = e.args[0] if len(e.args) > 0 else "OLLAMA_ERROR"
+        details = e.args[1] if len(e.args) > 1 else None
+        return _error(
+            str(code), "Ollama embeddings request failed", details=details, status_code=_ollama_status(code)
+        )
+    except Exception as e:
+        return _error("INTERNAL_ERROR", f"Internal error: {str(e)}", status_code=500)
+
+    items = []
+    for c in candidates:
+        item = {"resume_id": c.resume_id, "name": c.name, "score": c.score}
+        if req.mode == "lexical":
+            item["matched"] = c.matched
+        items.append(item)
+    payload = {"ok": True, "mode": req.mode, "candidates": items, "indexed": indexed}
+    if req.mode == "semantic":
+        payload["pending"] = semantic.get_index().pending()
+    return payload
+
+
+@router.get(TIPS_CATALOG_PATH)
+async def tips_catalog(request: Request):
+    """
+    The heuristic tip catalog (ref -> id + message template) used by compact
+    responses. Static per deployment, so clients cache it by ETag.
+    """
+    body, etag = _tips_catalog()
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={TIPS_CATALOG_MAX_AGE_SECONDS}"}
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,77 @@
+"""
+Production entry point: `python -m src.serve` in the image (`python -m api.src.serve`
+from the repo root).
+
+Runs uvicorn with one worker process per available core. Per-process state is
+adjusted so the workers cooperate instead of competing:
+
+- CACHE_BACKEND defaults to "sqlite" with more than one worker, so the resume
+  store and analysis caches are shared and a result computed by one worker is a
+  hit for all of them.
+- PARSE_WORKERS defaults to cores // workers, so the sandboxed parser processes
+  of all workers together don't oversubscribe the CPUs.
+
+Environment variables:
+- WEB_CONCURRENCY (default: available cores): API worker processes
+- HOST (default: 0.0.0.0), PORT (default: 8000)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+from typing import MutableMapping, Optional
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPU quota of the container (cgroup v2), or None if unlimited/unknown."""
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()[:2]
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    try:
+        return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def available_cpus() -> int:
+    """Cores this process may run on: affinity mask, capped by a container CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not available on macOS
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def plan(env: MutableMapping[str, str], cpus: int) -> int:
+    """Fill in per-worker defaults in `env` and return the worker count."""
+    workers = max(1, int(env.get("WEB_CONCURRENCY") or cpus))
+    if workers > 1:
+        env.setdefault("CACHE_BACKEND", "sqlite")
+    env.setdefault("PARSE_WORKERS", str(max(1, cpus // workers)))
+    return workers
+
+
+def main() -> None:
+    import uvicorn
+
+    workers = plan(os.environ, available_cpus())
+    uvicorn.run(
+        f"{__package__}.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT") or 8000),
+        workers=workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Server-Timing header for every HTTP response, and opt-in request profiling.
+
+A pure ASGI middleware: it binds a Timings collector to the request context,
+records time spent receiving the request body as `read`, and adds the stages
+recorded by the routes / backend plus `total` to the response headers.
+
+A request carrying a valid X-Debug-Token and `X-Debug-Profile: 1` is also run
+under cProfile (event loop, executor threads and sandboxed parser workers). The
+report is stored and its id returned in X-Profile-Id (see debug.py).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+from backend.src.runtime import timing  # type: ignore
+from backend.src.runtime.profiling import RequestProfile  # type: ignore
+
+from . import debug
+
+# cProfile is per thread and the event loop thread is shared: only one request
+# at a time gets its event-loop side profiled.
+_loop_profile_lock = threading.Lock()
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _profile_requested(scope) -> bool:
+    if _header(scope, debug.PROFILE_HEADER.lower().encode()).strip() not in ("1", "true"):
+        return False
+    return debug.is_authorized(_header(scope, debug.TOKEN_HEADER.lower().encode()))
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        profile = RequestProfile() if _profile_requested(scope) else None
+        timings = timing.Timings(profile)
+        profile_id = uuid.uuid4().hex if profile is not None else None
+        loop_profiler = None
+        if profile is not None and _loop_profile_lock.acquire(blocking=False):
+            loop_profiler = profile.enable()
+            if loop_profiler is None:
+                _loop_profile_lock.release()
+
+        def _finish_profile() -> None:
+            nonlocal loop_profiler
+            if loop_profiler is not None:
+                profile.collect(loop_profiler)
+                loop_profiler = None
+                _loop_profile_lock.release()
+            if profile is not None:
+                debug.profile_store().set(profile_id, profile.render())
+
+        async def _receive():
+            t0 = time.perf_counter()
+            message = await receive()
+            if message["type"] == "http.request":
+                timings.add("read", time.perf_counter() - t0)
+            return message
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                total = time.perf_counter() - started
+                headers.append((b"server-timing", timings.server_timing(total).encode("latin-1")))
+                if profile is not None:
+                    # Stored before the response goes out, so it can be fetched right away.
+                    _finish_profile()
+                    headers.append((debug.PROFILE_ID_HEADER.lower().encode(), profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with timing.collecting(timings):
+                await self.app(scope, _receive, _send)
+        finally:
+            if loop_profiler is not None:
+                profile.collect(loop_profiler)
+                _loop_profile_lock.release()
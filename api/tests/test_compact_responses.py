@@ -0,0 +1,83 @@
+import gzip
+
+import docx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src import compression
+from api.src.main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def resume_docx(tmp_path):
+    doc = docx.Document()
+    for line in ("Ada Lovelace", "ada@example.com", "Skills", "Python, Analysis"):
+        doc.add_paragraph(line)
+    path = tmp_path / "resume.docx"
+    doc.save(path)
+    return path.read_bytes()
+
+
+def test_compact_tips_resolve_against_catalog(client, resume_docx):
+    full = client.post("/parse", files={"file": ("cv.docx", resume_docx)}).json()
+    compact = client.post("/parse?compact=1", files={"file": ("cv.docx", resume_docx)}).json()
+    catalog = client.get("/tips/catalog")
+    assert catalog.status_code == 200
+    assert compact["tips_catalog"]["etag"] == catalog.headers["etag"]
+
+    entries = catalog.json()["tips"]
+    rendered = []
+    for tip in compact["tips"]:
+        entry = entries[tip["ref"]]
+        message = entry["message"].format(**tip.get("args", {}))
+        rendered.append({"id": entry["id"], "message": message, "severity": tip["severity"]})
+    assert rendered == full["tips"]
+
+
+def test_catalog_not_modified(client):
+    etag = client.get("/tips/catalog").headers["etag"]
+    r = client.get("/tips/catalog", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert "max-age" in r.headers["cache-control"]
+
+
+def test_gzip_negotiated_above_threshold(client):
+    r = client.get("/tips/catalog", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert r.json()["ok"] is True
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.json()["ok"] is True
+
+
+def test_brotli_negotiated_when_accepted(client):
+    import brotli
+
+    r = client.get("/tips/catalog", headers={"Accept-Encoding": "br"})
+    assert r.headers["content-encoding"] == "br"
+    assert r.json()["ok"] is True
+    assert brotli.decompress(compression.compress(b"x" * 10, "br")) == b"x" * 10
+
+
+def test_identity_when_not_accepted(client):
+    r = client.get("/tips/catalog", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+
+
+def test_choose_encoding_honours_q_values(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert compression.choose_encoding("gzip, br") == "br"
+    assert compression.choose_encoding("br;q=0.5, gzip") == "gzip"
+    assert compression.choose_encoding("br;q=0, *") == "gzip"
+    monkeypatch.setattr(compression, "brotli", None)
+    assert compression.choose_encoding("br") is None
+    assert compression.choose_encoding("gzip;q=0") is None
+    assert gzip.decompress(compression.compress(b"x" * 10, "gzip")) == b"x" * 10
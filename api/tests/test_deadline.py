@@ -0,0 +1,58 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+from backend.src.llm import analyze_service
+
+CV = "Ada Lovelace\nada@example.com\n+46 70 123 45 67\nSkills\nPython, SQL\n"
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_analyze_falls_back_to_heuristic_score_when_llm_misses_deadline(client, monkeypatch):
+    cancelled = []
+
+    def slow_generate(_prompt, *, cancel=None, **_kwargs):
+        for _ in range(100):
+            if cancel is not None and cancel.cancelled:
+                cancelled.append(True)
+                break
+            time.sleep(0.02)
+        return '{"score": 1, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", slow_generate)
+    started = time.perf_counter()
+    r = client.post("/analyze", json={"cv_text": CV, "job_text": "job"}, headers={"X-Request-Deadline-Ms": "200"})
+    assert time.perf_counter() - started < 1.5
+    body = r.json()
+    assert r.status_code == 200
+    assert body["degraded"] is True
+    assert body["degraded_reason"] == "DEADLINE_EXCEEDED"
+    assert 0 <= body["score"] <= 1000
+    assert any(t["id"] == "email_good" for t in body["tips"])
+    time.sleep(0.1)
+    assert cancelled
+
+
+def test_analyze_within_deadline_is_not_degraded(client, monkeypatch):
+    monkeypatch.setattr(
+        analyze_service.ollama_client,
+        "generate",
+        lambda _prompt, **_kwargs: '{"score": 700, "tips": []}',
+    )
+    r = client.post("/analyze?deadline_ms=2000", json={"cv_text": CV, "job_text": "job"})
+    assert r.status_code == 200
+    assert r.json()["score"] == 700
+    assert r.json()["degraded"] is False
+
+
+def test_invalid_deadline_rejected(client):
+    r = client.post("/analyze", json={"cv_text": CV, "job_text": "job"}, headers={"X-Request-Deadline-Ms": "soon"})
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "BAD_REQUEST"
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.src import disconnect
+
+
+class _FakeRequest:
+    def __init__(self, disconnect_after: int):
+        self.polls = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self) -> bool:
+        self.polls += 1
+        return self.polls > self.disconnect_after
+
+
+def test_run_cancellable_returns_result():
+    result = asyncio.run(disconnect.run_cancellable(_FakeRequest(100), "test", lambda token: 42))
+    assert result == 42
+
+
+def test_disconnect_cancels_running_and_queued_work(monkeypatch):
+    monkeypatch.setattr(disconnect, "POLL_INTERVAL_SECONDS", 0.01)
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    seen_cancel = threading.Event()
+
+    def _blocking(token):
+        token.add_callback(seen_cancel.set)
+        release.wait(5)
+
+    running_before = disconnect.CANCELLED_TOTAL.value(endpoint="test", stage="running")
+    queued_before = disconnect.CANCELLED_TOTAL.value(endpoint="test", stage="queued")
+
+    async def _scenario():
+        first = asyncio.create_task(
+            disconnect.run_cancellable(_FakeRequest(3), "test", _blocking, executor=executor)
+        )
+        second = asyncio.create_task(
+            disconnect.run_cancellable(_FakeRequest(3), "test", _blocking, executor=executor)
+        )
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    try:
+        results = asyncio.run(_scenario())
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    assert all(isinstance(r, disconnect.ClientDisconnected) for r in results)
+    assert seen_cancel.is_set()
+    assert disconnect.CANCELLED_TOTAL.value(endpoint="test", stage="running") == running_before + 1
+    assert disconnect.CANCELLED_TOTAL.value(endpoint="test", stage="queued") == queued_before + 1
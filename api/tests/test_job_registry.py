@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+from backend.src.llm import analyze_service
+from backend.src.runtime.cache import get_cache
+
+JOB = "Data Engineer. " + "You will own our batch and streaming pipelines. " * 50 + "Must have: Spark, Airflow."
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    get_cache("jobs").clear()
+    seen = []
+
+    def fake_generate(prompt, **_kwargs):
+        seen.append(prompt)
+        if "extract hiring requirements" in prompt:
+            return json.dumps({"title": "Data Engineer", "must_have_skills": ["Spark", "Airflow"]})
+        return '{"score": 550, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    yield seen
+    get_cache("jobs").clear()
+
+
+def test_registered_job_shortens_analysis_prompt(client, prompts):
+    r = client.post("/jobs", json={"job_text": JOB})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["created"] is True
+    assert body["requirements"]["must_have_skills"] == ["Spark", "Airflow"]
+    job_id = body["job_id"]
+
+    assert client.post("/jobs", json={"job_text": JOB}).json()["created"] is False
+    assert client.get(f"/jobs/{job_id}").json()["requirements"]["title"] == "Data Engineer"
+    assert len(prompts) == 1
+
+    r = client.post("/analyze", json={"cv_text": "Ada Lovelace\nSpark, Airflow", "job_id": job_id})
+    assert r.status_code == 200
+    assert r.json()["score"] == 550
+    with_job_id = prompts[-1]
+    assert "Must have: Spark, Airflow" in with_job_id
+    assert "batch and streaming" not in with_job_id
+
+    client.post("/analyze", json={"cv_text": "Ada Lovelace\nSpark, Airflow", "job_text": JOB})
+    assert len(with_job_id) * 2 < len(prompts[-1])
+
+
+def test_unknown_job_id(client, prompts):
+    r = client.post("/analyze", json={"cv_text": "cv", "job_id": "0" * 64})
+    assert r.status_code == 404
+    assert r.json()["error"]["code"] == "JOB_NOT_FOUND"
+    assert client.get("/jobs/nope").status_code == 404
+    assert prompts == []
+
+
+def test_job_id_and_job_text_together_are_rejected(client, prompts):
+    r = client.post("/analyze", json={"cv_text": "cv", "job_id": "0" * 64, "job_text": "job"})
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "BAD_REQUEST"
+    assert prompts == []
@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+from backend.src.llm import analyze_service
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def models(monkeypatch):
+    monkeypatch.setenv("OLLAMA_QUICK_MODEL", "small")
+    monkeypatch.setenv("OLLAMA_DEEP_MODEL", "large")
+    seen = []
+
+    def fake_generate(_prompt, **kwargs):
+        seen.append(kwargs["settings"].ollama_model)
+        return '{"score": 700, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    return seen
+
+
+def test_analyze_reports_serving_tier_and_model(client, models):
+    r = client.post("/analyze", json={"cv_text": "Python developer", "job_text": "Python", "tier": "deep"})
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["tier"], body["model"]) == ("deep", "large")
+    assert models == ["large"]
+
+
+def test_auto_tier_sends_short_inputs_to_quick_model(client, models):
+    r = client.post("/analyze", json={"cv_text": "Python developer", "job_text": "Python"})
+    assert (r.json()["tier"], r.json()["model"]) == ("quick", "small")
+    long_cv = "Python developer. " * 1000
+    r = client.post("/analyze", json={"cv_text": long_cv, "job_text": "Python"})
+    assert (r.json()["tier"], r.json()["model"]) == ("deep", "large")
+
+
+def test_unknown_tier_is_rejected(client, models):
+    r = client.post("/analyze", json={"cv_text": "cv", "job_text": "job", "tier": "huge"})
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "BAD_REQUEST"
+    assert models == []
+
+
+def test_chunked_analysis_reports_chunks(client, models, monkeypatch):
+    monkeypatch.setenv("ANALYZE_CHUNK_CHARS", "1000")
+    cv = "\n".join(["Ada Lovelace", "Experience"] + [f"Built system {i} in Python." for i in range(200)])
+    r = client.post("/analyze", json={"cv_text": cv, "job_text": "Python", "chunked": True, "tier": "deep"})
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["analysis"]["chunks"]) == len(models) > 1
+    assert body["score"] == 700
+    assert body["model"] == "large"
+
+
+def test_chunked_tier_follows_the_largest_chunk(client, models, monkeypatch):
+    monkeypatch.setenv("ANALYZE_CHUNK_CHARS", "1000")
+    cv = "\n".join(["Ada Lovelace", "Experience"] + [f"Built system {i} in Python." for i in range(600)])
+    r = client.post("/analyze", json={"cv_text": cv, "job_text": "Python", "chunked": True})
+    assert r.status_code == 200
+    assert r.json()["tier"] == "quick"
+
+    r = client.post("/analyze", json={"cv_text": cv, "job_text": "x" * 20000, "chunked": True})
+    assert r.status_code == 413
+    assert r.json()["error"]["code"] == "INPUT_TOO_LARGE"
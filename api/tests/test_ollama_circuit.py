@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+from backend.src.llm import ollama_client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Nothing listens on port 9: every call fails fast with "connection refused".
+    monkeypatch.setenv("OLLAMA_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("OLLAMA_RETRIES", "0")
+    monkeypatch.setenv("OLLAMA_BREAKER_FAILURES", "2")
+    ollama_client.reset_breakers()
+    with TestClient(app) as c:
+        yield c
+    ollama_client.reset_breakers()
+
+
+def test_analyze_fails_fast_once_the_circuit_opens(client):
+    body = {"cv_text": "Python developer", "job_text": "Python"}
+    for _ in range(2):
+        r = client.post("/analyze", json=body)
+        assert r.status_code == 502
+        assert r.json()["error"]["code"] == "OLLAMA_UNREACHABLE"
+
+    health = client.get("/health").json()
+    assert health["ok"] is True
+    assert health["ollama"]["circuit"]["state"] == "open"
+
+    r = client.post("/analyze", json=body)
+    assert r.status_code == 503
+    assert r.json()["error"]["code"] == "OLLAMA_CIRCUIT_OPEN"
@@ -0,0 +1,34 @@
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_parse_rejects_docx_zip_bomb(client, tmp_path):
+    path = tmp_path / "bomb.docx"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", b"\0" * (8 * 1024 * 1024))
+    r = client.post("/parse", files={"file": ("bomb.docx", path.read_bytes())})
+    assert r.status_code == 422
+    assert r.json()["error"]["code"] == "UNSAFE_DOCUMENT"
+
+
+def test_parse_memory_shows_in_metrics(client, tmp_path):
+    from docx import Document
+
+    path = tmp_path / "memory.docx"
+    doc = Document()
+    doc.add_paragraph("Ada Memory\nada@memory.example\nSkills: Rust, Go")
+    doc.save(path)
+    r = client.post("/parse", files={"file": ("memory.docx", path.read_bytes())})
+    assert r.status_code == 200
+    text = client.get("/metrics").text
+    assert 'resumeai_parse_rss_growth_bytes_count{format=".docx",size="<100KB"}' in text
@@ -0,0 +1,117 @@
+import docx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+from backend.src.llm import analyze_service, ollama_client
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def resume_docx(tmp_path):
+    doc = docx.Document()
+    for line in ("Grace Hopper", "grace@example.com", "Skills", "COBOL, Python"):
+        doc.add_paragraph(line)
+    path = tmp_path / "resume.docx"
+    doc.save(path)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    seen = []
+
+    def fake_generate(prompt, **_kwargs):
+        seen.append(prompt)
+        return '{"score": 640, "tips": [{"id": "x", "message": "y", "severity": "GOOD"}]}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    return seen
+
+
+def test_parse_returns_resume_id_usable_by_analyze(client, resume_docx, prompts):
+    parsed = client.post("/parse", files={"file": ("cv.docx", resume_docx)}).json()
+    assert parsed["ok"] is True
+    # The section index is offsets only: the resume body is not repeated in the payload.
+    assert parsed["data"]["sections"]["skills"].keys() == {"start", "end"}
+    resume_id = parsed["resume_id"]
+
+    r = client.post("/analyze", json={"resume_id": resume_id, "job_text": "COBOL developer"})
+    assert r.status_code == 200
+    assert r.json()["score"] == 640
+    assert "Grace Hopper" in prompts[0]
+
+    # Same bytes => same id (served from the store).
+    again = client.post("/parse", files={"file": ("other-name.docx", resume_docx)}).json()
+    assert again["resume_id"] == resume_id
+
+
+def test_analyze_unknown_resume_id(client):
+    r = client.post("/analyze", json={"resume_id": "0" * 64, "job_text": "job"})
+    assert r.status_code == 404
+    assert r.json()["error"]["code"] == "RESUME_NOT_FOUND"
+
+
+def test_analyze_rejects_resume_id_with_cv_text(client):
+    r = client.post("/analyze", json={"resume_id": "0" * 64, "cv_text": "cv", "job_text": "job"})
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "BAD_REQUEST"
+
+
+def test_parse_and_analyze_returns_both_results(client, resume_docx, prompts):
+    r = client.post(
+        "/parse-and-analyze",
+        files={"file": ("cv.docx", resume_docx)},
+        data={"job_text": "COBOL developer"},
+    )
+    body = r.json()
+    assert r.status_code == 200
+    assert body["data"]["email"] == "grace@example.com"
+    assert 0 <= body["score"]["value"] <= 1000
+    assert body["llm"]["ok"] is True
+    assert body["llm"]["score"] == 640
+
+
+
+def test_rank_returns_parsed_resumes(client, tmp_path):
+    doc = docx.Document()
+    for line in ("Joe Armstrong", "Skills", "Erlang, Haskell"):
+        doc.add_paragraph(line)
+    doc.save(tmp_path / "erlang.docx")
+    resume_id = client.post("/parse", files={"file": ("cv.docx", (tmp_path / "erlang.docx").read_bytes())}).json()[
+        "resume_id"
+    ]
+
+    r = client.post("/rank", json={"job_text": "Senior Erlang and Haskell programmer", "k": 5})
+    assert r.status_code == 200
+    top = r.json()["candidates"][0]
+    assert top["resume_id"] == resume_id
+    assert top["matched"]["skills"] == ["erlang", "haskell"]
+
+    assert client.post("/rank", json={"job_text": "x", "k": 0}).status_code == 400
+
+
+def test_rank_semantic_mode_uses_embeddings(client, resume_docx, monkeypatch):
+    from tools.fake_ollama import FakeOllama
+
+    resume_id = client.post("/parse", files={"file": ("cv.docx", resume_docx)}).json()["resume_id"]
+    with FakeOllama() as fake:
+        monkeypatch.setenv("OLLAMA_URL", fake.url)
+        r = client.post("/rank", json={"job_text": "COBOL and Python", "k": 100, "mode": "semantic"})
+    assert r.status_code == 200
+    assert r.json()["mode"] == "semantic"
+    assert r.json()["pending"] == 0
+    assert resume_id in [c["resume_id"] for c in r.json()["candidates"]]
+
+    monkeypatch.setenv("OLLAMA_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("OLLAMA_RETRIES", "0")
+    ollama_client.reset_breakers()
+    r = client.post("/rank", json={"job_text": "Never embedded before", "mode": "semantic"})
+    assert r.status_code == 502
+    assert r.json()["error"]["code"] == "OLLAMA_UNREACHABLE"
+    assert client.post("/rank", json={"job_text": "x", "mode": "fuzzy"}).status_code == 400
@@ -0,0 +1,28 @@
+from api.src import serve
+
+
+def test_plan_multi_worker_defaults():
+    env = {}
+    assert serve.plan(env, cpus=8) == 8
+    assert env == {"CACHE_BACKEND": "sqlite", "PARSE_WORKERS": "1"}
+
+
+def test_plan_respects_overrides():
+    env = {"WEB_CONCURRENCY": "2", "CACHE_BACKEND": "memory"}
+    assert serve.plan(env, cpus=8) == 2
+    assert env["CACHE_BACKEND"] == "memory"
+    assert env["PARSE_WORKERS"] == "4"
+
+    single = {}
+    assert serve.plan(single, cpus=1) == 1
+    assert "CACHE_BACKEND" not in single
+
+
+def test_available_cpus_honours_cgroup_quota(tmp_path, monkeypatch):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("150000 100000\n")
+    monkeypatch.setattr(serve, "CGROUP_CPU_MAX", cpu_max)
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda _pid: set(range(16)), raising=False)
+    assert serve.available_cpus() == 2
+    cpu_max.write_text("max 100000\n")
+    assert serve.available_cpus() == 16
@@ -0,0 +1,127 @@
+import docx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.main import app
+from backend.src.llm import analyze_service
+from backend.src.runtime import timing
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def resume_docx(tmp_path, request):
+    # Unique per test, so the upload is really extracted rather than served from the store.
+    doc = docx.Document()
+    for line in ("Alan Turing", "alan@example.com", request.node.name, "Skills", "Mathematics, Cryptanalysis"):
+        doc.add_paragraph(line)
+    path = tmp_path / "resume.docx"
+    doc.save(path)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setattr(
+        analyze_service.ollama_client,
+        "generate",
+        lambda prompt, **_kwargs: '{"score": 500, "tips": []}',
+    )
+
+
+def _stages(response) -> dict:
+    stages = {}
+    for part in response.headers["server-timing"].split(","):
+        name, _, dur = part.strip().partition(";dur=")
+        stages[name] = float(dur)
+    return stages
+
+
+def test_parse_reports_stage_timings(client, resume_docx):
+    r = client.post("/parse", files={"file": ("cv.docx", resume_docx)})
+    assert r.status_code == 200
+    stages = _stages(r)
+    for name in ("read", "spool", "extraction", "normalize", "score", "total"):
+        assert name in stages, stages
+    assert stages["total"] >= stages["extraction"]
+
+
+def test_analyze_reports_llm_stages(client, fake_model):
+    r = client.post("/analyze", json={"cv_text": "cv", "job_text": "job"})
+    assert r.status_code == 200
+    assert {"prompt", "ollama", "validate", "total"} <= set(_stages(r))
+
+
+def test_profile_requires_token(client, monkeypatch, fake_model):
+    monkeypatch.delenv("DEBUG_TOKEN", raising=False)
+    r = client.post(
+        "/analyze",
+        json={"cv_text": "cv", "job_text": "job"},
+        headers={"X-Debug-Profile": "1", "X-Debug-Token": "anything"},
+    )
+    assert r.status_code == 200
+    assert "x-profile-id" not in r.headers
+    assert client.get("/debug/profiles/abc", headers={"X-Debug-Token": "anything"}).status_code == 404
+
+
+def test_profiled_request_is_retrievable(client, monkeypatch, resume_docx):
+    monkeypatch.setenv("DEBUG_TOKEN", "s3cret")
+    headers = {"X-Debug-Token": "s3cret"}
+    r = client.post(
+        "/parse",
+        files={"file": ("cv.docx", resume_docx)},
+        headers={**headers, "X-Debug-Profile": "1"},
+    )
+    profile_id = r.headers["x-profile-id"]
+
+    assert client.get(f"/debug/profiles/{profile_id}").status_code == 404
+    report = client.get(f"/debug/profiles/{profile_id}", headers=headers)
+    assert report.status_code == 200
+    # Includes the extraction that ran in the sandboxed worker process.
+    assert "derive_fields" in report.text
+
+
+def test_stage_is_noop_without_collector():
+    with timing.stage("x"):
+        pass
+    with timing.collecting() as t:
+        with timing.stage("x"):
+            pass
+        timing.bind(lambda: timing.current().add("y", 1.0))()
+    assert set(t.as_dict()) == {"x", "y"}
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_returns_collapsed_stacks(client, monkeypatch):
+    import threading
+
+    monkeypatch.setenv("DEBUG_TOKEN", "s3cret")
+    stop = threading.Event()
+    busy = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    busy.start()
+    try:
+        r = client.get("/debug/profile?seconds=0.3&hz=200", headers={"X-Debug-Token": "s3cret"})
+    finally:
+        stop.set()
+        busy.join()
+    assert r.status_code == 200
+    assert int(r.headers["x-profile-samples"]) > 10
+    lines = r.text.splitlines()
+    assert any(line.startswith("busy-worker;") and "_spin (test_server_timing.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1
+
+
+def test_sampling_profiler_is_guarded(client, monkeypatch):
+    monkeypatch.setenv("DEBUG_TOKEN", "s3cret")
+    assert client.get("/debug/profile?seconds=0.1").status_code == 404
+    r = client.get("/debug/profile?seconds=600", headers={"X-Debug-Token": "s3cret"})
+    assert r.status_code == 400
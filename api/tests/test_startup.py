@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Generous enough for slow CI runners, tight enough to catch an eager pdfminer/docx import.
+IMPORT_BUDGET_SECONDS = 3.0
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(code: str) -> str:
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return out.stdout.strip()
+
+
+def test_api_import_within_budget():
+    elapsed = float(
+        _run(
+            "import time; t = time.perf_counter(); import api.src.main; "
+            "print(time.perf_counter() - t)"
+        )
+    )
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+def test_api_import_does_not_load_parsers():
+    loaded = _run(
+        "import sys; import api.src.main; import backend.src.pipeline; "
+        "print(','.join(m for m in ('pdfminer', 'docx') if m in sys.modules))"
+    )
+    assert loaded == ""
+
+
+def test_extractor_registry_lazy_per_format():
+    loaded = _run(
+        "import sys; from backend.src.pipeline import extractors; "
+        "extractors.warm_up(['.docx']); "
+        "print(','.join(m for m in ('pdfminer', 'docx') if m in sys.modules))"
+    )
+    assert loaded == "docx"
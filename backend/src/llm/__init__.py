@@ -1,5 +1,14 @@
 """LLM domain services."""
 
-__all__ = ["prompt", "ollama_client", "schema", "analyze_service"]
+__all__ = [
+    "prompt",
+    "ollama_client",
+    "schema",
+    "analyze_service",
+    "section_analysis",
+    "chunked_analysis",
+    "requirements",
+    "tiers",
+]
 
 
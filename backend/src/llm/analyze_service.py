@@ -16,9 +16,15 @@ from typing import Any, Optional
 
 from pydantic import ValidationError
 
-from . import ollama_client
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.deadline import Deadline, min_timeout  # type: ignore
+from backend.src.runtime.timing import stage  # type: ignore
+from . import ollama_client, tiers
 from .prompt import build_prompt
-from .schema import AnalyzeResult, validate_analyze_result
+from .schema import AnalyzeResult, max_output_tokens, validate_analyze_result
+
+
+DEADLINE_SOCKET_SLACK_SECONDS = 1.0
 
 
 @dataclass(frozen=True)
@@ -28,9 +34,72 @@ class DomainError(Exception):
     details: Any = None
 
 
-def analyze(cv_text: str, job_text: str) -> AnalyzeResult:
-    prompt = build_prompt(cv_text, job_text)
-    raw = ollama_client.generate(prompt)
+def analyze(
+    cv_text: str,
+    job_text: str,
+    *,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+    template: Optional[str] = None,
+) -> AnalyzeResult:
+    """
+    Args:
+        template: Prompt template variant (default: prompt.PROMPT_TEMPLATE)
+    """
+    with stage("prompt"):
+        prompt = build_prompt(cv_text, job_text, template=template)
+    return analyze_prompt(prompt, cancel=cancel, deadline=deadline, tier=tier)
+
+
+def analyze_prompt(
+    prompt: str,
+    *,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+) -> AnalyzeResult:
+    """
+    Send an already-built prompt to the model and validate its JSON answer.
+
+    Args:
+        tier: Model and generation options to use (default: OLLAMA_MODEL)
+    """
+    raw = generate_json(prompt, max_output_tokens(), cancel=cancel, deadline=deadline, tier=tier)
+    with stage("validate"):
+        return parse_result(raw)
+
+
+def generate_json(
+    prompt: str,
+    num_predict: int,
+    *,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+) -> str:
+    """The model's raw answer to a prompt asking for one JSON object of at most `num_predict` tokens."""
+    # Socket-level bound only, with slack so the caller's deadline (which cancels
+    # via `cancel` and can fall back) fires before a socket timeout error does.
+    timeout = min_timeout(deadline, ollama_client.REQUEST_TIMEOUT_SECONDS)
+    if deadline is not None:
+        timeout += DEADLINE_SOCKET_SLACK_SECONDS
+    # Bounded by the schema, and cut off once the answer object is complete, so a
+    # model that keeps talking after the closing brace doesn't hold the request.
+    with stage("ollama"):
+        return ollama_client.generate(
+            prompt,
+            settings=tiers.ollama_settings(tier),
+            cancel=cancel,
+            timeout=timeout,
+            num_predict=num_predict,
+            stop_after_json=True,
+            options=tier.options if tier is not None else None,
+        )
+
+
+def parse_result(raw: Optional[str]) -> AnalyzeResult:
+    """Parse and validate the model's raw answer (raises DomainError)."""
     raw = (raw or "").strip()
 
     try:
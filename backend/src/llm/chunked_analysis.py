@@ -0,0 +1,206 @@
+"""
+Map-reduce analysis of long resumes (domain layer).
+
+Prompt evaluation cost grows faster than prompt length, and a prompt that
+overflows the model's context truncates its answer. Chunked analysis splits
+the resume along its sections, packed into chunks of at most ANALYZE_CHUNK_CHARS
+characters (a longer section is split at paragraph, then line breaks). Every
+chunk is analysed against the whole job description with a prompt that says
+it is only part of the resume, ANALYZE_CHUNK_CONCURRENCY chunks at a time, so
+latency is that of the slowest chunk per round.
+
+Every prompt stays bounded: a job description over ANALYZE_CHUNK_JOB_CHARS or
+a resume needing more than ANALYZE_MAX_CHUNKS chunks is rejected (InputTooLarge)
+rather than sent. A long job description is best sent as a registered job
+(`job_id`), whose compact requirements stand in for the posting.
+
+The reduce step is merge_results: a length-weighted mean score and tips
+deduplicated. Chunk results are cached like incremental sections.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.deadline import Deadline  # type: ignore
+from . import analyze_service, tiers
+from .schema import AnalyzeResult
+from .section_analysis import analyze_parts, merge_results, split_sections
+
+DEFAULT_CHUNK_CHARS = 4000
+DEFAULT_JOB_CHARS = 8000
+DEFAULT_MAX_CHUNKS = 32
+
+_SEPARATORS = ("\n\n", "\n", " ")
+
+
+def chunk_chars() -> int:
+    """
+    Environment variables:
+    - ANALYZE_CHUNK_CHARS (default: 4000): longest resume chunk per prompt
+    """
+    return max(500, int(os.getenv("ANALYZE_CHUNK_CHARS") or DEFAULT_CHUNK_CHARS))
+
+
+def job_chars() -> int:
+    """
+    Environment variables:
+    - ANALYZE_CHUNK_JOB_CHARS (default: 8000): longest job text sent with every chunk
+    """
+    return max(500, int(os.getenv("ANALYZE_CHUNK_JOB_CHARS") or DEFAULT_JOB_CHARS))
+
+
+def max_chunks() -> int:
+    """
+    Environment variables:
+    - ANALYZE_MAX_CHUNKS (default: 32): most resume chunks analysed for one request
+    """
+    return max(1, int(os.getenv("ANALYZE_MAX_CHUNKS") or DEFAULT_MAX_CHUNKS))
+
+
+class InputTooLarge(ValueError):
+    """The resume or job text is too long for chunked analysis."""
+
+    code = "INPUT_TOO_LARGE"
+
+    def __init__(self, message: str, details: dict) -> None:
+        super().__init__(message, details)
+        self.message = message
+        self.details = details
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class ChunkPlan(NamedTuple):
+    # (section names, text) per chunk, in document order
+    chunks: List[Tuple[List[str], str]]
+    # The longest prompt input: largest chunk plus the job text
+    prompt_chars: int
+
+
+def _pack(pieces: Sequence[str], max_chars: int, sep: str) -> List[str]:
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + len(sep) + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]}{sep}{piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+def split_text(text: str, max_chars: int, separators: Sequence[str] = _SEPARATORS) -> List[str]:
+    """
+    `text` in chunks of at most `max_chars`, split at the coarsest separator
+    that gets there (paragraphs, then lines, then words; a hard cut as a last resort).
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    if not separators:
+        return [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+    sep = separators[0]
+    pieces = [chunk for part in text.split(sep) for chunk in split_text(part, max_chars, separators[1:])]
+    return _pack(pieces, max_chars, sep)
+
+
+def resume_chunks(
+    cv_text: str, sections: Mapping[str, Mapping], max_chars: int
+) -> List[Tuple[List[str], str]]:
+    """(section names, text) chunks of at most `max_chars`, sections packed in document order."""
+    chunks: List[Tuple[List[str], str]] = []
+    for name, text in split_sections(cv_text, sections):
+        for piece in split_text(text, max_chars):
+            if chunks and len(chunks[-1][1]) + 2 + len(piece) <= max_chars:
+                names, body = chunks[-1]
+                chunks[-1] = (names if names[-1] == name else names + [name], f"{body}\n\n{piece}")
+            else:
+                chunks.append(([name], piece))
+    return chunks
+
+
+def plan_chunks(
+    cv_text: str,
+    job_text: str,
+    *,
+    sections: Optional[Mapping[str, Mapping]] = None,
+    max_chars: Optional[int] = None,
+) -> ChunkPlan:
+    """
+    Split `cv_text` into chunks of at most `max_chars` (default: ANALYZE_CHUNK_CHARS).
+
+    Args:
+        sections: Parser section index for `cv_text` (computed if omitted)
+
+    Raises:
+        InputTooLarge: `job_text` is over ANALYZE_CHUNK_JOB_CHARS, or the
+            resume needs more than ANALYZE_MAX_CHUNKS chunks
+    """
+    if len(job_text) > job_chars():
+        raise InputTooLarge(
+            f"Job text is over {job_chars()} characters; register it with POST /jobs and send job_id",
+            {"job_chars": len(job_text), "max_job_chars": job_chars()},
+        )
+    if sections is None:
+        from backend.src.pipeline.parser import index_sections  # type: ignore
+
+        sections = index_sections(cv_text)
+    size = max_chars or chunk_chars()
+    chunks = resume_chunks(cv_text, sections, size) or [([], cv_text)]
+    if len(chunks) > max_chunks():
+        raise InputTooLarge(
+            f"Resume is too long: over {max_chunks()} chunks of {size} characters",
+            {"chunks": len(chunks), "max_chunks": max_chunks()},
+        )
+    return ChunkPlan(chunks, max(len(text) for _names, text in chunks) + len(job_text))
+
+
+def analyze_chunked(
+    cv_text: str,
+    job_text: str,
+    *,
+    sections: Optional[Mapping[str, Mapping]] = None,
+    plan: Optional[ChunkPlan] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+    max_chars: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> AnalyzeResult:
+    """
+    Analyse `cv_text` against `job_text` in concurrent resume chunks and merge the results.
+
+    Args:
+        sections: Parser section index for `cv_text` (computed if omitted)
+        plan: The chunks, from plan_chunks (made here if omitted)
+        max_chars: Chunk size (default: ANALYZE_CHUNK_CHARS)
+        max_concurrency: Chunks in flight (default: ANALYZE_CHUNK_CONCURRENCY);
+            the others wait for a free slot
+
+    Returns:
+        AnalyzeResult whose `analysis["chunks"]` reports each chunk's sections,
+        score and whether it came from the cache. A resume that fits in one
+        chunk gets a plain analysis.
+
+    Raises:
+        InputTooLarge: See plan_chunks
+        The first chunk's error (the other chunks are cancelled).
+    """
+    if plan is None:
+        plan = plan_chunks(cv_text, job_text, sections=sections, max_chars=max_chars)
+    chunks = plan.chunks
+    if len(chunks) == 1:
+        return analyze_service.analyze(cv_text, job_text, cancel=cancel, deadline=deadline, tier=tier)
+
+    results = analyze_parts(
+        chunks, job_text, cancel=cancel, deadline=deadline, tier=tier, max_concurrency=max_concurrency
+    )
+    parts: List[Tuple[float, AnalyzeResult]] = []
+    report = []
+    for (names, text), (result, cached) in zip(chunks, results):
+        parts.append((float(len(text)), result))
+        report.append({"sections": names, "score": result.score, "cached": cached})
+    score, tips = merge_results(parts, cached=[cached for _result, cached in results])
+    return AnalyzeResult(score=score, tips=tips, analysis={"chunks": report})
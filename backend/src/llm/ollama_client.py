@@ -2,85 +2,628 @@
 Ollama client (domain layer).
 
 Pure transport: given config + prompt, returns raw model string (no JSON parsing).
+
+Calls go through a circuit breaker per Ollama URL: after consecutive failures
+(Ollama unreachable, timed out or answering 5xx, or calls slower than
+OLLAMA_BREAKER_SLOW_SECONDS; a 4xx such as an unknown model is a problem with
+the request, not with Ollama, and does not count) requests fail immediately
+with OLLAMA_CIRCUIT_OPEN instead of each waiting out a timeout, and trial
+requests probe for recovery (see runtime.circuit). Failures where Ollama did no
+work (unreachable, or 429/502/503/504) are retried with jittered exponential
+backoff.
+
+`collecting_stats` records per-generation timings and Ollama's token counters
+for benchmarks (tools/bench_llm.py).
 """
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
-import urllib.error
-import urllib.request
+import random
+import socket
+import threading
+import time
+import urllib.parse
+from contextvars import ContextVar
 from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, TypeVar
+
+from backend.src.runtime import metrics  # type: ignore
+from backend.src.runtime.cancellation import CancelToken, Cancelled  # type: ignore
+from backend.src.runtime.circuit import CircuitBreaker, CircuitOpen  # type: ignore
 
 
 DEFAULT_OLLAMA_URL = "http://host.docker.internal:11434"
 DEFAULT_OLLAMA_MODEL = "html-model:latest"
+DEFAULT_OLLAMA_EMBED_MODEL = "nomic-embed-text"
+REQUEST_TIMEOUT_SECONDS = 120
+
+# Retries (of idempotent failures only): full-jitter exponential backoff.
+RETRY_BASE_DELAY_SECONDS = 0.2
+RETRY_MAX_DELAY_SECONDS = 2.0
+RETRYABLE_HTTP_STATUS = frozenset({429, 502, 503, 504})
+
+EARLY_STOP_TOTAL = metrics.counter(
+    "resumeai_ollama_early_stop_total",
+    "Generations cut off while the model was still streaming text after the complete JSON answer.",
+)
+RETRIES_TOTAL = metrics.counter(
+    "resumeai_ollama_retries_total",
+    "Ollama requests retried after an idempotent failure (code: the failure).",
+    ("code",),
+)
+
+T = TypeVar("T")
+_NS = 1e9
+
+
+class OllamaHTTPError(RuntimeError):
+    """("OLLAMA_HTTP_ERROR", details), with the HTTP status."""
+
+    def __init__(self, status: int, details: str) -> None:
+        super().__init__("OLLAMA_HTTP_ERROR", details)
+        self.status = status
+
+
+class OllamaCircuitOpen(RuntimeError):
+    """("OLLAMA_CIRCUIT_OPEN", details): Ollama is failing; the request was not sent."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("OLLAMA_CIRCUIT_OPEN", f"Ollama is unavailable; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
 
 
 @dataclass(frozen=True)
 class OllamaSettings:
     ollama_url: str
     ollama_model: str
+    embedding_model: str = DEFAULT_OLLAMA_EMBED_MODEL
+    retries: int = 2
+    breaker_failures: int = 5
+    breaker_open_seconds: float = 30.0
+    breaker_slow_seconds: Optional[float] = 90.0
 
 
 def get_settings() -> OllamaSettings:
+    """
+    Environment variables:
+    - OLLAMA_URL, OLLAMA_MODEL, OLLAMA_EMBED_MODEL
+    - OLLAMA_RETRIES (default: 2): retries of idempotent failures per request
+    - OLLAMA_BREAKER_FAILURES (default: 5): consecutive failures that open the circuit
+    - OLLAMA_BREAKER_OPEN_SECONDS (default: 30): fail-fast period before a trial request
+    - OLLAMA_BREAKER_SLOW_SECONDS (default: 90; 0 disables): slower calls count as failures
+    """
     ollama_url = os.getenv("OLLAMA_URL", DEFAULT_OLLAMA_URL).rstrip("/")
     ollama_model = os.getenv("OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL)
-    return OllamaSettings(ollama_url=ollama_url, ollama_model=ollama_model)
+    embedding_model = os.getenv("OLLAMA_EMBED_MODEL", DEFAULT_OLLAMA_EMBED_MODEL)
+    slow = float(os.getenv("OLLAMA_BREAKER_SLOW_SECONDS") or 90.0)
+    return OllamaSettings(
+        ollama_url=ollama_url,
+        ollama_model=ollama_model,
+        embedding_model=embedding_model,
+        retries=max(0, int(os.getenv("OLLAMA_RETRIES") or 2)),
+        breaker_failures=int(os.getenv("OLLAMA_BREAKER_FAILURES") or 5),
+        breaker_open_seconds=float(os.getenv("OLLAMA_BREAKER_OPEN_SECONDS") or 30.0),
+        breaker_slow_seconds=slow if slow > 0 else None,
+    )
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def breaker_for(settings: OllamaSettings) -> CircuitBreaker:
+    """The circuit breaker of `settings.ollama_url` (created with its settings on first use)."""
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(settings.ollama_url)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                "ollama",
+                failure_threshold=settings.breaker_failures,
+                open_seconds=settings.breaker_open_seconds,
+                slow_call_seconds=settings.breaker_slow_seconds,
+            )
+            _BREAKERS[settings.ollama_url] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+_IN_FLIGHT = 0
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+def in_flight() -> int:
+    """Generations this process has waiting on Ollama right now (its queue depth there)."""
+    return _IN_FLIGHT
+
+
+def _track_in_flight(delta: int) -> None:
+    global _IN_FLIGHT
+    with _IN_FLIGHT_LOCK:
+        _IN_FLIGHT += delta
+
+
+@dataclass(frozen=True)
+class GenerationStats:
+    """One successful /api/generate request, as seen by the client."""
+
+    model: str
+    prompt_chars: int
+    response: str
+    # Request sent -> first chunk, and -> last chunk read.
+    first_chunk_seconds: float
+    seconds: float
+    # Streamed `response` chunks: Ollama sends about one token per chunk.
+    chunks: int
+    # Ollama's counters, from the stream's final ("done") chunk; None when the
+    # stream was closed early (stop_after_json) or the server did not send them.
+    prompt_tokens: Optional[int] = None
+    prompt_seconds: Optional[float] = None
+    eval_tokens: Optional[int] = None
+    eval_seconds: Optional[float] = None
+
+    @property
+    def prompt_tokens_per_second(self) -> Optional[float]:
+        if self.prompt_tokens and self.prompt_seconds:
+            return self.prompt_tokens / self.prompt_seconds
+        return None
+
+    @property
+    def eval_tokens_per_second(self) -> Optional[float]:
+        """Ollama's eval rate, else estimated from chunks streamed after the first one."""
+        if self.eval_tokens and self.eval_seconds:
+            return self.eval_tokens / self.eval_seconds
+        streaming = self.seconds - self.first_chunk_seconds
+        if self.chunks > 1 and streaming > 0:
+            return (self.chunks - 1) / streaming
+        return None
+
+
+class _StatsCollector:
+    def __init__(self, drain: bool) -> None:
+        self.drain = drain
+        self.stats: List[GenerationStats] = []
+
+
+_collector: ContextVar[Optional[_StatsCollector]] = ContextVar("ollama_stats_collector", default=None)
+
+
+class collecting_stats:
+    """
+    Record a GenerationStats for every generation in the block (in this context);
+    the list is returned by `__enter__`. Failed attempts are not recorded.
+
+    Args:
+        drain: Read streams to the end even with stop_after_json (the output is
+            still cut at the JSON object), so Ollama's counters are always there;
+            costs the time of the tokens generated past the object.
+    """
+
+    def __init__(self, drain: bool = False) -> None:
+        self._collector = _StatsCollector(drain)
+
+    def __enter__(self) -> List[GenerationStats]:
+        self._reset = _collector.set(self._collector)
+        return self._collector.stats
+
+    def __exit__(self, *_exc: Any) -> None:
+        _collector.reset(self._reset)
+
+
+def _retryable(e: RuntimeError) -> bool:
+    # Ollama did no work for these, so sending the request again is safe.
+    if isinstance(e, OllamaHTTPError):
+        return e.status in RETRYABLE_HTTP_STATUS
+    return bool(e.args) and e.args[0] == "OLLAMA_UNREACHABLE"
+
+
+def _unhealthy(e: RuntimeError) -> bool:
+    # What the breaker counts as a failure of Ollama itself.
+    if isinstance(e, OllamaHTTPError):
+        return e.status >= 500
+    return bool(e.args) and e.args[0] in ("OLLAMA_UNREACHABLE", "OLLAMA_REQUEST_FAILED")
+
+
+def _resilient(
+    settings: OllamaSettings,
+    attempt: Callable[[], T],
+    *,
+    cancel: CancelToken | None = None,
+    budget: float | None = None,
+) -> T:
+    """
+    Run `attempt` under the URL's circuit breaker, retrying idempotent failures
+    while the retry delay still fits in `budget` seconds.
+    """
+    breaker = breaker_for(settings)
+    started = time.monotonic()
+    retry = 0
+    while True:
+        try:
+            breaker.acquire()
+        except CircuitOpen as e:
+            raise OllamaCircuitOpen(e.retry_after) from None
+        call_started = time.monotonic()
+        try:
+            result = attempt()
+        except RuntimeError as e:
+            if _unhealthy(e):
+                breaker.record_failure(" ".join(str(a) for a in e.args)[:200])
+            else:
+                breaker.release()
+            delay = random.uniform(0.0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**retry))
+            if (
+                retry >= settings.retries
+                or not _retryable(e)
+                or (budget is not None and time.monotonic() - started + delay > budget)
+            ):
+                raise
+            retry += 1
+            RETRIES_TOTAL.inc(code=str(e.args[0]))
+            if cancel is not None:
+                if cancel.wait(delay):
+                    raise Cancelled() from e
+            else:
+                time.sleep(delay)
+            continue
+        except BaseException:
+            # Cancelled (or a bug): says nothing about Ollama's health.
+            breaker.release()
+            raise
+        breaker.record_success(time.monotonic() - call_started)
+        return result
 
 
-def generate(prompt: str, *, settings: OllamaSettings | None = None) -> str:
+def generate(
+    prompt: str,
+    *,
+    settings: OllamaSettings | None = None,
+    cancel: CancelToken | None = None,
+    timeout: float | None = None,
+    num_predict: int | None = None,
+    stop_after_json: bool = False,
+    options: Mapping[str, Any] | None = None,
+) -> str:
     """
     Call Ollama /api/generate and return the raw string response payload.
 
+    The response is streamed so a cancelled request can abort mid-generation:
+    closing the connection makes Ollama stop producing tokens.
+
+    `timeout` bounds connect and each socket read (default: REQUEST_TIMEOUT_SECONDS),
+    and the time spent on retries. `num_predict` caps the number of generated
+    tokens. With `stop_after_json`, the stream is closed as soon as the first
+    top-level JSON object in the output is complete, and the output ends there.
+    `options` are Ollama generation options (temperature, num_ctx, ...) over
+    the defaults.
+
     Raises:
+        Cancelled if `cancel` fires before the response is complete.
         RuntimeError with args compatible with previous API behavior:
         - ("OLLAMA_HTTP_ERROR", details)
         - ("OLLAMA_UNREACHABLE", details)
         - ("OLLAMA_REQUEST_FAILED", details)
+        - ("OLLAMA_CIRCUIT_OPEN", details): failing fast, nothing was sent
     """
     if settings is None:
         settings = get_settings()
+    _track_in_flight(1)
+    try:
+        return _resilient(
+            settings,
+            lambda: _generate_once(
+                prompt,
+                settings=settings,
+                cancel=cancel,
+                timeout=timeout,
+                num_predict=num_predict,
+                stop_after_json=stop_after_json,
+                options=options,
+            ),
+            cancel=cancel,
+            budget=REQUEST_TIMEOUT_SECONDS if timeout is None else timeout,
+        )
+    finally:
+        _track_in_flight(-1)
+
 
-    url = f"{settings.ollama_url}/api/generate"
+def _generate_once(
+    prompt: str,
+    *,
+    settings: OllamaSettings,
+    cancel: CancelToken | None,
+    timeout: float | None,
+    num_predict: int | None,
+    stop_after_json: bool,
+    options: Mapping[str, Any] | None = None,
+) -> str:
+    """One /api/generate request (see generate())."""
+    url = urllib.parse.urlsplit(f"{settings.ollama_url}/api/generate")
     payload = {
         "model": settings.ollama_model,
         "prompt": prompt,
-        "stream": False,
-        "options": {"temperature": 0.1},
+        "stream": True,
+        "options": {"temperature": 0.1, **(options or {})},
     }
+    if num_predict is not None:
+        payload["options"]["num_predict"] = num_predict
     data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
+    collector = _collector.get()
+    started = time.perf_counter()
+
+    conn_cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(
+        url.hostname or "localhost",
+        url.port,
+        timeout=REQUEST_TIMEOUT_SECONDS if timeout is None else timeout,
     )
+    unregister = None
+    try:
+        try:
+            conn.connect()
+            # Keep our own reference: http.client drops conn.sock once a
+            # "Connection: close" response starts, but we still need to abort it.
+            sock = conn.sock
+            if cancel is not None:
+                unregister = cancel.add_callback(lambda: _abort(sock))
+            conn.request("POST", url.path, body=data, headers={"Content-Type": "application/json"})
+        except OSError as e:
+            if cancel is not None and cancel.cancelled:
+                raise Cancelled() from e
+            raise RuntimeError("OLLAMA_UNREACHABLE", str(e)) from e
+
+        try:
+            resp = conn.getresponse()
+            # Ollama sends the headers with the first chunk.
+            first_chunk = time.perf_counter() - started
+            if resp.status >= 400:
+                body = resp.read().decode("utf-8", errors="replace")
+                raise OllamaHTTPError(resp.status, body or f"HTTP Error {resp.status}: {resp.reason}")
+            lines, end, pending = _read_lines(
+                resp,
+                cancel,
+                _JsonObjectEnd() if stop_after_json else None,
+                drain=collector is not None and collector.drain,
+            )
+        except RuntimeError:
+            raise
+        except Exception as e:
+            if cancel is not None and cancel.cancelled:
+                raise Cancelled() from e
+            raise RuntimeError("OLLAMA_REQUEST_FAILED", str(e)) from e
+    finally:
+        if unregister is not None:
+            unregister()
+        conn.close()
 
+    text = _join_stream(lines)
+    if end is not None:
+        # Drained streams were read to the end: nothing was cut off.
+        if (collector is None or not collector.drain) and (pending or text[end:]):
+            EARLY_STOP_TOTAL.inc()
+        text = text[:end]
+    if collector is not None:
+        collector.stats.append(
+            _stream_stats(lines, settings.ollama_model, prompt, text, first_chunk, time.perf_counter() - started)
+        )
+    return text
+
+
+def embed(
+    text: str,
+    *,
+    settings: OllamaSettings | None = None,
+    timeout: float | None = None,
+) -> list[float]:
+    """
+    Call Ollama /api/embeddings with `settings.embedding_model` and return the
+    vector (under the same circuit breaker and retries as generate()).
+
+    Raises:
+        RuntimeError with the same codes as generate()
+    """
+    if settings is None:
+        settings = get_settings()
+    return _resilient(
+        settings,
+        lambda: _embed_once(text, settings=settings, timeout=timeout),
+        budget=REQUEST_TIMEOUT_SECONDS if timeout is None else timeout,
+    )
+
+
+def _embed_once(text: str, *, settings: OllamaSettings, timeout: float | None) -> list[float]:
+    """One /api/embeddings request (see embed())."""
+    url = urllib.parse.urlsplit(f"{settings.ollama_url}/api/embeddings")
+    data = json.dumps({"model": settings.embedding_model, "prompt": text}).encode("utf-8")
+    conn_cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(
+        url.hostname or "localhost",
+        url.port,
+        timeout=REQUEST_TIMEOUT_SECONDS if timeout is None else timeout,
+    )
     try:
-        with urllib.request.urlopen(req, timeout=120) as resp:
+        try:
+            conn.request("POST", url.path, body=data, headers={"Content-Type": "application/json"})
+        except OSError as e:
+            raise RuntimeError("OLLAMA_UNREACHABLE", str(e)) from e
+        try:
+            resp = conn.getresponse()
             body = resp.read().decode("utf-8", errors="replace")
-    except urllib.error.HTTPError as e:
-        body = ""
+        except Exception as e:
+            raise RuntimeError("OLLAMA_REQUEST_FAILED", str(e)) from e
+    finally:
+        conn.close()
+
+    if resp.status >= 400:
+        raise OllamaHTTPError(resp.status, body or f"HTTP Error {resp.status}: {resp.reason}")
+    try:
+        vector = json.loads(body)["embedding"]
+        if not vector or not all(isinstance(v, (int, float)) for v in vector):
+            raise ValueError("empty or non-numeric embedding")
+    except Exception as e:
+        raise RuntimeError("OLLAMA_REQUEST_FAILED", f"Invalid embeddings response: {e}") from e
+    return [float(v) for v in vector]
+
+
+def _abort(sock: socket.socket) -> None:
+    # Shutting the socket down unblocks a reader stuck in recv() on another thread.
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class _JsonObjectEnd:
+    """
+    Finds where the first top-level JSON object in streamed text ends, tracking
+    nesting depth and string / escape state so braces inside strings don't count.
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> int | None:
+        """Consume the next chunk; returns the end offset (exclusive) once the object closed."""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == "{":
+                self.depth += 1
+            elif self.depth == 0:
+                # Text before the object (whitespace, stray prose) is not JSON.
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.offset + i + 1
+        self.offset += len(text)
+        return None
+
+
+def _read_lines(
+    resp: http.client.HTTPResponse,
+    cancel: CancelToken | None,
+    object_end: _JsonObjectEnd | None = None,
+    *,
+    drain: bool = False,
+) -> tuple[list[bytes], int | None, bool]:
+    """
+    Read the NDJSON stream. With `object_end`, stop once the streamed `response`
+    text holds a complete JSON object and return its end offset too (with
+    `drain`, read the rest of the stream anyway).
+
+    The last item says whether the stream was cut off with more response text
+    on its way: one line past the object is read to tell (usually Ollama's
+    final, empty chunk, sent right after the last token).
+    """
+    lines: list[bytes] = []
+    found: int | None = None
+    for line in resp:
+        if cancel is not None and cancel.cancelled:
+            break
+        lines.append(line)
+        if object_end is None or not line.strip():
+            continue
         try:
-            body = e.read().decode("utf-8", errors="replace")
+            parsed = json.loads(line)
+            piece = parsed.get("response")
         except Exception:
-            pass
-        raise RuntimeError("OLLAMA_HTTP_ERROR", body or str(e)) from e
-    except urllib.error.URLError as e:
-        raise RuntimeError("OLLAMA_UNREACHABLE", str(e)) from e
-    except Exception as e:
-        raise RuntimeError("OLLAMA_REQUEST_FAILED", str(e)) from e
+            parsed, piece = None, None
+        if not isinstance(piece, str):
+            # Not the stream format we understand: read it all (see _join_stream).
+            object_end = None
+            continue
+        end = object_end.feed(piece)
+        if end is not None:
+            if not drain:
+                return lines, end, not parsed.get("done") and _response_pending(resp, cancel)
+            found, object_end = end, None
+    # A shut-down socket reads as EOF, so check once more after the loop.
+    if cancel is not None and cancel.cancelled:
+        raise Cancelled()
+    return lines, found, False
+
 
+def _response_pending(resp: http.client.HTTPResponse, cancel: CancelToken | None) -> bool:
+    """Whether the next stream line carries response text."""
+    if cancel is not None and cancel.cancelled:
+        return False
     try:
-        parsed = json.loads(body)
+        parsed = json.loads(resp.readline() or b"null")
     except Exception:
-        # Ollama should return JSON; if not, surface raw body.
-        return body
+        return False
+    return isinstance(parsed, dict) and bool(parsed.get("response"))
 
-    # Ollama /api/generate typically returns {"response": "...", ...}
-    if isinstance(parsed, dict) and isinstance(parsed.get("response"), str):
-        return parsed["response"]
-    return body
 
+def _stream_stats(
+    lines: list[bytes], model: str, prompt: str, text: str, first_chunk: float, seconds: float
+) -> GenerationStats:
+    chunks = 0
+    done: Dict[str, Any] = {}
+    for line in lines:
+        try:
+            parsed = json.loads(line)
+        except Exception:
+            continue
+        if not isinstance(parsed, dict):
+            continue
+        if parsed.get("response"):
+            chunks += 1
+        if parsed.get("done"):
+            done = parsed
+
+    def count(key: str) -> Optional[int]:
+        value = done.get(key)
+        return value if isinstance(value, int) else None
 
+    def duration(key: str) -> Optional[float]:
+        value = done.get(key)
+        return value / _NS if isinstance(value, (int, float)) else None
+
+    return GenerationStats(
+        model=model,
+        prompt_chars=len(prompt),
+        response=text,
+        first_chunk_seconds=first_chunk,
+        seconds=seconds,
+        chunks=chunks,
+        prompt_tokens=count("prompt_eval_count"),
+        prompt_seconds=duration("prompt_eval_duration"),
+        eval_tokens=count("eval_count"),
+        eval_seconds=duration("eval_duration"),
+    )
+
+
+def _join_stream(lines: list[bytes]) -> str:
+    """Concatenate streamed `response` chunks; fall back to the raw body if it isn't NDJSON."""
+    body = b"".join(lines).decode("utf-8", errors="replace")
+    chunks: list[str] = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            parsed = json.loads(line)
+        except Exception:
+            # Ollama should return JSON; if not, surface raw body.
+            return body
+        # Ollama /api/generate typically returns {"response": "...", ...} per chunk
+        if not isinstance(parsed, dict) or not isinstance(parsed.get("response"), str):
+            return body
+        chunks.append(parsed["response"])
+    return "".join(chunks) if chunks else body
@@ -2,15 +2,9 @@
 
 from __future__ import annotations
 
-PROMPT_TEMPLATE = PROMPT_TEMPLATE = (
-    "You are a resume analyzer.\n"
-    "Respond ONLY with valid JSON.\n"
-    "No markdown. No text outside the JSON object.\n\n"
-
-    "### Task:\n"
-    "Compare the resume to the job description and return structured JSON using the schema below.\n"
-    "If information is missing, make reasonable assumptions based on the available text.\n\n"
+from typing import Iterable, Mapping, Optional
 
+_ANALYSIS_SCHEMA = (
     "### Schema (must be followed exactly):\n"
     "{\n"
     '  "score": <integer between 0 and 1000>,\n'
@@ -28,6 +22,18 @@ PROMPT_TEMPLATE = PROMPT_TEMPLATE = (
     "- Return an empty array if no improvements are needed.\n"
     "- `analysis` may be `{}` if there is nothing additional to include.\n"
     "- Do not include any text outside the JSON object.\n\n"
+)
+
+PROMPT_TEMPLATE = (
+    "You are a resume analyzer.\n"
+    "Respond ONLY with valid JSON.\n"
+    "No markdown. No text outside the JSON object.\n\n"
+
+    "### Task:\n"
+    "Compare the resume to the job description and return structured JSON using the schema below.\n"
+    "If information is missing, make reasonable assumptions based on the available text.\n\n"
+
+    + _ANALYSIS_SCHEMA +
 
     "Resume:\n"
     "{{RESUME_TEXT}}\n\n"
@@ -36,8 +42,115 @@ PROMPT_TEMPLATE = PROMPT_TEMPLATE = (
     "### Output:\n"
 )
 
+# One part of a resume (some of its sections) against the whole job description.
+PARTIAL_PROMPT_TEMPLATE = (
+    "You are a resume analyzer.\n"
+    "Respond ONLY with valid JSON.\n"
+    "No markdown. No text outside the JSON object.\n\n"
+
+    "### Task:\n"
+    "The resume text below is only part of a longer resume: its {{SECTIONS}} section(s).\n"
+    "Score how well this part supports the candidate's fit for the job description, "
+    "and return structured JSON using the schema below.\n"
+    "Other sections are analysed separately: do not lower the score or add tips for information "
+    "that belongs in them (e.g. missing experience when this part is the education section).\n\n"
+
+    + _ANALYSIS_SCHEMA +
+
+    "Resume part ({{SECTIONS}}):\n"
+    "{{RESUME_TEXT}}\n\n"
+    "Job Description:\n"
+    "{{JOB_TEXT}}\n\n"
+    "### Output:\n"
+)
+
+
+REQUIREMENTS_PROMPT_TEMPLATE = (
+    "You extract hiring requirements from job descriptions.\n"
+    "Respond ONLY with valid JSON.\n"
+    "No markdown. No text outside the JSON object.\n\n"
+
+    "### Schema (must be followed exactly):\n"
+    "{\n"
+    '  "title": <string or null, the role title>,\n'
+    '  "seniority": <\"intern\" | \"junior\" | \"mid\" | \"senior\" | \"lead\" | \"unspecified\">,\n'
+    '  "min_years_experience": <integer or null>,\n'
+    '  "must_have_skills": [<string, a required skill, tool or qualification>],\n'
+    '  "nice_to_have_skills": [<string, a preferred but optional skill>],\n'
+    '  "keywords": [<string, other domain terms a matching resume would mention>]\n'
+    "}\n\n"
+
+    "Rules:\n"
+    "- Short items (a few words each), at most 25 per list, most important first.\n"
+    "- Only what the posting states or clearly implies.\n\n"
+
+    "Job Description:\n"
+    "{{JOB_TEXT}}\n\n"
+    "### Output:\n"
+)
+
+
+def build_prompt(
+    cv_text: str,
+    job_text: str,
+    *,
+    sections: Optional[Mapping[str, Mapping]] = None,
+    only: Optional[Iterable[str]] = None,
+    template: Optional[str] = None,
+) -> str:
+    """
+    Args:
+        sections: Parser section index (normalized["sections"]), offsets into `cv_text`
+        only: With `sections`, limit the resume block to these sections
+        template: Prompt with {{RESUME_TEXT}} and {{JOB_TEXT}} placeholders (default: PROMPT_TEMPLATE)
+    """
+    if sections is not None and only is not None:
+        cv_text = render_sections(cv_text, sections, only)
+    return (template or PROMPT_TEMPLATE).replace("{{RESUME_TEXT}}", cv_text).replace("{{JOB_TEXT}}", job_text)
+
+
+def build_partial_prompt(part_text: str, job_text: str, section_names: Iterable[str]) -> str:
+    """Prompt for one part of a resume, made of the named sections (see PARTIAL_PROMPT_TEMPLATE)."""
+    names = ", ".join(name.capitalize() for name in section_names) or "Other"
+    return (
+        PARTIAL_PROMPT_TEMPLATE.replace("{{SECTIONS}}", names)
+        .replace("{{RESUME_TEXT}}", part_text)
+        .replace("{{JOB_TEXT}}", job_text)
+    )
+
+
+def render_sections(cv_text: str, sections: Mapping[str, Mapping], names: Iterable[str]) -> str:
+    """Resume text for the named sections, sliced at the indexed offsets (no re-scanning)."""
+    blocks = []
+    for name in names:
+        span = sections.get(name)
+        text = cv_text[span["start"] : span["end"]].strip() if span else None
+        if text:
+            blocks.append(f"{name.capitalize()}:\n{text}")
+    return "\n\n".join(blocks)
+
 
-def build_prompt(cv_text: str, job_text: str) -> str:
-    return PROMPT_TEMPLATE.replace("{{RESUME_TEXT}}", cv_text).replace("{{JOB_TEXT}}", job_text)
+def build_requirements_prompt(job_text: str) -> str:
+    return REQUIREMENTS_PROMPT_TEMPLATE.replace("{{JOB_TEXT}}", job_text)
 
 
+def render_requirements(requirements: Mapping) -> str:
+    """
+    Compact job text for analysis prompts, from extracted requirements (see
+    schema.JobRequirements): it stands in for the full posting.
+    """
+    lines = ["Requirements extracted from the job posting (must-have skills weigh most):"]
+    if requirements.get("title"):
+        lines.append(f"Title: {requirements['title']}")
+    if requirements.get("seniority") not in (None, "unspecified"):
+        lines.append(f"Seniority: {requirements['seniority']}")
+    if requirements.get("min_years_experience") is not None:
+        lines.append(f"Minimum years of experience: {requirements['min_years_experience']}")
+    for key, label in (
+        ("must_have_skills", "Must have"),
+        ("nice_to_have_skills", "Nice to have"),
+        ("keywords", "Keywords"),
+    ):
+        if requirements.get(key):
+            lines.append(f"{label}: {', '.join(requirements[key])}")
+    return "\n".join(lines)
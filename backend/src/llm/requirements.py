@@ -0,0 +1,51 @@
+"""
+Job requirement extraction (domain layer).
+
+One LLM pass turns a job description into JobRequirements (title, seniority,
+must-have / nice-to-have skills, keywords). Registered jobs (resume/jobs.py)
+keep the result, so every candidate analysed against the job is prompted with
+the compact requirements instead of the whole posting.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from pydantic import ValidationError
+
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.deadline import Deadline  # type: ignore
+from backend.src.runtime.timing import stage  # type: ignore
+from . import tiers
+from .analyze_service import DomainError, generate_json
+from .prompt import build_requirements_prompt
+from .schema import JobRequirements, requirements_max_tokens, validate_job_requirements
+
+
+def extract_requirements(
+    job_text: str,
+    *,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+) -> JobRequirements:
+    """
+    Raises:
+        DomainError: INVALID_MODEL_OUTPUT when the answer is not valid requirements JSON
+        RuntimeError: Ollama errors (see ollama_client.generate)
+    """
+    with stage("prompt"):
+        prompt = build_requirements_prompt(job_text)
+    raw = generate_json(prompt, requirements_max_tokens(), cancel=cancel, deadline=deadline, tier=tier)
+    with stage("validate"):
+        try:
+            data = json.loads((raw or "").strip())
+        except ValueError:
+            raise DomainError(code="INVALID_MODEL_OUTPUT") from None
+        try:
+            return validate_job_requirements(data)
+        except ValidationError as e:
+            raise DomainError(
+                code="INVALID_MODEL_OUTPUT", message="Invalid job requirements", details=e.errors()
+            ) from None
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Optional
+import json
+import math
+from typing import Any, Dict, List, Literal, Optional, get_args
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 Severity = Literal["GOOD", "WARNING", "NEEDS_WORK"]
@@ -30,3 +32,97 @@ def validate_analyze_result(data: Any) -> AnalyzeResult:
     return AnalyzeResult.model_validate(data)
 
 
+Seniority = Literal["intern", "junior", "mid", "senior", "lead", "unspecified"]
+
+# Requirement lists past these sizes are not a summary of the posting any more:
+# longer answers are cut down to them rather than rejected.
+REQUIREMENTS_MAX_ITEMS = 25
+REQUIREMENTS_MAX_ITEM_CHARS = 80
+
+
+def _clip(value: Any) -> Any:
+    return value.strip()[:REQUIREMENTS_MAX_ITEM_CHARS] if isinstance(value, str) else value
+
+
+class JobRequirements(BaseModel):
+    """
+    Structured requirements extracted once from a job description.
+
+    Lenient about minor model deviations: unknown keys are dropped, an
+    over-long title, item or list is truncated and seniority is matched
+    case-insensitively. A wrong type or an unknown seniority is still invalid.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    title: Optional[str] = Field(default=None, max_length=REQUIREMENTS_MAX_ITEM_CHARS)
+    seniority: Seniority = "unspecified"
+    min_years_experience: Optional[int] = Field(default=None, ge=0, le=50)
+    must_have_skills: List[str] = Field(default_factory=list, max_length=REQUIREMENTS_MAX_ITEMS)
+    nice_to_have_skills: List[str] = Field(default_factory=list, max_length=REQUIREMENTS_MAX_ITEMS)
+    keywords: List[str] = Field(default_factory=list, max_length=REQUIREMENTS_MAX_ITEMS)
+
+    @field_validator("title", mode="before")
+    @classmethod
+    def _clip_title(cls, value: Any) -> Any:
+        return _clip(value) or None
+
+    @field_validator("seniority", mode="before")
+    @classmethod
+    def _seniority_case(cls, value: Any) -> Any:
+        return value.strip().lower() if isinstance(value, str) else value
+
+    @field_validator("must_have_skills", "nice_to_have_skills", "keywords", mode="before")
+    @classmethod
+    def _clip_items(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            return value
+        items = [_clip(item) for item in value]
+        return [item for item in items if item != ""][:REQUIREMENTS_MAX_ITEMS]
+
+
+def validate_job_requirements(data: Any) -> JobRequirements:
+    return JobRequirements.model_validate(data)
+
+
+# Generation budget: the longest answer we are prepared to wait for. Nothing in
+# the schema caps these, so they are generous upper bounds on a sensible answer.
+BUDGET_MAX_TIPS = 20
+BUDGET_TIP_ID_CHARS = 48
+BUDGET_TIP_MESSAGE_CHARS = 320
+BUDGET_ANALYSIS_CHARS = 2000
+# JSON punctuation and short keys tokenize densely; stay on the safe side.
+BUDGET_CHARS_PER_TOKEN = 3
+
+
+def max_output_tokens() -> int:
+    """
+    Token budget (Ollama `num_predict`) for an AnalyzeResult answer: the size of
+    a pretty-printed result with BUDGET_MAX_TIPS maximal tips and
+    BUDGET_ANALYSIS_CHARS of analysis.
+    """
+    tip = {
+        "id": "x" * BUDGET_TIP_ID_CHARS,
+        "message": "x" * BUDGET_TIP_MESSAGE_CHARS,
+        "severity": max(get_args(Severity), key=len),
+    }
+    result = {"score": 1000, "tips": [tip] * BUDGET_MAX_TIPS, "analysis": {}}
+    chars = len(json.dumps(result, indent=2)) + BUDGET_ANALYSIS_CHARS
+    return math.ceil(chars / BUDGET_CHARS_PER_TOKEN)
+
+
+def requirements_max_tokens() -> int:
+    """Token budget (Ollama `num_predict`) for a JobRequirements answer with every list full."""
+    item = "x" * REQUIREMENTS_MAX_ITEM_CHARS
+    items = [item] * REQUIREMENTS_MAX_ITEMS
+    result = {
+        "title": item,
+        "seniority": max(get_args(Seniority), key=len),
+        "min_years_experience": 50,
+        "must_have_skills": items,
+        "nice_to_have_skills": items,
+        "keywords": items,
+    }
+    return math.ceil(len(json.dumps(result, indent=2)) / BUDGET_CHARS_PER_TOKEN)
@@ -0,0 +1,243 @@
+"""
+Incremental, section-level LLM analysis (domain layer).
+
+The resume is split along the parser's section index and every section is
+analysed on its own, with a prompt that says it is only that section of the
+resume (prompt.build_partial_prompt), ANALYZE_CHUNK_CONCURRENCY sections at a
+time. Results are cached by (prompt hash,
+model), so re-running an edited resume only sends the changed sections to the
+model and merges their tips with the cached ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from backend.src.runtime import metrics  # type: ignore
+from backend.src.runtime.cache import get_cache  # type: ignore
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.deadline import Deadline  # type: ignore
+from backend.src.runtime.timing import bind, stage  # type: ignore
+from . import analyze_service, tiers
+from .prompt import build_partial_prompt, build_prompt
+from .schema import AnalyzeResult, validate_analyze_result
+
+CACHE_MAX_ENTRIES = 4096
+CACHE_TTL_SECONDS = 24 * 3600
+DEFAULT_CONCURRENCY = 4
+
+# Text outside any indexed section (name, contact details, unknown sections).
+OTHER_SECTION = "other"
+
+SECTION_CACHE_TOTAL = metrics.counter(
+    "resumeai_section_cache_total",
+    "Section-level analysis cache lookups (result: hit or miss).",
+    ("result",),
+)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def split_sections(cv_text: str, sections: Mapping[str, Mapping]) -> List[Tuple[str, str]]:
+    """
+    (name, text) units in document order: each indexed section, plus the text
+    outside all sections as OTHER_SECTION. Empty units are dropped.
+    """
+    spans = sorted(
+        (int(span["start"]), int(span["end"]), name)
+        for name, span in sections.items()
+        if isinstance(span, Mapping) and "start" in span and "end" in span
+    )
+    units: List[Tuple[str, str]] = []
+    other: List[str] = []
+    pos = 0
+    for start, end, name in spans:
+        if start > pos:
+            other.append(cv_text[pos:start])
+        text = cv_text[start:end].strip()
+        if text:
+            units.append((name, text))
+        pos = max(pos, end)
+    other.append(cv_text[pos:])
+    other_text = "\n".join(part.strip() for part in other if part.strip())
+    if other_text:
+        units.insert(0, (OTHER_SECTION, other_text))
+    return units
+
+
+def merge_results(
+    parts: Iterable[Tuple[float, AnalyzeResult]], *, cached: Optional[Sequence[bool]] = None
+) -> Tuple[int, list]:
+    """
+    Merge partial results: length-weighted mean score, tips deduplicated by id
+    (order preserved). Of two tips with the same id, the first wins unless
+    `cached` (one flag per part) says it came from the cache and the other was
+    just analysed: then the fresh one takes its place.
+    """
+    total_weight = 0.0
+    weighted = 0.0
+    tips = []
+    # tip id -> (index in tips, whether it came from a cached part)
+    seen: Dict[str, Tuple[int, bool]] = {}
+    for i, (weight, result) in enumerate(parts):
+        total_weight += weight
+        weighted += weight * result.score
+        from_cache = bool(cached[i]) if cached is not None else False
+        for tip in result.tips:
+            if tip.id not in seen:
+                seen[tip.id] = (len(tips), from_cache)
+                tips.append(tip)
+            elif seen[tip.id][1] and not from_cache:
+                index = seen[tip.id][0]
+                seen[tip.id] = (index, False)
+                tips[index] = tip
+    score = int(round(weighted / total_weight)) if total_weight > 0 else 0
+    return max(0, min(1000, score)), tips
+
+
+def concurrency() -> int:
+    """
+    Environment variables:
+    - ANALYZE_CHUNK_CONCURRENCY (default: 4): sections / chunks analysed at once per request
+    """
+    return max(1, int(os.getenv("ANALYZE_CHUNK_CONCURRENCY") or DEFAULT_CONCURRENCY))
+
+
+def _cache():
+    return get_cache("section_analysis", maxsize=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS)
+
+
+def cached_analysis(
+    text: str,
+    job_text: str,
+    *,
+    section_names: Optional[Sequence[str]] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+) -> Tuple[AnalyzeResult, bool]:
+    """
+    Analyse one part of a resume against `job_text`, through the section cache.
+
+    Args:
+        section_names: The sections `text` is made of; the model is told it
+            sees only that part of the resume (None: `text` is a whole resume)
+
+    Returns:
+        (result, whether it came from the cache)
+    """
+    with stage("prompt"):
+        if section_names is None:
+            prompt = build_prompt(text, job_text)
+        else:
+            prompt = build_partial_prompt(text, job_text, section_names)
+    model = tiers.ollama_settings(tier).ollama_model
+    # The prompt covers the part, the job and the template.
+    key = f"{model}:{_hash(prompt)}"
+    cached = _cache().get(key)
+    if cached is not None:
+        SECTION_CACHE_TOTAL.inc(result="hit")
+        return validate_analyze_result(cached), True
+    SECTION_CACHE_TOTAL.inc(result="miss")
+    result = analyze_service.analyze_prompt(prompt, cancel=cancel, deadline=deadline, tier=tier)
+    _cache().set(key, result.model_dump())
+    return result, False
+
+
+def analyze_parts(
+    parts: Sequence[Tuple[List[str], str]],
+    job_text: str,
+    *,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[Tuple[AnalyzeResult, bool]]:
+    """
+    cached_analysis of every (section names, text) part, `max_concurrency`
+    (default: ANALYZE_CHUNK_CONCURRENCY) at a time, in the order given.
+
+    Raises:
+        The first part's error (the other parts are cancelled).
+    """
+    workers = max(1, min(len(parts), max_concurrency or concurrency()))
+    # One token for all parts: the caller's cancellation, or a sibling's failure, stops them all.
+    token = CancelToken()
+    unlink = cancel.add_callback(token.cancel) if cancel is not None else None
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-part") as pool:
+            futures = [
+                pool.submit(
+                    bind(cached_analysis),
+                    text,
+                    job_text,
+                    section_names=names,
+                    cancel=token,
+                    deadline=deadline,
+                    tier=tier,
+                )
+                for names, text in parts
+            ]
+            done, _pending = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((f for f in futures if f in done and f.exception() is not None), None)
+            if failed is not None:
+                token.cancel()
+                for future in futures:
+                    future.cancel()
+                raise failed.exception()
+            return [future.result() for future in futures]
+    finally:
+        if unlink is not None:
+            unlink()
+
+
+def analyze_incremental(
+    cv_text: str,
+    job_text: str,
+    *,
+    sections: Optional[Mapping[str, Mapping]] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+) -> AnalyzeResult:
+    """
+    Analyse `cv_text` section by section, reusing cached section results.
+
+    Args:
+        sections: Parser section index for `cv_text` (computed if omitted)
+        tier: Model tier to use (see analyze_service.analyze_prompt)
+
+    Returns:
+        AnalyzeResult whose `analysis["sections"]` reports per-section score
+        and whether it came from the cache.
+    """
+    if sections is None:
+        from backend.src.pipeline.parser import index_sections  # type: ignore
+
+        sections = index_sections(cv_text)
+
+    units = split_sections(cv_text, sections)
+    if len(units) <= 1:
+        # Nothing to split on: a whole-resume analysis is the same amount of work.
+        return analyze_service.analyze(cv_text, job_text, cancel=cancel, deadline=deadline, tier=tier)
+
+    # Changed sections are analysed concurrently; unchanged ones are cache hits.
+    results = analyze_parts(
+        [([name], text) for name, text in units], job_text, cancel=cancel, deadline=deadline, tier=tier
+    )
+    parts: List[Tuple[float, AnalyzeResult]] = []
+    from_cache: List[bool] = []
+    report = {}
+    for (name, text), (result, cached) in zip(units, results):
+        parts.append((float(len(text)), result))
+        from_cache.append(cached)
+        report[name] = {"score": result.score, "cached": cached}
+
+    # A tip id repeated by an edited section supersedes the cached one.
+    score, tips = merge_results(parts, cached=from_cache)
+    return AnalyzeResult(score=score, tips=tips, analysis={"sections": report})
@@ -0,0 +1,126 @@
+"""
+Model tiers for LLM analysis (domain layer).
+
+"quick" serves high-volume sanity checks with a small model, "deep" detailed
+reviews with a large one; each tier has its own model and generation options.
+"auto" picks per request: quick for short inputs, deep for long ones, except
+that while Ollama is busy (TIER_AUTO_BUSY_DEPTH generations in flight from
+this process) inputs the quick model can still take go to quick, to keep
+latency bounded under load.
+
+Both tiers default to OLLAMA_MODEL, so nothing changes until they are configured.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Mapping, Optional
+
+from backend.src.runtime import metrics  # type: ignore
+from . import ollama_client
+
+QUICK = "quick"
+DEEP = "deep"
+AUTO = "auto"
+TIERS = (QUICK, DEEP)
+REQUESTABLE = TIERS + (AUTO,)
+
+DEFAULT_AUTO_QUICK_CHARS = 6000
+DEFAULT_AUTO_BUSY_QUICK_CHARS = 16000
+DEFAULT_AUTO_BUSY_DEPTH = 4
+
+SELECTED_TOTAL = metrics.counter(
+    "resumeai_analyze_tier_total",
+    "LLM analyses per requested and served tier.",
+    ("requested", "tier"),
+)
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    name: str
+    model: str
+    # Ollama generation options (temperature, num_ctx, top_p, ...)
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class TierSettings:
+    quick: ModelTier
+    deep: ModelTier
+    # Auto: inputs (CV + job characters) up to this go to quick...
+    auto_quick_chars: int = DEFAULT_AUTO_QUICK_CHARS
+    # ...and up to this while `auto_busy_depth` generations are in flight.
+    auto_busy_quick_chars: int = DEFAULT_AUTO_BUSY_QUICK_CHARS
+    auto_busy_depth: int = DEFAULT_AUTO_BUSY_DEPTH
+
+    def tier(self, name: str) -> ModelTier:
+        return self.quick if name == QUICK else self.deep
+
+
+def _options(name: str) -> Dict[str, Any]:
+    raw = os.getenv(name)
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"{name} must be a JSON object: {e}") from None
+    if not isinstance(value, dict):
+        raise ValueError(f"{name} must be a JSON object")
+    return value
+
+
+def get_settings() -> TierSettings:
+    """
+    Environment variables:
+    - OLLAMA_QUICK_MODEL, OLLAMA_DEEP_MODEL (default: OLLAMA_MODEL)
+    - OLLAMA_QUICK_OPTIONS, OLLAMA_DEEP_OPTIONS (default: none): JSON Ollama options, e.g. {"num_ctx": 4096}
+    - TIER_AUTO_QUICK_CHARS (default: 6000): longest input auto sends to quick
+    - TIER_AUTO_BUSY_QUICK_CHARS (default: 16000): longest input auto sends to quick while busy
+    - TIER_AUTO_BUSY_DEPTH (default: 4): generations in flight from which auto counts as busy
+    """
+    default_model = ollama_client.get_settings().ollama_model
+    return TierSettings(
+        quick=ModelTier(QUICK, os.getenv("OLLAMA_QUICK_MODEL") or default_model, _options("OLLAMA_QUICK_OPTIONS")),
+        deep=ModelTier(DEEP, os.getenv("OLLAMA_DEEP_MODEL") or default_model, _options("OLLAMA_DEEP_OPTIONS")),
+        auto_quick_chars=int(os.getenv("TIER_AUTO_QUICK_CHARS") or DEFAULT_AUTO_QUICK_CHARS),
+        auto_busy_quick_chars=int(os.getenv("TIER_AUTO_BUSY_QUICK_CHARS") or DEFAULT_AUTO_BUSY_QUICK_CHARS),
+        auto_busy_depth=int(os.getenv("TIER_AUTO_BUSY_DEPTH") or DEFAULT_AUTO_BUSY_DEPTH),
+    )
+
+
+def choose(input_chars: int, queue_depth: int, settings: TierSettings) -> str:
+    """The tier auto mode picks for an input of `input_chars` with `queue_depth` generations in flight."""
+    if input_chars <= settings.auto_quick_chars:
+        return QUICK
+    if queue_depth >= settings.auto_busy_depth and input_chars <= settings.auto_busy_quick_chars:
+        return QUICK
+    return DEEP
+
+
+def resolve(requested: Optional[str], input_chars: int, *, settings: Optional[TierSettings] = None) -> ModelTier:
+    """
+    The tier serving a request for tier `requested` (quick, deep or auto;
+    None means auto).
+
+    Raises:
+        ValueError: Unknown tier name
+    """
+    requested = (requested or AUTO).strip().lower()
+    if requested not in REQUESTABLE:
+        raise ValueError(f"tier must be one of {', '.join(REQUESTABLE)}")
+    settings = settings or get_settings()
+    name = requested if requested != AUTO else choose(input_chars, ollama_client.in_flight(), settings)
+    SELECTED_TOTAL.inc(requested=requested, tier=name)
+    return settings.tier(name)
+
+
+def ollama_settings(tier: Optional[ModelTier]) -> ollama_client.OllamaSettings:
+    """Ollama client settings with the tier's model (the default model without a tier)."""
+    settings = ollama_client.get_settings()
+    if tier is None or tier.model == settings.ollama_model:
+        return settings
+    return replace(settings, ollama_model=tier.model)
@@ -1,8 +1,6 @@
 """Resume parsing pipeline."""
 
 from .parser import parse_resume
-from .normalizer import normalize_extracted_data
-
-__all__ = ["parse_resume", "normalize_extracted_data"]
-
+from .normalizer import NormalizedResume, normalize_extracted_data, normalize_resume
 
+__all__ = ["parse_resume", "normalize_extracted_data", "normalize_resume", "NormalizedResume"]
@@ -0,0 +1,274 @@
+"""
+Format -> text extractor registry.
+
+Each supported file suffix maps to a loader that imports the heavy parsing
+dependency (pdfminer, python-docx, ...) on first use only, so importing the
+pipeline stays cheap and a deployment that only sees PDFs never pays for DOCX.
+
+Call warm_up() at process start to move that one-off cost off the first request.
+
+Extractors take `(path, cancel=None)` and should check the CancelToken at safe
+points (e.g. between PDF pages) so abandoned requests stop burning CPU.
+Archive-based formats are pre-checked (check_zip_archive) before any library
+inflates them.
+
+PDFs go through a chain of text backends (PDF_BACKENDS): pdfium when
+pypdfium2 is installed (native, several times faster than pdfminer), falling
+back to pdfminer when it fails or finds no text. Each backend's time is
+recorded as a `pdf_<backend>` stage.
+
+Environment variables:
+- PDF_BACKEND (default: auto): "auto" tries every installed backend in order;
+  "pdfium" or "pdfminer" uses only that one
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import zipfile
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from backend.src.runtime.cancellation import CancelToken, Cancelled  # type: ignore
+from backend.src.runtime.timing import stage  # type: ignore
+
+Extractor = Callable[..., str]
+ExtractorLoader = Callable[[], Extractor]
+
+# DOCX zip-bomb limits, checked from the archive directory before inflating anything.
+MAX_ZIP_ENTRIES = 2000
+MAX_ZIP_UNCOMPRESSED_BYTES = 64 * 1024 * 1024
+MAX_ZIP_COMPRESSION_RATIO = 100
+_ZIP_RATIO_MIN_BYTES = 1024 * 1024
+
+_LOADERS: Dict[str, ExtractorLoader] = {}
+_LOADED: Dict[str, Extractor] = {}
+_LOCK = threading.Lock()
+
+
+class UnsafeDocument(ValueError):
+    """The document was rejected before extraction (e.g. a zip bomb)."""
+
+
+def check_zip_archive(path: str) -> None:
+    """
+    Reject archives whose declared decompressed size or compression ratio is
+    excessive. zipfile never inflates a member past its declared size, so the
+    central directory is a trustworthy bound.
+
+    Raises:
+        UnsafeDocument: If a limit is exceeded
+    """
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+    if len(infos) > MAX_ZIP_ENTRIES:
+        raise UnsafeDocument(f"Archive has too many entries ({len(infos)} > {MAX_ZIP_ENTRIES})")
+    total = 0
+    for info in infos:
+        total += info.file_size
+        if info.file_size > _ZIP_RATIO_MIN_BYTES and info.file_size > MAX_ZIP_COMPRESSION_RATIO * max(1, info.compress_size):
+            raise UnsafeDocument(
+                f"Archive entry {info.filename} exceeds compression ratio {MAX_ZIP_COMPRESSION_RATIO}:1"
+            )
+    if total > MAX_ZIP_UNCOMPRESSED_BYTES:
+        raise UnsafeDocument(
+            f"Archive decompresses to {total} bytes (limit {MAX_ZIP_UNCOMPRESSED_BYTES})"
+        )
+
+
+def register_extractor(suffix: str, loader: ExtractorLoader) -> None:
+    """
+    Register a lazy extractor loader for a file suffix (e.g. ".pdf").
+
+    The loader is called at most once, and must return a callable that takes a
+    file path (and optional `cancel` token) and returns the extracted plain text.
+    """
+    suffix = suffix.lower()
+    with _LOCK:
+        _LOADERS[suffix] = loader
+        _LOADED.pop(suffix, None)
+
+
+def supported_suffixes() -> list[str]:
+    return list(_LOADERS)
+
+
+def get_extractor(suffix: str) -> Extractor:
+    """
+    Return the extractor for `suffix`, loading its dependencies on first use.
+
+    Raises:
+        ValueError: If no extractor is registered for the suffix.
+    """
+    suffix = suffix.lower()
+    extractor = _LOADED.get(suffix)
+    if extractor is not None:
+        return extractor
+
+    loader = _LOADERS.get(suffix)
+    if loader is None:
+        raise ValueError(
+            f"Unsupported file format: {suffix}. Supported: {', '.join(supported_suffixes())}"
+        )
+
+    with _LOCK:
+        extractor = _LOADED.get(suffix)
+        if extractor is None:
+            extractor = loader()
+            _LOADED[suffix] = extractor
+    return extractor
+
+
+def warm_up(suffixes: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Eagerly load extractors and return the load time (seconds) per suffix.
+
+    Args:
+        suffixes: Suffixes to load (default: every registered suffix)
+    """
+    timings: Dict[str, float] = {}
+    for suffix in suffixes if suffixes is not None else supported_suffixes():
+        start = time.perf_counter()
+        get_extractor(suffix)
+        timings[suffix.lower()] = time.perf_counter() - start
+    return timings
+
+
+# PDF text backends, fastest first.
+PDF_BACKENDS: Tuple[str, ...] = ("pdfium", "pdfminer")
+
+_PDF_LOADED: Dict[str, Optional[Extractor]] = {}
+_PDF_LOCK = threading.Lock()
+# pdfium is not thread-safe; only one document is processed at a time per process.
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _load_pdfium() -> Extractor:
+    import pypdfium2 as pdfium  # type: ignore
+
+    def _extract(path: str, cancel: Optional[CancelToken] = None) -> str:
+        pages = []
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(path)
+            try:
+                for index in range(len(pdf)):
+                    if cancel is not None:
+                        cancel.raise_if_cancelled()
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    try:
+                        pages.append(textpage.get_text_bounded())
+                    finally:
+                        textpage.close()
+                        page.close()
+            finally:
+                pdf.close()
+        # pdfium ends lines with CRLF; pdfminer (and everything downstream) uses LF.
+        return "\n\n".join(pages).replace("\r\n", "\n").replace("\r", "\n").strip()
+
+    return _extract
+
+
+def _load_pdfminer() -> Extractor:
+    from io import StringIO
+
+    from pdfminer.converter import TextConverter  # type: ignore
+    from pdfminer.layout import LAParams  # type: ignore
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager  # type: ignore
+    from pdfminer.pdfpage import PDFPage  # type: ignore
+
+    def _extract(path: str, cancel: Optional[CancelToken] = None) -> str:
+        # Same pipeline as pdfminer.high_level.extract_text, unrolled so we can
+        # stop between pages.
+        with open(path, "rb") as fp, StringIO() as output:
+            rsrcmgr = PDFResourceManager(caching=True)
+            device = TextConverter(rsrcmgr, output, codec="utf-8", laparams=LAParams())
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            for page in PDFPage.get_pages(fp, caching=True):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                interpreter.process_page(page)
+            return (output.getvalue() or "").strip()
+
+    return _extract
+
+
+_PDF_LOADERS: Dict[str, ExtractorLoader] = {"pdfium": _load_pdfium, "pdfminer": _load_pdfminer}
+
+
+def pdf_backends() -> Tuple[str, ...]:
+    """PDF backends to try, in order (see PDF_BACKEND)."""
+    choice = (os.getenv("PDF_BACKEND") or "auto").strip().lower()
+    if choice == "auto":
+        return PDF_BACKENDS
+    if choice not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF_BACKEND: {choice!r} (expected auto, {', '.join(PDF_BACKENDS)})")
+    return (choice,)
+
+
+def get_pdf_backend(name: str) -> Optional[Extractor]:
+    """
+    The extractor for PDF backend `name`, loaded on first use, or None if its
+    library isn't installed.
+    """
+    if name in _PDF_LOADED:
+        return _PDF_LOADED[name]
+    with _PDF_LOCK:
+        if name not in _PDF_LOADED:
+            try:
+                _PDF_LOADED[name] = _PDF_LOADERS[name]()
+            except ImportError:
+                _PDF_LOADED[name] = None
+        return _PDF_LOADED[name]
+
+
+def _load_pdf() -> Extractor:
+    # Load the preferred backend now (warm-up); fallbacks load when first needed.
+    for name in pdf_backends():
+        if get_pdf_backend(name) is not None:
+            break
+
+    def _extract(path: str, cancel: Optional[CancelToken] = None) -> str:
+        error: Optional[Exception] = None
+        tried = False
+        for name in pdf_backends():
+            extract = get_pdf_backend(name)
+            if extract is None:
+                continue
+            tried = True
+            with stage(f"pdf_{name}"):
+                try:
+                    text = extract(path, cancel=cancel)
+                except (Cancelled, UnsafeDocument, MemoryError):
+                    raise
+                except Exception as e:
+                    error = e
+                    continue
+            if text:
+                return text
+            error = None
+        if not tried:
+            raise ImportError(f"No PDF backend installed (tried {', '.join(pdf_backends())})")
+        if error is not None:
+            raise error
+        return ""
+
+    return _extract
+
+
+def _load_docx() -> Extractor:
+    from docx import Document  # type: ignore
+
+    def _extract(path: str, cancel: Optional[CancelToken] = None) -> str:
+        check_zip_archive(path)
+        doc = Document(path)
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        return "\n".join((p.text or "").strip() for p in doc.paragraphs if (p.text or "").strip()).strip()
+
+    return _extract
+
+
+register_extractor(".pdf", _load_pdf)
+register_extractor(".docx", _load_docx)
@@ -1,13 +1,107 @@
 """Normalize extracted resume data to a stable schema."""
 
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+
+def _to_list(value):
+    """Convert value to list, handling strings and None."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if item]
+    return [str(value).strip()] if str(value).strip() else []
+
+
+def _to_string(value):
+    """Convert value to string or None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip() if value.strip() else None
+    return str(value).strip() if str(value).strip() else None
+
+
+def _to_float(value):
+    """Convert value to float or None."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_int(value):
+    """Convert value to int or None."""
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+
+def _normalize_skills(skills):
+    """Normalize skills list: dedupe, strip, keep order."""
+    if not skills:
+        return []
+
+    seen = set()
+    result = []
+    for skill in _to_list(skills):
+        skill_lower = skill.lower().strip()
+        if skill_lower and skill_lower not in seen:
+            seen.add(skill_lower)
+            result.append(skill)
+
+    return result
+
+
+def _normalize_sections(sections):
+    """Keep well-formed {name: {start, end}} entries only (offsets into the resume text)."""
+    if not isinstance(sections, dict):
+        return {}
+    result = {}
+    for name, span in sections.items():
+        if not isinstance(name, str) or not isinstance(span, dict):
+            continue
+        start, end = _to_int(span.get("start")), _to_int(span.get("end"))
+        if start is None or end is None:
+            continue
+        result[name] = {"start": start, "end": end}
+    return result
+
+
+# Output key -> converter applied to the raw value under the same key. Order is
+# the order of the normalized dict.
+SCHEMA: Tuple[Tuple[str, Callable[[Any], Any]], ...] = (
+    ("name", _to_string),
+    ("email", _to_string),
+    ("mobile_number", _to_string),
+    ("skills", _normalize_skills),
+    ("total_experience", _to_float),
+    ("degree", _to_list),
+    ("college_name", _to_list),
+    ("designation", _to_list),
+    ("company_names", _to_list),
+    ("no_of_pages", _to_int),
+    ("sections", _normalize_sections),
+)
+
 
 def normalize_extracted_data(data: dict) -> dict:
     """
     Normalize extracted resume data to a stable schema.
-    
+
     Args:
         data: Raw extracted data from PyResparser
-        
+
     Returns:
         Normalized dictionary with stable keys:
         - name: str | None
@@ -20,72 +114,77 @@ def normalize_extracted_data(data: dict) -> dict:
         - designation: list[str]
         - company_names: list[str]
         - no_of_pages: int | None
+        - sections: dict[str, {"start": int, "end": int}]
+          (section offsets into the resume text; see parser.index_sections)
     """
-    def to_list(value):
-        """Convert value to list, handling strings and None."""
-        if value is None:
-            return []
-        if isinstance(value, str):
-            return [value] if value.strip() else []
-        if isinstance(value, list):
-            return [str(item).strip() for item in value if item]
-        return [str(value).strip()] if str(value).strip() else []
-    
-    def to_string(value):
-        """Convert value to string or None."""
-        if value is None:
-            return None
-        if isinstance(value, str):
-            return value.strip() if value.strip() else None
-        return str(value).strip() if str(value).strip() else None
-    
-    def to_float(value):
-        """Convert value to float or None."""
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-    
-    def to_int(value):
-        """Convert value to int or None."""
-        if value is None:
-            return None
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return None
-    
-    def normalize_skills(skills):
-        """Normalize skills list: dedupe, strip, keep order."""
-        if not skills:
-            return []
-        
-        seen = set()
-        result = []
-        for skill in to_list(skills):
-            skill_lower = skill.lower().strip()
-            if skill_lower and skill_lower not in seen:
-                seen.add(skill_lower)
-                result.append(skill)
-        
-        return result
-    
-    # Extract and normalize fields
-    normalized = {
-        "name": to_string(data.get("name")),
-        "email": to_string(data.get("email")),
-        "mobile_number": to_string(data.get("mobile_number")),
-        "skills": normalize_skills(data.get("skills")),
-        "total_experience": to_float(data.get("total_experience")),
-        "degree": to_list(data.get("degree")),
-        "college_name": to_list(data.get("college_name")),
-        "designation": to_list(data.get("designation")),
-        "company_names": to_list(data.get("company_names")),
-        "no_of_pages": to_int(data.get("no_of_pages")),
-    }
-    
-    return normalized
+    get = data.get
+    return {key: convert(get(key)) for key, convert in SCHEMA}
+
+
+# (name, start, end)
+Section = Tuple[str, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedResume:
+    """
+    Compact, immutable form of a normalized resume for holding large corpora in
+    memory (analytics, re-scoring). Lists become tuples, sections become tuples,
+    and skills / section names are interned, so a skill shared by 100k resumes
+    is stored once.
+
+    to_dict() returns exactly what normalize_extracted_data() returns.
+    """
+
+    name: Optional[str]
+    email: Optional[str]
+    mobile_number: Optional[str]
+    skills: Tuple[str, ...]
+    total_experience: Optional[float]
+    degree: Tuple[str, ...]
+    college_name: Tuple[str, ...]
+    designation: Tuple[str, ...]
+    company_names: Tuple[str, ...]
+    no_of_pages: Optional[int]
+    sections: Tuple[Section, ...]
+
+    @classmethod
+    def from_dict(cls, normalized: Mapping[str, Any]) -> "NormalizedResume":
+        """Build from an already-normalized dict (e.g. a stored /parse result)."""
+        intern = sys.intern
+        sections = normalized.get("sections") or {}
+        return cls(
+            name=normalized.get("name"),
+            email=normalized.get("email"),
+            mobile_number=normalized.get("mobile_number"),
+            skills=tuple(intern(s) for s in normalized.get("skills") or ()),
+            total_experience=normalized.get("total_experience"),
+            degree=tuple(normalized.get("degree") or ()),
+            college_name=tuple(normalized.get("college_name") or ()),
+            designation=tuple(normalized.get("designation") or ()),
+            company_names=tuple(normalized.get("company_names") or ()),
+            no_of_pages=normalized.get("no_of_pages"),
+            sections=tuple(
+                (intern(name), span["start"], span["end"]) for name, span in sections.items()
+            ),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "email": self.email,
+            "mobile_number": self.mobile_number,
+            "skills": list(self.skills),
+            "total_experience": self.total_experience,
+            "degree": list(self.degree),
+            "college_name": list(self.college_name),
+            "designation": list(self.designation),
+            "company_names": list(self.company_names),
+            "no_of_pages": self.no_of_pages,
+            "sections": {name: {"start": start, "end": end} for name, start, end in self.sections},
+        }
 
 
+def normalize_resume(data: dict) -> NormalizedResume:
+    """Like normalize_extracted_data(), but returns the compact NormalizedResume."""
+    return NormalizedResume.from_dict(normalize_extracted_data(data))
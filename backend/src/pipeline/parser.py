@@ -3,95 +3,225 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-from pdfminer.high_level import extract_text  # type: ignore
-from docx import Document  # type: ignore
+from typing import Optional
 
+from backend.src.runtime.cancellation import CancelToken, Cancelled  # type: ignore
+from .extractors import UnsafeDocument, get_extractor
+from .skills import get_matcher
 
-def parse_resume(file_path: str) -> dict:
+# Canonical section -> header spellings (compared case-insensitively, trailing ":" ignored).
+SECTION_HEADERS: dict[str, tuple[str, ...]] = {
+    "summary": (
+        "summary",
+        "professional summary",
+        "profile",
+        "professional profile",
+        "about",
+        "about me",
+        "objective",
+        "career objective",
+        "headline",
+    ),
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ),
+    "education": ("education", "academic background", "academics", "education and training"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies", "competencies"),
+}
+
+# Headers that close the previous section without being indexed themselves.
+_OTHER_HEADERS = frozenset(
+    {
+        "projects",
+        "certifications",
+        "certificates",
+        "languages",
+        "interests",
+        "hobbies",
+        "references",
+        "awards",
+        "publications",
+        "volunteering",
+        "volunteer experience",
+        "courses",
+        "contact",
+    }
+)
+
+_HEADER_LOOKUP = {alias: name for name, aliases in SECTION_HEADERS.items() for alias in aliases}
+_MAX_HEADER_LEN = 40
+
+
+def parse_resume(file_path: str, *, cancel: Optional[CancelToken] = None) -> dict:
     """
     Parse a resume file by extracting text (PDF/DOCX) and deriving basic fields.
     
     Args:
         file_path: Path to the resume file (PDF or DOCX)
+        cancel: Optional token; extraction stops early once it is cancelled
         
     Returns:
         Dictionary with extracted resume data
         
     Raises:
         FileNotFoundError: If the file doesn't exist
+        Cancelled: If `cancel` fired during extraction
         ValueError: If parsing fails or file format is unsupported
     """
+    text = extract_resume_text(file_path, cancel=cancel)
+    try:
+        return derive_fields(text)
+    except Exception as e:
+        raise ValueError(f"Error parsing resume: {str(e)}") from e
+
+
+def extract_resume_text(file_path: str, *, cancel: Optional[CancelToken] = None) -> str:
+    """
+    Extract plain text from a resume file (PDF/DOCX).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        Cancelled: If `cancel` fired during extraction
+        UnsafeDocument: If the file was rejected before extraction (e.g. zip bomb)
+        ValueError: If extraction fails, yields no text or the format is unsupported
+    """
     path = Path(file_path)
     
     if not path.exists():
         raise FileNotFoundError(f"Resume file not found: {file_path}")
     
     try:
-        suffix = path.suffix.lower()
-        if suffix == ".pdf":
-            text = (extract_text(str(path)) or "").strip()
-        elif suffix == ".docx":
-            doc = Document(str(path))
-            text = "\n".join((p.text or "").strip() for p in doc.paragraphs if (p.text or "").strip()).strip()
-        elif suffix == ".doc":
-            raise ValueError("Unsupported file format: .doc. Supported: .pdf, .docx")
-        else:
-            raise ValueError(f"Unsupported file format: {path.suffix}. Supported: .pdf, .docx")
+        # Dependencies for the format are imported on first use (see extractors.py).
+        text = get_extractor(path.suffix)(str(path), cancel=cancel)
 
         if not text:
             raise ValueError("Failed to extract text from resume")
+        return text
+    except (Cancelled, UnsafeDocument):
+        raise
+    except Exception as e:
+        raise ValueError(f"Error parsing resume: {str(e)}") from e
 
-        # Best-effort field derivation (deterministic, driven by extracted text).
-        email_match = re.search(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", text, flags=re.IGNORECASE)
-        phone_match = re.search(
-            r"(\+?\d{1,3}[\s.-]?)?(\(?\d{2,4}\)?[\s.-]?)?\d{3,4}[\s.-]?\d{3,4}",
-            text,
-        )
-
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        name = lines[0] if lines else None
-        if name and (email_match and email_match.group(0) in name):
-            name = None
-
-        # Extract a "skills" section if present: take lines after "Skills" header until blank/header-ish.
-        skills: list[str] = []
-        for i, ln in enumerate(lines):
-            if re.fullmatch(r"skills", ln, flags=re.IGNORECASE):
-                for nxt in lines[i + 1 : i + 8]:
-                    if re.fullmatch(r"[A-Z][A-Z\s]{2,}", nxt):  # next major header
-                        break
-                    parts = re.split(r"[,•|/]\s*", nxt)
-                    skills.extend([p.strip() for p in parts if p.strip()])
-                break
 
-        # Very light heuristics for degree + company names.
-        degree: list[str] = []
-        for pat in (r"\bB\.?Sc\b", r"\bM\.?Sc\b", r"\bB\.?E\b", r"\bB\.?Tech\b", r"\bM\.?Tech\b", r"\bMBA\b", r"\bPh\.?D\b"):
-            if re.search(pat, text, flags=re.IGNORECASE):
-                degree.append(pat.replace(r"\b", "").replace("\\", "").replace("?", "").replace(".", ""))
-
-        company_names: list[str] = []
-        for ln in lines:
-            if re.search(r"\b(Inc|LLC|Ltd|AB|GmbH|Company)\b", ln, flags=re.IGNORECASE):
-                company_names.append(ln[:120])
-            if len(company_names) >= 5:
+def derive_fields(text: str) -> dict:
+    """
+    Best-effort field derivation (deterministic, driven by extracted text).
+
+    Also used on raw `cv_text` (e.g. /analyze fallbacks), where no file exists.
+    """
+    email_match = re.search(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", text, flags=re.IGNORECASE)
+    phone_match = re.search(
+        r"(\+?\d{1,3}[\s.-]?)?(\(?\d{2,4}\)?[\s.-]?)?\d{3,4}[\s.-]?\d{3,4}",
+        text,
+    )
+
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    name = lines[0] if lines else None
+    if name and (email_match and email_match.group(0) in name):
+        name = None
+
+    sections = index_sections(text)
+
+    # Skills: take up to 7 lines of the "Skills" section, stopping at an all-caps header.
+    skills: list[str] = []
+    if "skills" in sections:
+        skill_lines = [ln.strip() for ln in section_text(text, sections["skills"]).splitlines() if ln.strip()]
+        for nxt in skill_lines[:7]:
+            if re.fullmatch(r"[A-Z][A-Z\s]{2,}", nxt):  # next major header
                 break
+            parts = re.split(r"[,•|/]\s*", nxt)
+            skills.extend([p.strip() for p in parts if p.strip()])
 
-        extracted_data = {
-            "name": name,
-            "email": email_match.group(0) if email_match else None,
-            "mobile_number": phone_match.group(0) if phone_match else None,
-            "skills": skills,
-            "total_experience": None,
-            "degree": degree,
-            "college_name": [],
-            "designation": [],
-            "company_names": company_names,
-            "no_of_pages": None,
-        }
-
-        return extracted_data
-    except Exception as e:
-        raise ValueError(f"Error parsing resume: {str(e)}") from e
+    # Plus every taxonomy skill mentioned anywhere in the text (resumes without a
+    # skills header, tools named in experience bullets), as canonical names;
+    # ambiguous terms ("Go", "Excel") only count in the Skills section.
+    matcher = get_matcher()
+    if matcher is not None:
+        found = matcher.find(text)
+        if "skills" in sections:
+            found += matcher.find(section_text(text, sections["skills"]), skills_section=True)
+        merged: dict[str, str] = {}
+        for skill in [matcher.canonical(s) or s for s in skills] + found:
+            merged.setdefault(skill.lower(), skill)
+        skills = list(merged.values())
+
+    # Very light heuristics for degree + company names.
+    degree: list[str] = []
+    for pat in (r"\bB\.?Sc\b", r"\bM\.?Sc\b", r"\bB\.?E\b", r"\bB\.?Tech\b", r"\bM\.?Tech\b", r"\bMBA\b", r"\bPh\.?D\b"):
+        if re.search(pat, text, flags=re.IGNORECASE):
+            degree.append(pat.replace(r"\b", "").replace("\\", "").replace("?", "").replace(".", ""))
+
+    company_names: list[str] = []
+    for ln in lines:
+        if re.search(r"\b(Inc|LLC|Ltd|AB|GmbH|Company)\b", ln, flags=re.IGNORECASE):
+            company_names.append(ln[:120])
+        if len(company_names) >= 5:
+            break
+
+    extracted_data = {
+        "name": name,
+        "email": email_match.group(0) if email_match else None,
+        "mobile_number": phone_match.group(0) if phone_match else None,
+        "skills": skills,
+        "total_experience": None,
+        "degree": degree,
+        "college_name": [],
+        "designation": [],
+        "company_names": company_names,
+        "no_of_pages": None,
+        "sections": sections,
+    }
+
+    return extracted_data
+
+
+def index_sections(text: str) -> dict[str, dict]:
+    """
+    Locate the summary / experience / education / skills sections in one pass.
+
+    A header is a short line matching a known spelling (see SECTION_HEADERS).
+    Each section runs from the end of its header line to the start of the next
+    recognized header; only the first occurrence of a section is kept.
+
+    Returns:
+        {name: {"start": int, "end": int}}: character offsets of each section's
+        body in `text`, surrounding whitespace excluded (see section_text).
+    """
+    spans: dict[str, tuple[int, int]] = {}
+    current: Optional[str] = None
+    current_start = 0
+    offset = 0
+    for raw in text.splitlines(keepends=True):
+        line_start = offset
+        offset += len(raw)
+        stripped = raw.strip()
+        if not stripped or len(stripped) > _MAX_HEADER_LEN:
+            continue
+        key = " ".join(stripped.rstrip(":").split()).lower()
+        section = _HEADER_LOOKUP.get(key)
+        if section is None and key not in _OTHER_HEADERS:
+            continue
+        if current is not None:
+            spans[current] = (current_start, line_start)
+        current = section if section not in spans else None
+        current_start = offset
+    if current is not None:
+        spans[current] = (current_start, len(text))
+
+    index: dict[str, dict] = {}
+    for name, (start, end) in spans.items():
+        body = text[start:end]
+        lead = len(body) - len(body.lstrip())
+        index[name] = {"start": start + lead, "end": start + max(lead, len(body.rstrip()))}
+    return index
 
 
+def section_text(text: str, span: dict) -> str:
+    """The body of one indexed section: text[start:end] (stripped)."""
+    return text[span["start"] : span["end"]].strip()
@@ -0,0 +1,342 @@
+"""
+Isolated parser worker processes.
+
+pdfminer / python-docx run in child processes so a pathological document cannot
+take the API process down with it. Each job runs under:
+
+- a per-document CPU-time limit (RLIMIT_CPU, re-armed before every job)
+- an address-space limit for the worker (RLIMIT_AS), lowered before every job
+  to "current size + per-document budget" when one is set
+- a wall-clock limit enforced by the parent, which kills the worker
+
+Workers are recycled after `max_jobs_per_worker` documents to contain leaks in
+the parsing libraries. A job that had its worker killed raises ParserKilled.
+
+Stage timings (and a cProfile, when the request is being profiled) recorded in
+the worker are sent back with the result and merged into the caller's collector,
+as are metrics (replayed into the parent's registry, which serves /metrics).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import signal
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from backend.src.runtime import memory, metrics  # type: ignore
+from backend.src.runtime import timing  # type: ignore
+from backend.src.runtime.cancellation import CancelToken, Cancelled  # type: ignore
+from backend.src.runtime.profiling import RequestProfile  # type: ignore
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX
+    resource = None  # type: ignore
+
+POLL_INTERVAL_SECONDS = 0.05
+
+KILLED_TOTAL = metrics.counter(
+    "resumeai_parser_killed_total",
+    "Parser jobs whose worker process was killed (reason: timeout, cpu_limit, memory_limit, crashed).",
+    ("reason",),
+)
+RECYCLED_TOTAL = metrics.counter(
+    "resumeai_parser_workers_recycled_total",
+    "Parser worker processes replaced after reaching their job limit.",
+)
+
+
+class ParserKilled(Exception):
+    """The worker parsing a document was killed (see `reason`)."""
+
+    code = "PARSER_KILLED"
+
+    def __init__(self, reason: str, message: str) -> None:
+        super().__init__(reason, message)
+        self.reason = reason
+        self.message = message
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    cpu_seconds: int = 30
+    memory_bytes: int = 1024 * 1024 * 1024
+    wall_seconds: float = 60.0
+    max_jobs_per_worker: int = 50
+    # Address-space growth allowed per document (0: only memory_bytes applies).
+    document_memory_bytes: int = 0
+
+
+def _arm_cpu_limit(cpu_seconds: int) -> None:
+    # RLIMIT_CPU counts the whole process lifetime, so the soft limit is moved
+    # to "CPU used so far + budget" before each document.
+    if resource is None or cpu_seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _apply_memory_limit(memory_bytes: int) -> None:
+    """Set the RLIMIT_AS soft limit (memory_bytes <= 0: up to the hard limit)."""
+    if resource is None:
+        return
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if memory_bytes <= 0:
+        memory_bytes = hard
+    elif hard != resource.RLIM_INFINITY:
+        memory_bytes = min(memory_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+
+
+def _arm_document_budget(limits: SandboxLimits) -> bool:
+    """
+    Lower RLIMIT_AS to "address space in use + document budget" when that is
+    tighter than the worker limit. Returns whether it was lowered.
+    """
+    if resource is None or limits.document_memory_bytes <= 0:
+        return False
+    in_use = memory.address_space_bytes()
+    if in_use is None:
+        return False
+    soft = in_use + limits.document_memory_bytes
+    if 0 < limits.memory_bytes <= soft:
+        return False
+    _apply_memory_limit(soft)
+    return True
+
+
+def _worker_main(conn, limits: SandboxLimits) -> None:
+    # Load parsing dependencies before the memory limit applies to jobs.
+    try:
+        from backend.src.pipeline.extractors import warm_up  # type: ignore
+        from backend.src.pipeline.skills import get_matcher  # type: ignore
+
+        warm_up()
+        get_matcher()
+    except Exception:
+        pass
+    # One document at a time: memory measured here is the document's own.
+    memory.set_exclusive()
+    _apply_memory_limit(limits.memory_bytes)
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg is None:
+            return
+        fn, args, profile = msg
+        _arm_cpu_limit(limits.cpu_seconds)
+        budgeted = _arm_document_budget(limits)
+        collector = timing.Timings(RequestProfile() if profile else None)
+        records: List[metrics.Record] = []
+        try:
+            with timing.collecting(collector), metrics.capturing() as records, (
+                collector.profile.profiling() if collector.profile is not None else nullcontext()
+            ):
+                status, value = "ok", fn(*args)
+        except MemoryError:
+            status, value = ("memory_budget" if budgeted else "memory"), None
+        except BaseException as e:
+            status, value = "err", e
+        if budgeted:
+            # The budget covers the job, not sending its result.
+            _apply_memory_limit(limits.memory_bytes)
+        stats = collector.profile.export() if collector.profile is not None else None
+        try:
+            conn.send((status, value, collector.as_dict(), stats, records))
+        except Exception as e:
+            # Unpicklable result/exception: report it as a plain error.
+            conn.send(("err", RuntimeError(f"{type(e).__name__}: {e}"), collector.as_dict(), None, records))
+
+
+class _Worker:
+    def __init__(self, ctx, limits: SandboxLimits) -> None:
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, limits), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.jobs = 0
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=2)
+        except Exception:
+            pass
+        self.kill()
+
+
+def _exit_reason(process) -> str:
+    code = process.exitcode
+    if code is not None and code < 0 and -code == getattr(signal, "SIGXCPU", None):
+        return "cpu_limit"
+    return "crashed"
+
+
+def _default_context():
+    methods = multiprocessing.get_all_start_methods()
+    # Never fork the (multi-threaded) API process directly.
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParserPool:
+    """A fixed-size pool of sandboxed worker processes, created on demand."""
+
+    def __init__(self, size: int, limits: Optional[SandboxLimits] = None, *, context=None) -> None:
+        self.size = max(1, size)
+        self.limits = limits or SandboxLimits()
+        self._ctx = context or _default_context()
+        self._idle: List[_Worker] = []
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        cancel: Optional[CancelToken] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run `fn(*args)` (a picklable, module-level function) in a worker.
+
+        Args:
+            timeout: Wall-clock limit for this job (default: limits.wall_seconds)
+
+        Raises:
+            ParserKilled: The worker hit a limit and was killed
+            MemoryBudgetExceeded: The job hit the per-document memory budget
+                (the worker is replaced)
+            Cancelled: `cancel` fired; the worker (if running) was killed
+            Exception: Whatever `fn` raised in the worker
+        """
+        worker = self._acquire(cancel)
+        healthy = False
+        collector = timing.current()
+        profile = collector.profile if collector is not None else None
+        try:
+            worker.conn.send((fn, args, profile is not None))
+            worker.jobs += 1
+            wall = self.limits.wall_seconds if timeout is None else min(timeout, self.limits.wall_seconds)
+            expires_at = time.monotonic() + wall
+            while not worker.conn.poll(POLL_INTERVAL_SECONDS):
+                if cancel is not None and cancel.cancelled:
+                    raise Cancelled()
+                if time.monotonic() >= expires_at:
+                    KILLED_TOTAL.inc(reason="timeout")
+                    raise ParserKilled("timeout", f"Parsing exceeded {wall:g}s")
+                if not worker.alive():
+                    break
+            try:
+                status, value, stages, stats, records = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(timeout=1)
+                reason = _exit_reason(worker.process)
+                KILLED_TOTAL.inc(reason=reason)
+                raise ParserKilled(reason, f"Parser worker exited (code {worker.process.exitcode})") from None
+            if collector is not None:
+                collector.merge(stages)
+            if profile is not None and stats:
+                profile.add_stats(stats)
+            metrics.replay(records)
+            if status == "memory_budget":
+                memory.BUDGET_REJECTED_TOTAL.inc()
+                raise memory.MemoryBudgetExceeded(self.limits.document_memory_bytes)
+            if status == "memory":
+                KILLED_TOTAL.inc(reason="memory_limit")
+                raise ParserKilled("memory_limit", "Parsing exceeded the worker memory limit")
+            healthy = True
+            if status == "err":
+                raise value
+            return value
+        finally:
+            self._release(worker, healthy)
+
+    def prestart(self) -> None:
+        """Spawn all workers now so the first documents don't pay for process start-up."""
+        spawned = []
+        with self._cond:
+            while self._count < self.size and not self._closed:
+                self._count += 1
+                spawned.append(None)
+        workers = []
+        try:
+            for _ in spawned:
+                workers.append(_Worker(self._ctx, self.limits))
+        finally:
+            with self._cond:
+                self._count -= len(spawned) - len(workers)
+                self._idle.extend(workers)
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+
+    def _acquire(self, cancel: Optional[CancelToken]) -> _Worker:
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("ParserPool is closed")
+                if self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._count -= 1
+                    continue
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._cond.wait(POLL_INTERVAL_SECONDS)
+            if cancel is not None and cancel.cancelled:
+                raise Cancelled()
+        try:
+            return _Worker(self._ctx, self.limits)
+        except BaseException:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        recycle = healthy and worker.jobs >= self.limits.max_jobs_per_worker
+        if healthy and not recycle and not self._closed:
+            with self._cond:
+                self._idle.append(worker)
+                self._cond.notify()
+            return
+        if recycle:
+            RECYCLED_TOTAL.inc()
+            worker.stop()
+        else:
+            worker.kill()
+        with self._cond:
+            self._count -= 1
+            self._cond.notify()
@@ -0,0 +1,205 @@
+"""
+Skills taxonomy matcher.
+
+A taxonomy maps canonical skill names to synonyms. It is compiled once into an
+Aho-Corasick automaton, and the whole resume text is matched in a single pass,
+so matching cost grows with the text length, not with the number of terms.
+
+Taxonomy file format (UTF-8 text, one skill per line, lines starting with `#`
+are comments):
+
+    JavaScript | JS | ECMAScript
+    Kubernetes | k8s
+    Go | ?"Go" | Golang
+
+The first entry on a line is the canonical name. Terms match case-insensitively
+on word boundaries, and runs of whitespace in the text match a single space.
+A term in double quotes must match its exact case (for words that double as
+ordinary English, like "Go" or "React"). A term marked with `?` (`?Shell`,
+`?"Go"`) is too ambiguous for free text ("Led R&D", "Excel in communication",
+"Go-to-market") and only counts in the resume's Skills section. The canonical
+name is matched as a term too unless it also appears quoted or marked on its line.
+
+Environment variables:
+- SKILLS_TAXONOMY (default: the bundled data/skills_taxonomy.txt): path to a
+  taxonomy file; empty disables taxonomy matching
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent / "data" / "skills_taxonomy.txt"
+
+_WHITESPACE = re.compile(r"\s+")
+
+# (canonical, term, case_sensitive, skills_section_only)
+Entry = Tuple[str, str, bool, bool]
+
+
+def _fold(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.strip())
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _parse_term(part: str) -> Tuple[str, bool, bool]:
+    only = part.startswith("?")
+    if only:
+        part = part[1:].strip()
+    exact = len(part) > 2 and part.startswith('"') and part.endswith('"')
+    return _fold(part[1:-1] if exact else part), exact, only
+
+
+def parse_taxonomy(lines: Iterable[str]) -> List[Entry]:
+    """Parse taxonomy lines (see module docstring) into (canonical, term, case_sensitive, skills_only) entries."""
+    entries: List[Entry] = []
+    for raw in lines:
+        line = raw.strip()
+        # Whole-line comments only: "#" is part of skill names like C# and F#.
+        if not line or line.startswith("#"):
+            continue
+        terms = [_parse_term(p.strip()) for p in line.split("|") if p.strip()]
+        canonical = terms[0][0]
+        restricted = {term for term, exact, only in terms if exact or only}
+        for term, exact, only in terms:
+            if not exact and not only and term in restricted:
+                continue
+            entries.append((canonical, term, exact, only))
+    return entries
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over the (case-folded) terms of a taxonomy."""
+
+    def __init__(self, entries: Iterable[Entry]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: (term length, term id) of every term ending here, incl. via fail links.
+        self._out: List[Tuple[Tuple[int, int], ...]] = [()]
+        self._terms: List[Entry] = []
+        self._lookup: Dict[str, str] = {}
+        self._exact_lookup: Dict[str, str] = {}
+        seen = set()
+        for canonical, term, exact, only in entries:
+            key = (term if exact else term.lower(), exact)
+            if not term or key in seen:
+                continue
+            seen.add(key)
+            if exact:
+                self._exact_lookup.setdefault(term, canonical)
+            else:
+                self._lookup.setdefault(term.lower(), canonical)
+            self._add(term.lower(), len(self._terms))
+            self._terms.append((canonical, term, exact, only))
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _add(self, term: str, term_id: int) -> None:
+        node = 0
+        for ch in term:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + ((len(term), term_id),)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical name for a whole term, e.g. "JS" -> "JavaScript" (None if unknown)."""
+        term = _fold(term)
+        return self._lookup.get(term.lower()) or self._exact_lookup.get(term)
+
+    def find(self, text: str, *, skills_section: bool = False) -> List[str]:
+        """
+        Canonical skills mentioned in `text`, in order of first mention. With
+        `skills_section`, `text` is the resume's Skills section and `?` terms count too.
+        """
+        folded = _fold(text)
+        lowered = folded.lower()
+        if len(lowered) != len(folded):
+            # A few characters change length when lowercased; keep offsets aligned.
+            lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in folded)
+
+        goto, fail, out, terms = self._goto, self._fail, self._out, self._terms
+        hits: List[Tuple[int, int, int]] = []  # (start, -length, term id)
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, term_id in out[node]:
+                start = i - length + 1
+                _canonical, term, exact, only = terms[term_id]
+                if only and not skills_section:
+                    continue
+                if _is_word(term[0]) and start > 0 and _is_word(folded[start - 1]):
+                    continue
+                if _is_word(term[-1]) and i + 1 < len(folded) and _is_word(folded[i + 1]):
+                    continue
+                if exact and folded[start : i + 1] != term:
+                    continue
+                hits.append((start, -length, term_id))
+
+        # Leftmost-longest, non-overlapping: "C++" wins over "C", "Machine Learning" over "Learning".
+        hits.sort()
+        found: Dict[str, None] = {}
+        covered = 0
+        for start, neg_length, term_id in hits:
+            if start < covered:
+                continue
+            covered = start - neg_length
+            found.setdefault(terms[term_id][0], None)
+        return list(found)
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_path: Optional[str] = None
+_LOCK = threading.Lock()
+
+
+def load_matcher(path: str | Path) -> SkillMatcher:
+    with open(path, encoding="utf-8") as f:
+        return SkillMatcher(parse_taxonomy(f))
+
+
+def get_matcher() -> Optional[SkillMatcher]:
+    """The process-wide matcher for SKILLS_TAXONOMY (compiled on first use), or None if disabled."""
+    global _matcher, _matcher_path
+    path = os.getenv("SKILLS_TAXONOMY")
+    path = str(DEFAULT_TAXONOMY_PATH) if path is None else path.strip()
+    if not path:
+        return None
+    if _matcher is not None and _matcher_path == path:
+        return _matcher
+    with _LOCK:
+        if _matcher is None or _matcher_path != path:
+            _matcher = load_matcher(path)
+            _matcher_path = path
+        return _matcher
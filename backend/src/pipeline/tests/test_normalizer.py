@@ -1,7 +1,9 @@
 """Tests for the normalizer module."""
 
+import dataclasses
+
 import pytest
-from backend.src.pipeline.normalizer import normalize_extracted_data
+from backend.src.pipeline.normalizer import NormalizedResume, normalize_extracted_data, normalize_resume
 
 
 def test_normalize_empty_data():
@@ -117,3 +119,47 @@ def test_normalize_types_exact():
     assert isinstance(result["no_of_pages"], int)
 
 
+
+
+def test_normalize_sections():
+    """Test that the section index is kept and malformed entries are dropped."""
+    data = {
+        "sections": {
+            "skills": {"start": 10, "end": 20, "text": " Python "},
+            "summary": {"start": "x", "end": 5},
+            "education": "not a span",
+        }
+    }
+    result = normalize_extracted_data(data)
+    # Offsets only: the text stays in the resume text, not in every copy of the result.
+    assert result["sections"] == {"skills": {"start": 10, "end": 20}}
+    assert normalize_extracted_data({})["sections"] == {}
+
+
+def test_normalized_resume_round_trips_to_dict():
+    """NormalizedResume.to_dict() matches normalize_extracted_data exactly."""
+    data = {
+        "name": " Ada ",
+        "skills": ["Python", "python", "SQL"],
+        "degree": "BSc",
+        "total_experience": "3",
+        "no_of_pages": 2.0,
+        "sections": {"skills": {"start": 0, "end": 12}},
+    }
+
+    resume = normalize_resume(data)
+
+    assert resume.to_dict() == normalize_extracted_data(data)
+    assert resume.skills == ("Python", "SQL")
+    assert NormalizedResume.from_dict(resume.to_dict()) == resume
+
+
+def test_normalized_resume_is_compact_and_interned():
+    """Frozen, slotted, and equal skills share one string object."""
+    a = normalize_resume({"skills": ["".join(["Dock", "er"])]})
+    b = normalize_resume({"skills": ["".join(["Do", "cker"])]})
+
+    assert a.skills[0] is b.skills[0]
+    assert not hasattr(a, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        a.name = "x"
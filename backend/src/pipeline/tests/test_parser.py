@@ -0,0 +1,42 @@
+"""Tests for text-driven field derivation in the parser module."""
+
+from backend.src.pipeline.parser import derive_fields, index_sections, section_text
+
+RESUME = (
+    "Ada Lovelace\n"
+    "ada@example.com\n"
+    "Summary\n"
+    "Backend engineer focused on reliability.\n"
+    "Work Experience:\n"
+    "Acme Inc - Engineer\n"
+    "Cut latency by 40%.\n"
+    "Projects\n"
+    "Analytical engine notes\n"
+    "Education\n"
+    "BSc Mathematics\n"
+    "SKILLS\n"
+    "Python, SQL\n"
+    "Docker\n"
+)
+
+
+def test_index_sections_offsets_match_text():
+    sections = index_sections(RESUME)
+    assert set(sections) == {"summary", "experience", "education", "skills"}
+    for span in sections.values():
+        assert set(span) == {"start", "end"}
+        # Offsets exclude the whitespace around a section's body.
+        assert RESUME[span["start"] : span["end"]] == section_text(RESUME, span)
+    assert section_text(RESUME, sections["experience"]) == "Acme Inc - Engineer\nCut latency by 40%."
+    assert section_text(RESUME, sections["education"]) == "BSc Mathematics"
+
+
+def test_index_sections_keeps_first_occurrence():
+    text = "Skills\nPython\nSkills\nJava\n"
+    assert section_text(text, index_sections(text)["skills"]) == "Python"
+
+
+def test_derive_fields_reads_skills_from_section_index():
+    data = derive_fields(RESUME)
+    assert data["skills"] == ["Python", "SQL", "Docker"]
+    assert section_text(RESUME, data["sections"]["summary"]) == "Backend engineer focused on reliability."
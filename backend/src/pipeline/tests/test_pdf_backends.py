@@ -0,0 +1,115 @@
+"""PDF text backends: pdfium/pdfminer parity and fallback."""
+
+import pytest
+
+from backend.src.pipeline import extractors
+from backend.src.runtime import timing
+from tools.bench_pdf import fields
+
+CORPUS = {
+    "engineer": [
+        "Ada Lovelace",
+        "ada@example.com  +44 20 7946 0958",
+        "Summary",
+        "Backend engineer focused on reliability.",
+        "Work Experience",
+        "Acme Inc - Senior Engineer 2019-2024",
+        "Cut p99 latency by 40% for 2M users.",
+        "Education",
+        "BSc Mathematics, University of London",
+        "Skills",
+        "Python, PostgreSQL, Kubernetes, Terraform",
+    ],
+    "analyst": [
+        "Grace Hopper",
+        "grace.hopper@example.org",
+        "Experience",
+        "Data analyst at Remington Rand Company",
+        "Built COBOL reporting for the finance team",
+        "Education",
+        "PhD Mathematics",
+        "Technical Skills",
+        "SQL | Excel | Tableau",
+    ],
+    "designer": [
+        "Sam Rivera",
+        "sam@studio.example",
+        "Profile",
+        "Product designer. Figma, user research, prototyping.",
+        "Employment History",
+        "Studio Nine LLC - Lead Designer",
+        "MBA",
+    ],
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines) -> bytes:
+    """A one-page PDF with each line set in Helvetica."""
+    ops = ["BT", "/F1 11 Tf", "14 TL", "72 760 Td"]
+    for line in lines:
+        ops.append(f"({_escape(line)}) Tj T*")
+    ops.append("ET")
+    stream = "\n".join(ops).encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+        b" /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture(params=sorted(CORPUS))
+def pdf_path(request, tmp_path):
+    path = tmp_path / f"{request.param}.pdf"
+    # Twice over, so skills and sections also span later lines.
+    path.write_bytes(make_pdf(CORPUS[request.param] * 2))
+    return str(path)
+
+
+def test_pdfium_and_pdfminer_derive_equivalent_fields(pdf_path):
+    pytest.importorskip("pypdfium2")
+    pdfium = extractors.get_pdf_backend("pdfium")(pdf_path)
+    pdfminer = extractors.get_pdf_backend("pdfminer")(pdf_path)
+    assert fields(pdfium) == fields(pdfminer)
+
+
+def test_pdf_falls_back_to_pdfminer(pdf_path, monkeypatch):
+    def broken(_path, cancel=None):
+        raise RuntimeError("unsupported")
+
+    monkeypatch.setitem(extractors._PDF_LOADED, "pdfium", broken)
+    collector = timing.Timings()
+    with timing.collecting(collector):
+        text = extractors.get_extractor(".pdf")(pdf_path)
+    assert text == extractors.get_pdf_backend("pdfminer")(pdf_path)
+    assert {"pdf_pdfium", "pdf_pdfminer"} <= set(collector.as_dict())
+
+
+def test_pdf_backend_setting(pdf_path, monkeypatch):
+    monkeypatch.setenv("PDF_BACKEND", "pdfminer")
+    assert extractors.pdf_backends() == ("pdfminer",)
+    collector = timing.Timings()
+    with timing.collecting(collector):
+        assert extractors.get_extractor(".pdf")(pdf_path)
+    assert list(collector.as_dict()) == ["pdf_pdfminer"]
+
+    monkeypatch.setenv("PDF_BACKEND", "fitz")
+    with pytest.raises(ValueError):
+        extractors.pdf_backends()
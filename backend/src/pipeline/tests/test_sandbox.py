@@ -0,0 +1,120 @@
+"""Tests for sandboxed parser workers and archive pre-checks."""
+
+import os
+import time
+import zipfile
+
+import pytest
+
+from backend.src.pipeline.extractors import UnsafeDocument, check_zip_archive
+from backend.src.pipeline.sandbox import ParserKilled, ParserPool, SandboxLimits
+from backend.src.resume.parse_service import parse_with_text
+from backend.src.runtime import memory
+
+
+@pytest.fixture
+def pool_factory():
+    pools = []
+
+    def _make(**limits):
+        pool = ParserPool(1, SandboxLimits(**limits))
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def test_pool_runs_job_and_propagates_errors(pool_factory):
+    pool = pool_factory()
+    assert pool.run(len, "abc") == 3
+    with pytest.raises(TypeError):
+        pool.run(len, 5)
+
+
+def test_wall_clock_timeout_kills_worker(pool_factory):
+    pool = pool_factory(wall_seconds=0.3)
+    started = time.perf_counter()
+    with pytest.raises(ParserKilled) as e:
+        pool.run(time.sleep, 5)
+    assert e.value.reason == "timeout"
+    assert time.perf_counter() - started < 3
+    # A fresh worker replaces the killed one.
+    assert pool.run(len, "ok") == 2
+
+
+def test_cpu_limit_kills_worker(pool_factory):
+    pool = pool_factory(cpu_seconds=1, wall_seconds=30)
+    with pytest.raises(ParserKilled) as e:
+        pool.run(pow, 7, 10**9)
+    assert e.value.reason == "cpu_limit"
+
+
+def test_memory_limit_maps_to_distinct_reason(pool_factory):
+    pool = pool_factory(memory_bytes=768 * 1024 * 1024)
+    with pytest.raises(ParserKilled) as e:
+        pool.run(bytearray, 4 * 1024 * 1024 * 1024)
+    assert e.value.reason == "memory_limit"
+
+
+def test_document_memory_budget_rejects_job(pool_factory):
+    pool = pool_factory(document_memory_bytes=64 * 1024 * 1024)
+    with pytest.raises(memory.MemoryBudgetExceeded):
+        pool.run(bytearray, 256 * 1024 * 1024)
+    # The budget is per document, not cumulative.
+    for _ in range(3):
+        assert len(pool.run(bytearray, 16 * 1024 * 1024)) == 16 * 1024 * 1024
+
+
+def _docx(tmp_path):
+    from docx import Document
+
+    path = tmp_path / "cv.docx"
+    doc = Document()
+    doc.add_paragraph("Jane Doe\njane@example.com\nSkills: Python, SQL")
+    doc.save(path)
+    return path
+
+
+def test_worker_metrics_reach_parent_registry(pool_factory, tmp_path):
+    path = _docx(tmp_path)
+    labels = {"format": ".docx", "size": "<100KB"}
+    before = memory.RSS_GROWTH_BYTES.count(**labels)
+    text, _data = pool_factory().run(parse_with_text, str(path))
+    assert "Jane Doe" in text
+    assert memory.RSS_GROWTH_BYTES.count(**labels) == before + 1
+
+
+def test_measured_budget_is_enforced_in_workers_only(pool_factory, tmp_path, monkeypatch):
+    path = _docx(tmp_path)
+    monkeypatch.setenv("PARSER_DOC_MEMORY_MB", "0.001")
+    monkeypatch.setenv("MEMORY_TRACE", "1")
+    # In-process, concurrent extractions share the process: only recorded.
+    text, _data = parse_with_text(str(path))
+    assert "Jane Doe" in text
+    assert not memory.exclusive()
+    # A worker parses one document at a time, so parse_with_text enforces the budget there.
+    assert pool_factory().run(memory.exclusive) is True
+
+
+def test_workers_recycled_after_job_limit(pool_factory):
+    pool = pool_factory(max_jobs_per_worker=2)
+    pids = [pool.run(os.getpid) for _ in range(3)]
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+
+
+def test_zip_bomb_rejected_before_inflating(tmp_path):
+    path = tmp_path / "bomb.docx"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", b"\0" * (8 * 1024 * 1024))
+    with pytest.raises(UnsafeDocument):
+        check_zip_archive(str(path))
+
+
+def test_normal_archive_passes(tmp_path):
+    path = tmp_path / "ok.docx"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", os.urandom(64 * 1024))
+    check_zip_archive(str(path))
@@ -0,0 +1,88 @@
+"""Tests for the skills taxonomy matcher."""
+
+from backend.src.pipeline import skills
+from backend.src.pipeline.parser import derive_fields
+from backend.src.pipeline.skills import SkillMatcher, parse_taxonomy
+
+TAXONOMY = """
+# comment
+JavaScript | JS | ECMAScript
+Go | "Go" | Golang
+C++
+C# | CSharp
+C | "C"
+Machine Learning
+Learning
+Node.js | NodeJS
+"""
+
+
+def _matcher():
+    return SkillMatcher(parse_taxonomy(TAXONOMY.splitlines()))
+
+
+def test_synonyms_map_to_canonical_names_in_mention_order():
+    text = "Wrote ecmascript and Golang services; some JS too."
+    assert _matcher().find(text) == ["JavaScript", "Go"]
+
+
+def test_word_boundaries_and_exact_case_terms():
+    m = _matcher()
+    assert m.find("Let's go to Google") == []
+    assert m.find("Backend in Go.") == ["Go"]
+    assert m.find("Jsonnet, nodejs2") == []
+
+
+def test_longest_match_wins_and_whitespace_is_folded():
+    m = _matcher()
+    assert m.find("C++ and C# and C") == ["C++", "C#", "C"]
+    assert m.find("Applied machine\n   learning") == ["Machine Learning"]
+    assert m.find("Node.js") == ["Node.js"]
+
+
+def test_canonical_lookup():
+    m = _matcher()
+    assert m.canonical("csharp") == "C#"
+    assert m.canonical("Go") == "Go"
+    assert m.canonical("go") is None
+    assert m.canonical("unknown") is None
+
+
+def test_derive_fields_finds_skills_without_a_header(monkeypatch, tmp_path):
+    path = tmp_path / "taxonomy.txt"
+    path.write_text(TAXONOMY)
+    monkeypatch.setenv("SKILLS_TAXONOMY", str(path))
+    text = "Jane Doe\nBuilt NodeJS APIs and ML pipelines in Golang.\nSkills\nJS, Docker\n"
+    assert derive_fields(text)["skills"] == ["JavaScript", "Docker", "Node.js", "Go"]
+
+    monkeypatch.setenv("SKILLS_TAXONOMY", "")
+    assert skills.get_matcher() is None
+    assert derive_fields(text)["skills"] == ["JS", "Docker"]
+
+
+def test_bundled_taxonomy_loads():
+    m = skills.load_matcher(skills.DEFAULT_TAXONOMY_PATH)
+    assert len(m) > 300
+    assert m.find("Deployed on k8s with Terraform") == ["Kubernetes", "Terraform"]
+
+
+def test_marked_terms_only_count_in_the_skills_section():
+    m = SkillMatcher(parse_taxonomy(['Go | ?"Go" | Golang', "Hive | ?Hive | Apache Hive"]))
+    assert m.find("Go-to-market at Hive Solutions") == []
+    assert m.find("Golang on Apache Hive") == ["Go", "Hive"]
+    assert m.find("Go, hive", skills_section=True) == ["Go", "Hive"]
+    assert m.canonical("hive") == "Hive"
+
+
+def test_bundled_taxonomy_ignores_ordinary_words_in_prose():
+    m = skills.load_matcher(skills.DEFAULT_TAXONOMY_PATH)
+    prose = "Led R&D team at Shell. Hive Solutions Ltd. Go-to-market strategy. Excel in communication."
+    assert m.find(prose) == []
+    assert m.find("Worked in collaboration with the Chef and a Consul; Swift delivery.") == []
+    assert m.find("R, Go, Excel, Shell, Hive", skills_section=True) == ["R", "Go", "Excel", "Shell Scripting", "Hive"]
+
+
+def test_derive_fields_counts_ambiguous_skills_only_under_the_skills_header():
+    text = "Jane Doe\nGo-to-market lead; Excel in communication.\nSkills\nPython\nTools: Go and Excel\n"
+    assert derive_fields(text)["skills"] == ["Python", "Tools: Go and Excel", "Go", "Excel"]
+    assert derive_fields("Jane Doe\nGo-to-market lead; Excel in communication.\n")["skills"] == []
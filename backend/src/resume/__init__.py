@@ -1,5 +1,5 @@
 """Resume domain services."""
 
-__all__ = ["parse_service", "score_service"]
+__all__ = ["batch", "jobs", "parse_service", "ranking", "score_service", "semantic", "store"]
 
 
@@ -0,0 +1,85 @@
+"""
+Bulk-parse resumes to JSONL:
+
+    python -m backend.src.resume ARCHIVE_DIR [MORE_PATHS...] -o parsed.jsonl --jobs 8
+    python -m backend.src.resume --files-from list.txt -o parsed.jsonl
+
+Re-running with the same `-o` resumes: documents whose content hash is already
+in the output are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Iterator, Optional, Sequence
+
+from backend.src.pipeline.extractors import supported_suffixes  # type: ignore
+from backend.src.pipeline.sandbox import SandboxLimits  # type: ignore
+
+from .batch import ProgressPrinter, iter_inputs, load_checkpoint, run_batch
+
+
+def _read_list(path: str) -> Iterator[str]:
+    with (sys.stdin if path == "-" else open(path)) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.src.resume",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("paths", nargs="*", help="Files or directories (walked recursively)")
+    parser.add_argument("--files-from", help="File with one path per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", required=True, help="JSONL output (also the checkpoint)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel parser processes")
+    parser.add_argument("--prefetch", type=int, default=64, help="Files read ahead of the parsers")
+    parser.add_argument("--retry-errors", action="store_true", help="Re-parse documents that failed before")
+    parser.add_argument("--cpu-seconds", type=int, default=SandboxLimits.cpu_seconds)
+    parser.add_argument("--memory-mb", type=int, default=SandboxLimits.memory_bytes // (1024 * 1024))
+    parser.add_argument(
+        "--doc-memory-mb",
+        type=float,
+        default=0,
+        help="Memory one document may take (default: no per-document budget)",
+    )
+    parser.add_argument("--timeout-seconds", type=float, default=SandboxLimits.wall_seconds)
+    parser.add_argument("--max-jobs-per-worker", type=int, default=SandboxLimits.max_jobs_per_worker)
+    args = parser.parse_args(argv)
+    if not args.paths and not args.files_from:
+        parser.error("give at least one path or --files-from")
+
+    def _inputs() -> Iterator[str]:
+        yield from iter_inputs(args.paths, supported_suffixes())
+        if args.files_from:
+            yield from iter_inputs(_read_list(args.files_from), supported_suffixes())
+
+    done = load_checkpoint(args.output, retry_errors=args.retry_errors)
+    if done:
+        print(f"Resuming: {len(done)} documents already in {args.output}", file=sys.stderr)
+    progress = ProgressPrinter(sys.stderr)
+    limits = SandboxLimits(
+        cpu_seconds=args.cpu_seconds,
+        memory_bytes=args.memory_mb * 1024 * 1024,
+        wall_seconds=args.timeout_seconds,
+        max_jobs_per_worker=args.max_jobs_per_worker,
+        document_memory_bytes=int(args.doc_memory_mb * 1024 * 1024),
+    )
+    with open(args.output, "a", encoding="utf-8") as out:
+        stats = run_batch(
+            _inputs(), out, done=done, jobs=args.jobs, prefetch=args.prefetch, limits=limits, on_progress=progress
+        )
+    progress(stats, force=True)
+    if stats.unreadable:
+        print(f"{stats.unreadable} files could not be read", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Bulk parse + score of resume files (domain layer), used by `python -m backend.src.resume`.
+
+Documents are parsed in sandboxed worker processes (pipeline.sandbox.ParserPool,
+with the same CPU / memory / wall-clock limits as the API). A prefetch thread
+reads and hashes files ahead of the workers, so disk I/O overlaps parsing and the
+workers find the bytes in the page cache.
+
+Output is JSONL, one record per document, written as each document finishes:
+
+    {"resume_id": ..., "path": ..., "ok": true, "data": {...}, "score": 640, "tips": [...]}
+    {"resume_id": ..., "path": ..., "ok": false, "error": {"code": ..., "message": ...}}
+
+The output file doubles as the checkpoint: re-running with the same output skips
+every content hash already recorded there (and any duplicate within the run), so
+a killed run picks up where it stopped. `--retry-errors` first drops the failed
+records from it, so every resume_id keeps a single record.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Callable, Iterable, Iterator, List, Optional, Set
+
+from backend.src.pipeline.sandbox import ParserKilled, ParserPool, SandboxLimits  # type: ignore
+
+_READ_CHUNK = 1024 * 1024
+
+
+@dataclass
+class BatchStats:
+    ok: int = 0
+    failed: int = 0
+    skipped: int = 0  # already in the output (checkpoint) or duplicate content
+    unreadable: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.ok + self.failed
+
+
+def iter_inputs(paths: Iterable[str], suffixes: Iterable[str]) -> Iterator[str]:
+    """Files among `paths` (directories walked recursively, sorted) with a supported suffix."""
+    suffixes = tuple(s.lower() for s in suffixes)
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(suffixes):
+                        yield os.path.join(root, name)
+        elif path.lower().endswith(suffixes):
+            yield path
+
+
+def load_checkpoint(output_path: str, *, retry_errors: bool = False) -> Set[str]:
+    """
+    resume_ids already recorded in `output_path` (failed ones too, unless
+    `retry_errors`). A torn last line from a killed run is cut off.
+
+    With `retry_errors` the failed records are also removed from the file
+    (rewritten in place), so a retried document ends up with one record.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    kept: List[bytes] = []
+    dropped = False
+    with open(output_path, "rb+") as f:
+        good_end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            good_end += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                kept.append(line)
+                continue
+            if record.get("ok") or not retry_errors:
+                done.add(record.get("resume_id"))
+                kept.append(line)
+            else:
+                dropped = True
+        f.truncate(good_end)
+    if dropped:
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.writelines(kept)
+        os.replace(tmp_path, output_path)
+    done.discard(None)
+    return done
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_and_score(path: str) -> dict:
+    """Parse one file and score it; runs inside a parser worker process."""
+    from backend.src.resume.parse_service import parse_with_text  # type: ignore
+    from backend.src.resume.score_service import score  # type: ignore
+
+    text, normalized = parse_with_text(path)
+    score_value, tips = score(normalized, text)
+    return {"data": normalized, "score": score_value, "tips": tips}
+
+
+def _error_record(e: BaseException) -> dict:
+    from backend.src.pipeline.extractors import UnsafeDocument  # type: ignore
+    from backend.src.runtime.memory import MemoryBudgetExceeded  # type: ignore
+
+    if isinstance(e, ParserKilled):
+        return {"code": e.code, "message": e.message, "details": {"reason": e.reason}}
+    if isinstance(e, UnsafeDocument):
+        return {"code": "UNSAFE_DOCUMENT", "message": str(e)}
+    if isinstance(e, MemoryBudgetExceeded):
+        return {"code": e.code, "message": str(e)}
+    if isinstance(e, FileNotFoundError):
+        return {"code": "FILE_NOT_FOUND", "message": str(e)}
+    if isinstance(e, ValueError):
+        return {"code": "PARSING_FAILED", "message": str(e)}
+    return {"code": "INTERNAL_ERROR", "message": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(
+    paths: Iterable[str],
+    out: IO[str],
+    *,
+    done: Optional[Set[str]] = None,
+    jobs: int = 1,
+    prefetch: int = 64,
+    limits: Optional[SandboxLimits] = None,
+    pool: Optional[ParserPool] = None,
+    on_progress: Optional[Callable[[BatchStats], None]] = None,
+) -> BatchStats:
+    """
+    Parse + score every file in `paths`, writing one JSONL record per document to `out`.
+
+    Args:
+        done: resume_ids to skip (see load_checkpoint); updated as documents finish
+        jobs: Documents parsed concurrently (one worker process each)
+        prefetch: Files read + hashed ahead of the workers
+        pool: ParserPool to use (default: a new one with `jobs` workers and `limits`)
+        on_progress: Called with the running stats after every document
+    """
+    done = done if done is not None else set()
+    stats = BatchStats()
+    own_pool = pool is None
+    pool = pool or ParserPool(jobs, limits)
+    ready: "queue.Queue[Optional[tuple[str, str]]]" = queue.Queue(maxsize=max(1, prefetch))
+    seen = set(done)
+    lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(max(1, jobs) * 2)
+    stop = threading.Event()
+
+    def _put(item: Optional[tuple[str, str]]) -> bool:
+        # Gives up once the consumer is gone, instead of blocking on a full queue.
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _prefetch() -> None:
+        try:
+            for path in paths:
+                if stop.is_set():
+                    return
+                try:
+                    resume_id = _hash_file(path)
+                except OSError:
+                    with lock:
+                        stats.unreadable += 1
+                    continue
+                if resume_id in seen:
+                    with lock:
+                        stats.skipped += 1
+                    continue
+                seen.add(resume_id)
+                if not _put((path, resume_id)):
+                    return
+        finally:
+            _put(None)
+
+    def _process(path: str, resume_id: str) -> None:
+        try:
+            try:
+                record = {"resume_id": resume_id, "path": path, "ok": True, **pool.run(parse_and_score, path)}
+            except Exception as e:
+                record = {"resume_id": resume_id, "path": path, "ok": False, "error": _error_record(e)}
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with lock:
+                out.write(line)
+                out.flush()
+                done.add(resume_id)
+                if record["ok"]:
+                    stats.ok += 1
+                else:
+                    stats.failed += 1
+                if on_progress is not None:
+                    on_progress(stats)
+        finally:
+            in_flight.release()
+
+    reader = threading.Thread(target=_prefetch, name="batch-prefetch", daemon=True)
+    reader.start()
+    try:
+        if own_pool:
+            pool.prestart()
+        with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="batch") as executor:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                in_flight.acquire()
+                executor.submit(_process, *item)
+    finally:
+        stop.set()
+        reader.join()
+        if own_pool:
+            pool.close()
+    return stats
+
+
+class ProgressPrinter:
+    """on_progress callback printing throughput to a stream at most every `interval` seconds."""
+
+    def __init__(self, stream: IO[str], interval: float = 5.0) -> None:
+        self.stream = stream
+        self.interval = interval
+        self.started = time.monotonic()
+        self._last = 0.0
+
+    def __call__(self, stats: BatchStats, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = max(1e-9, now - self.started)
+        self.stream.write(
+            f"{stats.processed} parsed ({stats.ok} ok, {stats.failed} failed, {stats.skipped} skipped) "
+            f"in {elapsed:.0f}s, {stats.processed / elapsed:.1f} docs/s\n"
+        )
+        self.stream.flush()
@@ -0,0 +1,94 @@
+"""
+Registry of job descriptions (domain layer).
+
+A job is registered once (`register`), which extracts its requirements with
+one LLM pass, and is then referenced by `job_id`, the SHA-256 of its text.
+Registering the same text again is a hit and costs no model call. Analyses
+against a registered job prompt with `prompt_text(job)`, the rendered
+requirements, instead of the full posting.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from backend.src.llm import tiers  # type: ignore
+from backend.src.llm.prompt import render_requirements  # type: ignore
+from backend.src.llm.requirements import extract_requirements  # type: ignore
+from backend.src.runtime.cache import get_cache  # type: ignore
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.deadline import Deadline  # type: ignore
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+_JOB_ID = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass(frozen=True)
+class StoredJob:
+    job_id: str
+    text: str
+    # schema.JobRequirements as a dict
+    requirements: dict
+
+
+def _cache():
+    """
+    Environment variables:
+    - JOB_CACHE_SIZE (default: 1024 entries)
+    - JOB_CACHE_TTL_SECONDS (default: 7 days)
+    """
+    return get_cache(
+        "jobs",
+        maxsize=int(os.getenv("JOB_CACHE_SIZE") or DEFAULT_MAX_ENTRIES),
+        ttl_seconds=float(os.getenv("JOB_CACHE_TTL_SECONDS") or DEFAULT_TTL_SECONDS),
+    )
+
+
+def job_id_for(job_text: str) -> str:
+    return hashlib.sha256(job_text.strip().encode("utf-8")).hexdigest()
+
+
+def get(job_id: str) -> Optional[StoredJob]:
+    if not _JOB_ID.match(job_id or ""):
+        return None
+    entry = _cache().get(job_id)
+    if entry is None:
+        return None
+    return StoredJob(job_id=job_id, text=entry["text"], requirements=entry["requirements"])
+
+
+def register(
+    job_text: str,
+    *,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None,
+    tier: Optional[tiers.ModelTier] = None,
+) -> Tuple[StoredJob, bool]:
+    """
+    Store a job description with its extracted requirements.
+
+    Returns:
+        (the stored job, whether it was new)
+
+    Raises:
+        DomainError, RuntimeError: From the extraction (nothing is stored)
+    """
+    job_text = job_text.strip()
+    job_id = job_id_for(job_text)
+    existing = get(job_id)
+    if existing is not None:
+        return existing, False
+    requirements = extract_requirements(job_text, cancel=cancel, deadline=deadline, tier=tier).model_dump()
+    _cache().set(job_id, {"text": job_text, "requirements": requirements})
+    return StoredJob(job_id=job_id, text=job_text, requirements=requirements), True
+
+
+def prompt_text(job: StoredJob) -> str:
+    """The job's stand-in for the posting in analysis prompts."""
+    return render_requirements(job.requirements)
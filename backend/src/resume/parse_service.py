@@ -7,23 +7,91 @@ I/O / error mapping externally.
 
 from __future__ import annotations
 
+import os
+from pathlib import Path
+from typing import Optional
 
-def parse(file_path: str) -> dict:
+from backend.src.runtime import memory  # type: ignore
+from backend.src.runtime.cancellation import CancelToken  # type: ignore
+from backend.src.runtime.timing import stage  # type: ignore
+
+
+def parse(file_path: str, *, cancel: Optional[CancelToken] = None) -> dict:
     """
     Parse a resume file and return normalized resume data.
 
     Args:
         file_path: Path to the resume file (PDF/DOC/DOCX)
+        cancel: Optional token to abandon extraction early (raises Cancelled)
 
     Returns:
         Normalized resume dict (stable keys)
     """
+    return parse_with_text(file_path, cancel=cancel)[1]
+
+
+def parse_with_text(file_path: str, *, cancel: Optional[CancelToken] = None) -> tuple[str, dict]:
+    """
+    Like parse(), but also return the extracted plain text.
+
+    The extraction's memory use is recorded per format and size bucket (see
+    runtime/memory.py). The measured budget is only enforced in a sandbox
+    worker: in-process, concurrent extractions share the RSS being measured.
+
+    Returns:
+        (text, normalized resume dict)
+
+    Raises:
+        MemoryBudgetExceeded: Extraction took more than PARSER_DOC_MEMORY_MB (sandbox workers only)
+    """
     # Kept as a local import so the service remains importable even if optional
     # parsing dependencies are not present in some environments.
-    from backend.src.pipeline.parser import parse_resume  # type: ignore
+    from backend.src.pipeline.parser import derive_fields, extract_resume_text  # type: ignore
+    from backend.src.pipeline.normalizer import normalize_extracted_data  # type: ignore
+
+    fmt = Path(file_path).suffix.lower()
+    with stage("extraction"), memory.measure() as measured:
+        text = extract_resume_text(file_path, cancel=cancel)
+    memory.observe(measured.usage, fmt, os.path.getsize(file_path))
+    if memory.exclusive():
+        memory.check_budget(measured.usage)
+    with stage("normalize"):
+        try:
+            raw = derive_fields(text)
+        except Exception as e:
+            raise ValueError(f"Error parsing resume: {str(e)}") from e
+        return text, normalize_extracted_data(raw)
+
+
+def parse_text(text: str) -> dict:
+    """
+    Normalize resume data derived from already-extracted plain text.
+
+    Used where only `cv_text` is available (e.g. the /analyze heuristic fallback).
+    """
+    from backend.src.pipeline.parser import derive_fields  # type: ignore
     from backend.src.pipeline.normalizer import normalize_extracted_data  # type: ignore
 
-    raw = parse_resume(file_path)
-    return normalize_extracted_data(raw)
+    with stage("normalize"):
+        return normalize_extracted_data(derive_fields(text))
+
 
+def warm_up(suffixes=None) -> dict:
+    """
+    Import the parsing pipeline, compile the skills taxonomy and load extractor
+    dependencies ahead of traffic.
+
+    Args:
+        suffixes: File suffixes to load (default: every supported format)
+
+    Returns:
+        Load time in seconds per suffix
+    """
+    from backend.src.pipeline.extractors import warm_up as warm_up_extractors  # type: ignore
+    from backend.src.pipeline.normalizer import normalize_extracted_data  # type: ignore  # noqa: F401
+    from backend.src.pipeline.parser import parse_resume  # type: ignore  # noqa: F401
+    from backend.src.pipeline.skills import get_matcher  # type: ignore
+    from backend.src.resume.score_service import score  # type: ignore  # noqa: F401
 
+    get_matcher()
+    return warm_up_extractors(suffixes)
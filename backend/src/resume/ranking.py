@@ -0,0 +1,232 @@
+"""
+Candidate ranking for a job description (domain layer).
+
+An inverted index over stored normalized resumes maps (field, term) -> resume
+ids for skills and degrees, so ranking a job touches only the postings of
+terms the job mentions instead of every resume.
+Candidates are scored by weighted overlap with the job's terms (each term also
+weighted by its rarity across the pool) and the top k are selected with a heap.
+
+The index pulls new entries from the resume store before each ranking, so it
+follows resumes as they are parsed, including by other processes sharing the
+sqlite cache. Resumes that have left the store are dropped when they would be
+returned.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from backend.src.runtime.timing import stage  # type: ignore
+
+from . import store
+
+DEFAULT_K = 10
+MAX_K = 100
+
+# Relative weight of one matched term per field. Designations are not
+# extracted by the parser, and a posting names no employers to match company
+# names against (any of its words would do), so neither field is ranked.
+FIELD_WEIGHTS: Dict[str, float] = {
+    "skills": 3.0,
+    "degree": 1.0,
+}
+
+Terms = Dict[str, FrozenSet[str]]
+
+
+@dataclass(frozen=True)
+class RankedCandidate:
+    resume_id: str
+    name: Optional[str]
+    score: float
+    # field -> job terms found in this resume
+    matched: Dict[str, List[str]]
+
+
+def _degree_key(value: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", value.lower())
+
+
+def document_terms(normalized: Mapping) -> Terms:
+    """Index terms of a normalized resume, per field."""
+    return {
+        "skills": frozenset(s.strip().lower() for s in normalized.get("skills") or () if s.strip()),
+        "degree": frozenset(filter(None, map(_degree_key, normalized.get("degree") or ()))),
+    }
+
+
+def query_terms(job_text: str) -> Terms:
+    """
+    Terms of a job description, per field: taxonomy skills and degrees derived
+    like a resume's.
+
+    Ambiguous taxonomy terms ("Go", "Excel") count anywhere in a posting, which
+    is requirements throughout; a spurious one only matches resumes that list
+    that skill under their Skills header.
+    """
+    from backend.src.pipeline.parser import derive_fields  # type: ignore
+    from backend.src.pipeline.skills import get_matcher  # type: ignore
+
+    fields = derive_fields(job_text)
+    skills = list(fields["skills"])
+    matcher = get_matcher()
+    if matcher is not None:
+        skills += matcher.find(job_text, skills_section=True)
+    return document_terms({"skills": skills, "degree": fields["degree"]})
+
+
+class CandidateIndex:
+    """Thread-safe inverted index of resumes by (field, term)."""
+
+    def __init__(self, weights: Optional[Mapping[str, float]] = None) -> None:
+        self.weights = dict(weights or FIELD_WEIGHTS)
+        self._postings: Dict[Tuple[str, str], Set[str]] = {}
+        self._docs: Dict[str, Tuple[Optional[str], Terms]] = {}
+        self._lock = threading.Lock()
+        self._feed = store.ChangeFeed()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._docs
+
+    def add(self, resume_id: str, normalized: Mapping) -> None:
+        """Index (or re-index) one resume."""
+        terms = document_terms(normalized)
+        with self._lock:
+            self._remove_locked(resume_id)
+            self._docs[resume_id] = (normalized.get("name"), terms)
+            for field, values in terms.items():
+                if field not in self.weights:
+                    continue
+                for term in values:
+                    self._postings.setdefault((field, term), set()).add(resume_id)
+
+    def remove(self, resume_id: str) -> None:
+        with self._lock:
+            self._remove_locked(resume_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+        self._feed.reset()
+
+    def _remove_locked(self, resume_id: str) -> None:
+        doc = self._docs.pop(resume_id, None)
+        if doc is None:
+            return
+        for field, values in doc[1].items():
+            for term in values:
+                ids = self._postings.get((field, term))
+                if ids is not None:
+                    ids.discard(resume_id)
+                    if not ids:
+                        del self._postings[(field, term)]
+
+    def sync(self) -> int:
+        """
+        Index resumes stored since the last sync; returns how many were read.
+        Rebuilds from scratch when the index holds far more resumes than the
+        store (entries evicted from the store without ever being ranked).
+        """
+        if len(self._docs) > 2 * max(store.size(), 1):
+            self.clear()
+        return self._feed.poll(lambda stored: self.add(stored.resume_id, stored.normalized))
+
+    def search(
+        self,
+        query: Terms,
+        k: int = DEFAULT_K,
+        *,
+        alive: Optional[Callable[[str], bool]] = None,
+    ) -> List[RankedCandidate]:
+        """
+        The `k` best-matching resumes for `query` terms, best first.
+
+        Args:
+            alive: Optional check for each selected resume; ids it rejects are
+                removed from the index and replaced by the next best
+        """
+        with self._lock:
+            total = len(self._docs)
+            scores: Dict[str, float] = {}
+            for field, values in query.items():
+                weight = self.weights.get(field)
+                if not weight:
+                    continue
+                for term in values:
+                    ids = self._postings.get((field, term))
+                    if not ids:
+                        continue
+                    # Rarer terms discriminate better between candidates.
+                    gain = weight * (1.0 + math.log(total / len(ids)))
+                    for resume_id in ids:
+                        scores[resume_id] = scores.get(resume_id, 0.0) + gain
+
+        while True:
+            top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], item[0]))
+            dead = [resume_id for resume_id, _ in top if alive is not None and not alive(resume_id)]
+            if not dead:
+                break
+            for resume_id in dead:
+                self.remove(resume_id)
+                del scores[resume_id]
+
+        result = []
+        with self._lock:
+            for resume_id, value in top:
+                doc = self._docs.get(resume_id)
+                if doc is None:
+                    continue
+                name, terms = doc
+                matched = {
+                    field: sorted(query.get(field, frozenset()) & terms[field])
+                    for field in terms
+                    if field in self.weights
+                }
+                result.append(
+                    RankedCandidate(
+                        resume_id=resume_id,
+                        name=name,
+                        score=round(value, 3),
+                        matched={field: values for field, values in matched.items() if values},
+                    )
+                )
+        return result
+
+
+_INDEX: Optional[CandidateIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> CandidateIndex:
+    """The process-wide index over the resume store."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = CandidateIndex()
+        return _INDEX
+
+
+def rank(job_text: str, k: int = DEFAULT_K) -> Tuple[List[RankedCandidate], int]:
+    """
+    Rank stored resumes against a job description.
+
+    Returns:
+        (top `k` candidates, number of resumes in the index)
+    """
+    index = get_index()
+    with stage("rank"):
+        index.sync()
+        candidates = index.search(
+            query_terms(job_text), k, alive=lambda resume_id: store.get(resume_id) is not None
+        )
+    return candidates, len(index)
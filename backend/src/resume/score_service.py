@@ -8,16 +8,109 @@ No FastAPI / HTTP dependencies.
 from __future__ import annotations
 
 import re
+from typing import NamedTuple, Optional
 
 MAX_SCORE = 1000
 
 
-def score(normalized_resume: dict) -> tuple[int, list[dict]]:
+# Stable tip catalog: ref -> tip id + message template. Refs equal tip ids except
+# where one id has several messages. Served by /tips/catalog so compact responses
+# can send refs instead of repeating the messages.
+TIP_CATALOG: dict[str, dict[str, str]] = {
+    "name": {"id": "name", "message": "Missing name"},
+    "name_good": {"id": "name_good", "message": "Clear name provided"},
+    "email": {"id": "email", "message": "Missing email"},
+    "email_good": {"id": "email_good", "message": "Professional email included"},
+    "mobile_number": {"id": "mobile_number", "message": "Phone number is missing"},
+    "mobile_number_good": {"id": "mobile_number_good", "message": "Phone number detected"},
+    "skills": {"id": "skills", "message": "Low skills coverage (found {count})"},
+    "skills_good": {"id": "skills_good", "message": "Strong skills section ({count} skills listed)"},
+    "education": {"id": "education", "message": "Education not detected"},
+    "education_good": {"id": "education_good", "message": "Education section included"},
+    "experience": {"id": "experience", "message": "Work experience not detected"},
+    "experience_good": {"id": "experience_good", "message": "Relevant work experience included"},
+    "quantified_impact_good": {
+        "id": "quantified_impact_good",
+        "message": "Your experience includes measurable impact (metrics, scale, or outcomes)",
+    },
+    "quantified_impact": {
+        "id": "quantified_impact",
+        "message": "Add a few numbers to your experience bullets (%, $, scale, years, users, etc.)",
+    },
+    "skills_structure_good": {
+        "id": "skills_structure_good",
+        "message": "Nice touch: skills are organized into categories, which improves readability",
+    },
+    "skills_structure": {
+        "id": "skills_structure",
+        "message": "Consider grouping skills into categories (e.g., Languages, Frameworks, Tools) to make scanning easier",
+    },
+    "education_experience_balance.missing_education": {
+        "id": "education_experience_balance",
+        "message": "Add an education section to balance your work experience (degree, school, or relevant coursework)",
+    },
+    "education_experience_balance.missing_experience": {
+        "id": "education_experience_balance",
+        "message": "Add a work experience section to complement your education (internships, projects, or roles)",
+    },
+    "education_experience_balance_good": {
+        "id": "education_experience_balance_good",
+        "message": "Good balance: both education and work experience are included",
+    },
+    "summary_good": {
+        "id": "summary_good",
+        "message": "A professional summary helps recruiters understand your focus quickly",
+    },
+    "summary": {
+        "id": "summary",
+        "message": "Add a short professional summary or headline to set context at the top",
+    },
+    "total_experience": {"id": "total_experience", "message": "Total years of experience not specified"},
+    "total_experience_good": {"id": "total_experience_good", "message": "Total experience detected"},
+    "length": {"id": "length", "message": "Resume is {pages} pages (consider shortening)"},
+    "length_good": {"id": "length_good", "message": "Resume length looks good ({pages} pages)"},
+}
+
+
+class TipRef(NamedTuple):
+    """A tip as a catalog reference: `ref` into TIP_CATALOG plus template args."""
+
+    ref: str
+    severity: str
+    args: Optional[dict] = None
+
+
+def render_tip(tip: TipRef) -> dict:
+    """Full tip dict ({id, message, severity}) as returned by score()."""
+    entry = TIP_CATALOG[tip.ref]
+    message = entry["message"].format(**tip.args) if tip.args else entry["message"]
+    return {"id": entry["id"], "message": message, "severity": tip.severity}
+
+
+def compact_tip(tip: TipRef) -> dict:
+    """Compact tip ({ref, severity[, args]}) to be resolved against TIP_CATALOG."""
+    out: dict = {"ref": tip.ref, "severity": tip.severity}
+    if tip.args:
+        out["args"] = tip.args
+    return out
+
+
+def score(normalized_resume: dict, text: Optional[str] = None) -> tuple[int, list[dict]]:
     """
     Deterministically compute score + tips from parsed resume content.
 
     This MUST be driven only by extracted resume data (no mocks/randomness).
+
+    Args:
+        text: The extracted resume text, which normalized["sections"] offsets
+            point into (without it, the section index is not used)
     """
+    computed_score, tips = score_refs(normalized_resume, text)
+    return computed_score, [render_tip(t) for t in tips]
+
+
+def score_refs(normalized_resume: dict, text: Optional[str] = None) -> tuple[int, list[TipRef]]:
+    """Like score(), but tips are returned as TipRef catalog references."""
 
     def _count_list(key: str) -> int:
         v = normalized_resume.get(key)
@@ -52,6 +145,14 @@ def score(normalized_resume: dict) -> tuple[int, list[dict]]:
         # Ignore non-text scalars (int/float/bool) on purpose.
         return []
 
+    def _section_text(name: str) -> str:
+        """Text of a parser-indexed section (normalized["sections"]), or ""."""
+        sections = normalized_resume.get("sections")
+        span = sections.get(name) if isinstance(sections, dict) and text is not None else None
+        if not isinstance(span, dict):
+            return ""
+        return text[span.get("start", 0) : span.get("end", 0)].strip()
+
     def _any_nonempty_text(keys: tuple[str, ...]) -> bool:
         for k in keys:
             if _strings_from(normalized_resume.get(k)):
@@ -119,55 +220,44 @@ def score(normalized_resume: dict) -> tuple[int, list[dict]]:
                 return True
         return False
 
-    tips: list[dict] = []
+    tips: list[TipRef] = []
 
     # Presence checks
     if not _has_str("name"):
-        tips.append({"id": "name", "message": "Missing name", "severity": "NEEDS_WORK"})
+        tips.append(TipRef("name", "NEEDS_WORK"))
     else:
-        tips.append({"id": "name_good", "message": "Clear name provided", "severity": "GOOD"})
+        tips.append(TipRef("name_good", "GOOD"))
     if not _has_str("email"):
-        tips.append({"id": "email", "message": "Missing email", "severity": "NEEDS_WORK"})
+        tips.append(TipRef("email", "NEEDS_WORK"))
     else:
-        tips.append({"id": "email_good", "message": "Professional email included", "severity": "GOOD"})
+        tips.append(TipRef("email_good", "GOOD"))
     if not _has_str("mobile_number"):
-        tips.append({"id": "mobile_number", "message": "Phone number is missing", "severity": "NEEDS_WORK"})
+        tips.append(TipRef("mobile_number", "NEEDS_WORK"))
     else:
-        tips.append({"id": "mobile_number_good", "message": "Phone number detected", "severity": "GOOD"})
+        tips.append(TipRef("mobile_number_good", "GOOD"))
 
     skills_count = _count_list("skills")
     if skills_count < 5:
-        tips.append(
-            {
-                "id": "skills",
-                "message": f"Low skills coverage (found {skills_count})",
-                "severity": "WARNING" if skills_count >= 3 else "NEEDS_WORK",
-            }
-        )
+        tips.append(TipRef("skills", "WARNING" if skills_count >= 3 else "NEEDS_WORK", {"count": skills_count}))
     else:
-        tips.append(
-            {
-                "id": "skills_good",
-                "message": f"Strong skills section ({skills_count} skills listed)",
-                "severity": "GOOD",
-            }
-        )
+        tips.append(TipRef("skills_good", "GOOD", {"count": skills_count}))
 
     degree_count = _count_list("degree")
     if degree_count == 0:
-        tips.append({"id": "education", "message": "Education not detected", "severity": "WARNING"})
+        tips.append(TipRef("education", "WARNING"))
     else:
-        tips.append({"id": "education_good", "message": "Education section included", "severity": "GOOD"})
+        tips.append(TipRef("education_good", "GOOD"))
 
     company_count = _count_list("company_names")
     if company_count == 0:
-        tips.append({"id": "experience", "message": "Work experience not detected", "severity": "WARNING"})
+        tips.append(TipRef("experience", "WARNING"))
     else:
-        tips.append({"id": "experience_good", "message": "Relevant work experience included", "severity": "GOOD"})
+        tips.append(TipRef("experience_good", "GOOD"))
 
     # A) Quantified impact in work experience (simple heuristic)
     # Driven only by normalized_resume: scan common experience fields if provided.
-    experience_exists = company_count > 0 or _any_nonempty_text(
+    experience_section = _section_text("experience")
+    experience_exists = company_count > 0 or bool(experience_section) or _any_nonempty_text(
         (
             "work_experience",
             "experience",
@@ -177,7 +267,7 @@ def score(normalized_resume: dict) -> tuple[int, list[dict]]:
         )
     )
     if experience_exists:
-        experience_blobs: list[str] = []
+        experience_blobs: list[str] = [experience_section] if experience_section else []
         # Include these even if they're "metadata"—in many pipelines they contain
         # full lines or bullet-ish snippets.
         for k in (
@@ -193,102 +283,48 @@ def score(normalized_resume: dict) -> tuple[int, list[dict]]:
 
         combined = "\n".join(experience_blobs)
         if _contains_quantified_impact(combined):
-            tips.append(
-                {
-                    "id": "quantified_impact_good",
-                    "message": "Your experience includes measurable impact (metrics, scale, or outcomes)",
-                    "severity": "GOOD",
-                }
-            )
+            tips.append(TipRef("quantified_impact_good", "GOOD"))
         else:
-            tips.append(
-                {
-                    "id": "quantified_impact",
-                    "message": "Add a few numbers to your experience bullets (%, $, scale, years, users, etc.)",
-                    "severity": "WARNING",
-                }
-            )
+            tips.append(TipRef("quantified_impact", "WARNING"))
 
     # C) Skills structure (simple heuristic)
     skills = normalized_resume.get("skills")
     if isinstance(skills, list) and all(isinstance(s, str) for s in skills):
         grouped = _skills_look_grouped([s.strip() for s in skills if s and s.strip()])
         if grouped:
-            tips.append(
-                {
-                    "id": "skills_structure_good",
-                    "message": "Nice touch: skills are organized into categories, which improves readability",
-                    "severity": "GOOD",
-                }
-            )
+            tips.append(TipRef("skills_structure_good", "GOOD"))
         elif skills_count > 10:
-            tips.append(
-                {
-                    "id": "skills_structure",
-                    "message": "Consider grouping skills into categories (e.g., Languages, Frameworks, Tools) to make scanning easier",
-                    "severity": "WARNING",
-                }
-            )
+            tips.append(TipRef("skills_structure", "WARNING"))
 
     # D) Education vs experience balance
-    education_exists = degree_count > 0 or _count_list("college_name") > 0
+    education_exists = degree_count > 0 or _count_list("college_name") > 0 or bool(_section_text("education"))
     if experience_exists and not education_exists:
-        tips.append(
-            {
-                "id": "education_experience_balance",
-                "message": "Add an education section to balance your work experience (degree, school, or relevant coursework)",
-                "severity": "WARNING",
-            }
-        )
+        tips.append(TipRef("education_experience_balance.missing_education", "WARNING"))
     elif education_exists and not experience_exists:
-        tips.append(
-            {
-                "id": "education_experience_balance",
-                "message": "Add a work experience section to complement your education (internships, projects, or roles)",
-                "severity": "WARNING",
-            }
-        )
+        tips.append(TipRef("education_experience_balance.missing_experience", "WARNING"))
     elif education_exists and experience_exists:
-        tips.append(
-            {
-                "id": "education_experience_balance_good",
-                "message": "Good balance: both education and work experience are included",
-                "severity": "GOOD",
-            }
-        )
+        tips.append(TipRef("education_experience_balance_good", "GOOD"))
 
     # E) Professional summary / headline
-    summary_present = _any_nonempty_text(
+    summary_present = bool(_section_text("summary")) or _any_nonempty_text(
         ("summary", "professional_summary", "profile", "about", "headline", "objective")
     )
     if summary_present:
-        tips.append(
-            {
-                "id": "summary_good",
-                "message": "A professional summary helps recruiters understand your focus quickly",
-                "severity": "GOOD",
-            }
-        )
+        tips.append(TipRef("summary_good", "GOOD"))
     else:
-        tips.append(
-            {
-                "id": "summary",
-                "message": "Add a short professional summary or headline to set context at the top",
-                "severity": "WARNING",
-            }
-        )
+        tips.append(TipRef("summary", "WARNING"))
 
     total_experience = normalized_resume.get("total_experience")
     if total_experience is None:
-        tips.append({"id": "total_experience", "message": "Total years of experience not specified", "severity": "WARNING"})
+        tips.append(TipRef("total_experience", "WARNING"))
     else:
-        tips.append({"id": "total_experience_good", "message": "Total experience detected", "severity": "GOOD"})
+        tips.append(TipRef("total_experience_good", "GOOD"))
 
     pages = normalized_resume.get("no_of_pages")
     if isinstance(pages, int) and pages > 2:
-        tips.append({"id": "length", "message": f"Resume is {pages} pages (consider shortening)", "severity": "WARNING"})
+        tips.append(TipRef("length", "WARNING", {"pages": pages}))
     elif isinstance(pages, int) and pages <= 2:
-        tips.append({"id": "length_good", "message": f"Resume length looks good ({pages} pages)", "severity": "GOOD"})
+        tips.append(TipRef("length_good", "GOOD", {"pages": pages}))
 
     # Score is computed from field completeness + skills density.
     weights = {
@@ -0,0 +1,404 @@
+"""
+Semantic candidate search (domain layer).
+
+Resumes and job descriptions are embedded with Ollama's embeddings API
+(OLLAMA_EMBED_MODEL on the configured OLLAMA_URL) and ranked by cosine
+similarity, which catches matches lexical ranking misses ("data pipelines" vs
+"ETL"). Embeddings are cached by a hash of model + text, so a resume is embedded
+once however often it is ranked (and once per deployment with the sqlite cache).
+
+Resume embeddings are computed outside the request's critical path as far as
+possible: a /rank request embeds at most SEMANTIC_SYNC_BATCH newly stored
+resumes, within its deadline, and leaves the rest to a background thread; the
+response reports how many are still `pending` (not ranked yet).
+
+The vector index is brute force (one matrix-vector product) for small pools.
+From PARTITION_THRESHOLD vectors on, it is partitioned around k-means centroids
+and a search only scores the partitions nearest to the query (approximate, in
+exchange for touching a fraction of the pool).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.src.llm import ollama_client  # type: ignore
+from backend.src.runtime.cache import get_cache  # type: ignore
+from backend.src.runtime.deadline import Deadline, DeadlineExceeded, min_timeout  # type: ignore
+from backend.src.runtime.timing import stage  # type: ignore
+
+from . import store
+
+DEFAULT_CACHE_SIZE = 16384
+DEFAULT_SYNC_BATCH = 32
+# Longer texts are truncated before embedding (embedding models have short contexts).
+MAX_EMBED_CHARS = 8000
+
+PARTITION_THRESHOLD = 20000
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+# k-means is fitted on at most this many vectors per centroid.
+KMEANS_SAMPLE_PER_CENTROID = 64
+
+
+def _cache():
+    """
+    Environment variables:
+    - EMBEDDING_CACHE_SIZE (default: 16384 entries)
+    """
+    return get_cache("embeddings", maxsize=int(os.getenv("EMBEDDING_CACHE_SIZE") or DEFAULT_CACHE_SIZE))
+
+
+def sync_batch() -> int:
+    """
+    Environment variables:
+    - SEMANTIC_SYNC_BATCH (default: 32): new resumes a /rank request embeds at most (the rest in the background)
+    """
+    return max(0, int(os.getenv("SEMANTIC_SYNC_BATCH") or DEFAULT_SYNC_BATCH))
+
+
+def content_key(text: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_for(
+    text: str, *, settings: Optional[ollama_client.OllamaSettings] = None, timeout: Optional[float] = None
+) -> np.ndarray:
+    """
+    Unit-length float32 embedding of `text` (cached by content hash).
+
+    Args:
+        timeout: Ollama request timeout (see ollama_client.embed)
+
+    Raises:
+        RuntimeError: Ollama errors (see ollama_client.embed)
+    """
+    settings = settings or ollama_client.get_settings()
+    text = text[:MAX_EMBED_CHARS]
+    key = content_key(text, settings.embedding_model)
+    cached = _cache().get(key)
+    if cached is not None:
+        return np.frombuffer(base64.b64decode(cached), dtype=np.float32)
+    with stage("embed"):
+        vector = np.asarray(ollama_client.embed(text, settings=settings, timeout=timeout), dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector = vector / norm
+    # float32 bytes as base64: a quarter of the size of a JSON float list.
+    _cache().set(key, base64.b64encode(vector.tobytes()).decode("ascii"))
+    return vector
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if k < len(scores):
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(len(scores))
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class VectorIndex:
+    """
+    Thread-safe top-k cosine search over unit vectors, keyed by id.
+
+    Args:
+        partition_threshold: Pool size from which searches are partitioned
+        nprobe: Partitions scored per partitioned search
+    """
+
+    def __init__(self, *, partition_threshold: int = PARTITION_THRESHOLD, nprobe: int = DEFAULT_NPROBE) -> None:
+        self.partition_threshold = partition_threshold
+        self.nprobe = nprobe
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None  # capacity x dim, first len(self) rows used
+        self._centroids: Optional[np.ndarray] = None
+        self._assignment = np.empty(0, dtype=np.int32)
+        self._partitioned_size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def partitioned(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        """Add or replace a unit vector."""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if self._matrix is not None and vector.shape != self._matrix.shape[1:]:
+                raise ValueError(f"Vector has shape {vector.shape}, index holds {self._matrix.shape[1:]}")
+            row = self._rows.get(item_id)
+            if row is None:
+                row = len(self._ids)
+                self._grow(row + 1, vector.shape[0])
+                self._ids.append(item_id)
+                self._rows[item_id] = row
+            self._matrix[row] = vector
+            if self._centroids is not None:
+                self._assignment[row] = int(np.argmax(self._centroids @ vector))
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return
+            last = len(self._ids) - 1
+            if row != last:
+                # Keep rows dense: move the last vector into the hole.
+                moved = self._ids[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+                self._matrix[row] = self._matrix[last]
+                self._assignment[row] = self._assignment[last]
+            self._ids.pop()
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """The `k` nearest ids to unit vector `query` with their cosine similarity, best first."""
+        query = np.asarray(query, dtype=np.float32)
+        with self._lock:
+            size = len(self._ids)
+            if size == 0 or k <= 0:
+                return []
+            if size >= self.partition_threshold and size >= 2 * self._partitioned_size:
+                self._partition(size)
+            matrix = self._matrix[:size]
+            if self._centroids is None:
+                rows = None
+                scores = matrix @ query
+            else:
+                probe = _top_k(self._centroids @ query, min(self.nprobe, len(self._centroids)))
+                rows = np.flatnonzero(np.isin(self._assignment[:size], probe))
+                scores = matrix[rows] @ query
+            best = _top_k(scores, k)
+            return [
+                (self._ids[int(i if rows is None else rows[i])], float(scores[i])) for i in best
+            ]
+
+    def _grow(self, needed: int, dim: int) -> None:
+        if self._matrix is None:
+            self._matrix = np.empty((max(16, needed), dim), dtype=np.float32)
+            self._assignment = np.zeros(len(self._matrix), dtype=np.int32)
+        elif needed > len(self._matrix):
+            capacity = max(needed, 2 * len(self._matrix))
+            matrix = np.empty((capacity, dim), dtype=np.float32)
+            matrix[: len(self._ids)] = self._matrix[: len(self._ids)]
+            assignment = np.zeros(capacity, dtype=np.int32)
+            assignment[: len(self._ids)] = self._assignment[: len(self._ids)]
+            self._matrix, self._assignment = matrix, assignment
+
+    def _partition(self, size: int) -> None:
+        """(Re)fit ~sqrt(size) spherical k-means centroids and assign every row."""
+        matrix = self._matrix[:size]
+        nlist = max(1, int(np.sqrt(size)))
+        rng = np.random.default_rng(0)
+        sample = matrix[rng.choice(size, min(size, nlist * KMEANS_SAMPLE_PER_CENTROID), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self._centroids = centroids
+        self._assignment[:size] = np.argmax(matrix @ centroids.T, axis=1)
+        self._partitioned_size = size
+
+
+@dataclass(frozen=True)
+class SemanticCandidate:
+    resume_id: str
+    name: Optional[str]
+    score: float
+
+
+class SemanticIndex:
+    """
+    Embeddings of the stored resumes, kept current from the resume store.
+    New resumes are queued by sync() and embedded in bounded batches.
+    """
+
+    def __init__(self, vectors: Optional[VectorIndex] = None) -> None:
+        self.vectors = vectors or VectorIndex()
+        self._names: Dict[str, Optional[str]] = {}
+        self._feed = store.ChangeFeed()
+        self._pending: "OrderedDict[str, store.StoredResume]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()  # one sync() rebuilds and polls at a time
+        self._warmer: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def pending(self) -> int:
+        """Stored resumes not embedded yet."""
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, stored: store.StoredResume, *, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            vectors = self.vectors
+        if stored.resume_id in vectors:
+            return
+        embedding = embedding_for(stored.text, timeout=timeout)
+        with self._lock:
+            if vectors is not self.vectors:
+                # sync() started over while this was embedding: queue it for the
+                # new index (the embedding is cached, so that costs no call).
+                if stored.resume_id not in self.vectors:
+                    self._pending.setdefault(stored.resume_id, stored)
+                return
+            vectors.add(stored.resume_id, embedding)
+            self._names[stored.resume_id] = stored.normalized.get("name")
+
+    def remove(self, resume_id: str) -> None:
+        with self._lock:
+            self.vectors.remove(resume_id)
+            self._names.pop(resume_id, None)
+
+    def _queue(self, stored: store.StoredResume) -> None:
+        with self._lock:
+            if stored.resume_id not in self.vectors:
+                self._pending[stored.resume_id] = stored
+
+    def embed_pending(self, limit: Optional[int] = None, deadline: Optional[Deadline] = None) -> int:
+        """
+        Embed queued resumes, at most `limit` and while `deadline` has time
+        left; returns how many were embedded. Stops at the first Ollama error
+        (the resume stays queued). Safe to run from several threads at once.
+        """
+        done = 0
+        while (limit is None or done < limit) and (deadline is None or not deadline.expired):
+            with self._lock:
+                if not self._pending:
+                    break
+                _, stored = self._pending.popitem(last=False)
+            try:
+                self.add(stored, timeout=min_timeout(deadline, ollama_client.REQUEST_TIMEOUT_SECONDS))
+            except RuntimeError:
+                with self._lock:
+                    self._pending.setdefault(stored.resume_id, stored)
+                raise
+            done += 1
+        return done
+
+    def sync(self, *, limit: Optional[int] = None, deadline: Optional[Deadline] = None) -> int:
+        """
+        Queue resumes stored since the last sync and embed up to `limit` of them
+        (default: SEMANTIC_SYNC_BATCH) within `deadline`; a background thread
+        embeds the rest. Returns how many were embedded here. Starts over when
+        the index holds far more resumes than the store (embeddings stay
+        cached, so this costs no Ollama calls).
+
+        Raises:
+            RuntimeError: Ollama errors (see ollama_client.embed)
+        """
+        with self._sync_lock:
+            if len(self.vectors) > 2 * max(store.size(), 1):
+                with self._lock:
+                    self.vectors = VectorIndex(
+                        partition_threshold=self.vectors.partition_threshold, nprobe=self.vectors.nprobe
+                    )
+                    self._names.clear()
+                    self._pending.clear()
+                self._feed.reset()
+            self._feed.poll(self._queue)
+        done = self.embed_pending(sync_batch() if limit is None else limit, deadline)
+        if self.pending():
+            self._start_warmer()
+        return done
+
+    def _start_warmer(self) -> None:
+        with self._lock:
+            if self._warmer is not None and self._warmer.is_alive():
+                return
+            self._warmer = threading.Thread(target=self._warm, name="semantic-warmer", daemon=True)
+            self._warmer.start()
+
+    def _warm(self) -> None:
+        try:
+            self.embed_pending()
+        except RuntimeError:
+            # Ollama is failing: the next sync() embeds (and restarts the warmer).
+            pass
+
+    def search(
+        self,
+        job_text: str,
+        k: int,
+        *,
+        alive: Optional[Callable[[str], bool]] = None,
+        query: Optional[np.ndarray] = None,
+    ) -> List[SemanticCandidate]:
+        if query is None:
+            query = embedding_for(job_text)
+        while True:
+            with self._lock:
+                vectors = self.vectors
+            top = vectors.search(query, k)
+            dead = [resume_id for resume_id, _ in top if alive is not None and not alive(resume_id)]
+            if not dead:
+                break
+            for resume_id in dead:
+                self.remove(resume_id)
+        return [
+            SemanticCandidate(resume_id=resume_id, name=self._names.get(resume_id), score=round(score, 4))
+            for resume_id, score in top
+        ]
+
+
+_INDEX: Optional[SemanticIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> SemanticIndex:
+    """The process-wide semantic index over the resume store."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = SemanticIndex()
+        return _INDEX
+
+
+def rank(job_text: str, k: int, *, deadline: Optional[Deadline] = None) -> Tuple[List[SemanticCandidate], int]:
+    """
+    Rank stored resumes against a job description by embedding similarity.
+    Resumes still waiting to be embedded (get_index().pending()) are not ranked.
+
+    Returns:
+        (top `k` candidates, number of resumes in the index)
+
+    Raises:
+        RuntimeError: Ollama errors (see ollama_client.embed)
+        DeadlineExceeded: The job description could not be embedded in time
+    """
+    index = get_index()
+    with stage("rank"):
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded()
+        # The query first: if Ollama is down, fail before embedding any resume.
+        query = embedding_for(job_text, timeout=min_timeout(deadline, ollama_client.REQUEST_TIMEOUT_SECONDS))
+        try:
+            index.sync(deadline=deadline)
+        except RuntimeError:
+            # Rank what is embedded; the failed resumes stay queued.
+            pass
+        candidates = index.search(
+            job_text, k, alive=lambda resume_id: store.get(resume_id) is not None, query=query
+        )
+    return candidates, len(index)
@@ -0,0 +1,117 @@
+"""
+Server-side store of parsed resumes (domain layer).
+
+Entries are keyed by `resume_id`, the SHA-256 of the uploaded file bytes, so a
+re-upload of the same file is a hit and clients can reference extracted text by
+id instead of sending it again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from backend.src.runtime.cache import get_cache  # type: ignore
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600
+
+# Entries touched within this window of a feed's last poll are read again, so a
+# write committed by another process slightly out of timestamp order isn't missed.
+FEED_OVERLAP_SECONDS = 5.0
+
+_RESUME_ID = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass(frozen=True)
+class StoredResume:
+    resume_id: str
+    text: str
+    normalized: dict
+
+
+def _cache():
+    """
+    Environment variables:
+    - RESUME_CACHE_SIZE (default: 1024 entries)
+    - RESUME_CACHE_TTL_SECONDS (default: 3600)
+    """
+    return get_cache(
+        "resumes",
+        maxsize=int(os.getenv("RESUME_CACHE_SIZE") or DEFAULT_MAX_ENTRIES),
+        ttl_seconds=float(os.getenv("RESUME_CACHE_TTL_SECONDS") or DEFAULT_TTL_SECONDS),
+    )
+
+
+def resume_id_for(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_valid_resume_id(resume_id: str) -> bool:
+    return bool(_RESUME_ID.match(resume_id or ""))
+
+
+def put(resume_id: str, text: str, normalized: dict) -> StoredResume:
+    _cache().set(resume_id, {"text": text, "normalized": normalized})
+    return StoredResume(resume_id=resume_id, text=text, normalized=normalized)
+
+
+def get(resume_id: str) -> Optional[StoredResume]:
+    if not is_valid_resume_id(resume_id):
+        return None
+    entry = _cache().get(resume_id)
+    if entry is None:
+        return None
+    return StoredResume(resume_id=resume_id, text=entry["text"], normalized=entry["normalized"])
+
+
+def entries(since: float = 0.0) -> List[Tuple[StoredResume, float]]:
+    """
+    Live stored resumes written (or, with the sqlite backend, read) at or after
+    `since` (wall clock), with that timestamp. With a shared cache this includes
+    resumes parsed by other processes.
+    """
+    return [
+        (StoredResume(resume_id=key, text=entry["text"], normalized=entry["normalized"]), stamp)
+        for key, entry, stamp in _cache().items(since)
+    ]
+
+
+def size() -> int:
+    return len(_cache())
+
+
+class ChangeFeed:
+    """
+    Incremental reader of the store for derived indexes: each poll() hands over
+    the entries stored since the previous successful poll (plus a few seconds of
+    overlap, so handlers must be idempotent).
+    """
+
+    def __init__(self) -> None:
+        self._since: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Make the next poll() return every live entry."""
+        with self._lock:
+            self._since = None
+
+    def poll(self, handle: Callable[[StoredResume], None]) -> int:
+        """
+        Call `handle` for each new entry; returns how many were handled. If
+        `handle` raises, the next poll() starts from the same point.
+        """
+        with self._lock:
+            since = self._since - FEED_OVERLAP_SECONDS if self._since is not None else 0.0
+            latest = self._since or 0.0
+            new = entries(since)
+            for stored, stamp in new:
+                handle(stored)
+                latest = max(latest, stamp)
+            self._since = latest
+            return len(new)
@@ -0,0 +1,3 @@
+"""Cross-cutting runtime helpers (caches, cancellation, circuits, deadlines, memory, metrics, timing)."""
+
+__all__ = ["cache", "cancellation", "circuit", "deadline", "memory", "metrics", "profiling", "timing"]
@@ -0,0 +1,225 @@
+"""
+Keyed result caches (domain layer).
+
+Caches are named by namespace ("resumes", ...) and hold JSON-serializable values.
+By default each process keeps its own in-memory LRU; with CACHE_BACKEND=sqlite
+every namespace lives in one SQLite file shared by all processes that open it
+(e.g. the workers of a multi-worker deployment), so a result computed by one
+worker is a hit for the others.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU with an optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at (monotonic), value, written_at (wall clock))
+        self._data: "OrderedDict[str, Tuple[float, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None if missing/expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value, _written_at = item
+            if expires_at and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._data[key] = (expires_at, value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self, since: float = 0.0) -> List[Tuple[str, Any, float]]:
+        """Live `(key, value, written_at)` entries written at or after `since` (wall clock)."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value, written_at)
+                for key, (expires_at, value, written_at) in self._data.items()
+                if written_at >= since and not (expires_at and expires_at < now)
+            ]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    LRU cache for one namespace in a SQLite file shared between processes.
+
+    Values are stored as JSON. WAL mode lets readers proceed while another
+    process writes. Recency is tracked with a coarse `accessed_at` (a read only
+    writes if the entry wasn't touched in the last second), and the size bound
+    is enforced by periodic pruning, so a namespace can briefly exceed
+    `maxsize` by a few percent.
+    """
+
+    TOUCH_GRANULARITY_SECONDS = 1.0
+    MAX_PRUNE_INTERVAL = 64
+
+    def __init__(self, path: str, namespace: str, maxsize: int = 1024, ttl_seconds: Optional[float] = None) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._prune_interval = max(1, min(self.MAX_PRUNE_INTERVAL, maxsize // 16))
+        self._sets = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_entries_lru ON cache_entries (namespace, accessed_at)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads: one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None if missing/expired."""
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at, accessed_at = row
+        now = time.time()
+        if expires_at and expires_at < now:
+            self.delete(key)
+            return None
+        if now - accessed_at > self.TOUCH_GRANULARITY_SECONDS:
+            conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else 0.0
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value, separators=(",", ":")), expires_at, now),
+        )
+        with self._lock:
+            self._sets += 1
+            prune = self._sets % self._prune_interval == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries, then the least recently used beyond `maxsize`."""
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at > 0 AND expires_at < ?",
+            (self.namespace, time.time()),
+        )
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.maxsize),
+        )
+
+    def items(self, since: float = 0.0) -> List[Tuple[str, Any, float]]:
+        """
+        Live `(key, value, accessed_at)` entries accessed at or after `since`
+        (wall clock). Includes entries written by other processes; an entry
+        that was only read recently is returned too.
+        """
+        rows = self._conn().execute(
+            "SELECT key, value, accessed_at FROM cache_entries"
+            " WHERE namespace = ? AND accessed_at >= ? AND (expires_at = 0 OR expires_at >= ?)",
+            (self.namespace, since, time.time()),
+        ).fetchall()
+        return [(key, json.loads(value), accessed_at) for key, value, accessed_at in rows]
+
+    def delete(self, key: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+        )
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        (count,) = self._conn().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return count
+
+
+Cache = Union[LRUCache, SQLiteCache]
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "resumeai-cache.sqlite3")
+
+_CACHES: Dict[str, Cache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(namespace: str, *, maxsize: int = 1024, ttl_seconds: Optional[float] = None) -> Cache:
+    """
+    Process-wide cache for `namespace` (created on first use with the given limits).
+
+    Environment variables:
+    - CACHE_BACKEND (default: memory): "sqlite" shares entries between processes
+    - CACHE_PATH (default: <tmp>/resumeai-cache.sqlite3): database file for the sqlite backend
+    """
+    with _CACHES_LOCK:
+        cache = _CACHES.get(namespace)
+        if cache is None:
+            backend = (os.getenv("CACHE_BACKEND") or "memory").strip().lower()
+            if backend == "sqlite":
+                path = os.getenv("CACHE_PATH") or DEFAULT_CACHE_PATH
+                cache = SQLiteCache(path, namespace, maxsize=maxsize, ttl_seconds=ttl_seconds)
+            elif backend == "memory":
+                cache = LRUCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+            else:
+                raise ValueError(f"Unknown CACHE_BACKEND: {backend!r} (expected memory or sqlite)")
+            _CACHES[namespace] = cache
+        return cache
@@ -0,0 +1,68 @@
+"""
+Cooperative cancellation (domain layer).
+
+A CancelToken is handed from the transport layer (e.g. a request whose client
+went away) down to long-running work. Work either polls `cancelled` at safe
+points, or registers a callback that interrupts blocking I/O immediately.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, List
+
+
+class Cancelled(Exception):
+    """Raised by work that stopped because its CancelToken was cancelled."""
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Mark the token cancelled and run registered callbacks (once)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to `timeout` seconds, waking early on cancellation; returns `cancelled`."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+    def add_callback(self, cb: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run `cb` on cancellation (immediately if already cancelled).
+
+        Returns:
+            A function that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(cb)
+
+                def _remove() -> None:
+                    with self._lock:
+                        if cb in self._callbacks:
+                            self._callbacks.remove(cb)
+
+                return _remove
+        cb()
+        return lambda: None
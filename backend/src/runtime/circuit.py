@@ -0,0 +1,163 @@
+"""
+Circuit breaker for calls to an unhealthy dependency (domain layer).
+
+Closed: calls go through; consecutive failures (errors, or calls slower than
+`slow_call_seconds`) are counted, and `failure_threshold` of them open the
+circuit. Open: calls fail immediately with CircuitOpen for `open_seconds`.
+Half-open: after that, up to `half_open_max_calls` trial calls go through;
+a success closes the circuit, a failure opens it again.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from . import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+TRANSITIONS_TOTAL = metrics.counter(
+    "resumeai_circuit_transitions_total",
+    "Circuit breaker state changes (state: the new state).",
+    ("breaker", "state"),
+)
+REJECTED_TOTAL = metrics.counter(
+    "resumeai_circuit_rejected_total",
+    "Calls failed fast because the circuit was open.",
+    ("breaker",),
+)
+
+
+class CircuitOpen(RuntimeError):
+    """The circuit is open; the call was not attempted."""
+
+    code = "CIRCUIT_OPEN"
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(name, retry_after)
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+        slow_call_seconds: Optional[float] = None,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._trials = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == CLOSED:
+            self._failures = 0
+        TRANSITIONS_TOTAL.inc(breaker=self.name, state=state)
+
+    def acquire(self) -> None:
+        """
+        Admit one call (pair with `record_success` / `record_failure` / `release`).
+
+        Raises:
+            CircuitOpen: The circuit is open, or half-open with all trial slots taken
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            retry_after = max(0.0, self._opened_at + self.open_seconds - self._clock())
+        REJECTED_TOTAL.inc(breaker=self.name)
+        raise CircuitOpen(self.name, retry_after)
+
+    def record_success(self, seconds: float = 0.0) -> None:
+        """The admitted call succeeded after `seconds` (too slow counts as a failure)."""
+        if self.slow_call_seconds is not None and seconds > self.slow_call_seconds:
+            self.record_failure(f"slow call ({seconds:.1f}s > {self.slow_call_seconds:g}s)")
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._last_error = error
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """The admitted call ended without telling anything about health (e.g. cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn` under the breaker: every exception counts as a failure."""
+        self.acquire()
+        started = self._clock()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success(self._clock() - started)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trials = 0
+            self._last_error = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State for health checks."""
+        with self._lock:
+            state = self._current_state()
+            info: Dict[str, Any] = {"state": state, "consecutive_failures": self._failures}
+            if state == OPEN:
+                info["retry_after_seconds"] = round(
+                    max(0.0, self._opened_at + self.open_seconds - self._clock()), 3
+                )
+            if self._last_error and state != CLOSED:
+                info["last_error"] = self._last_error
+            return info
@@ -0,0 +1,47 @@
+"""
+Request deadlines (domain layer).
+
+A Deadline is an absolute point in (monotonic) time that a request must answer
+by. Multi-stage work hands each stage a slice of what is left, so an early
+stage overrunning its share cannot starve the later ones of their budget.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage did not finish within its deadline."""
+
+
+class Deadline:
+    def __init__(self, expires_at: float) -> None:
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + max(0.0, seconds))
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def slice(self, fraction: float = 1.0, *, reserve: float = 0.0) -> "Deadline":
+        """
+        Sub-deadline for one stage: `fraction` of the remaining time, after
+        holding back `reserve` seconds for the stages that follow.
+        """
+        budget = max(0.0, self.remaining() - reserve) * min(1.0, max(0.0, fraction))
+        return Deadline.after(budget)
+
+
+def min_timeout(deadline: Optional[Deadline], default: float) -> float:
+    """Socket-style timeout: `default`, capped by what is left of `deadline`."""
+    if deadline is None:
+        return default
+    return min(default, deadline.remaining())
@@ -0,0 +1,227 @@
+"""
+Per-document memory accounting (domain layer).
+
+`measure` brackets one extraction and reports how much memory it took:
+
+- RSS growth (always): the peak resident set size during the block minus the
+  RSS before it. The kernel's high-water mark is reset when the block starts
+  (/proc/self/clear_refs), so a spike freed before the end still counts.
+  Without /proc it is RSS after minus RSS before. Costs a few small /proc reads.
+- Peak Python allocation (debug mode, MEMORY_TRACE=1): tracemalloc's peak of
+  traced memory during the block, with one-frame tracebacks. Every allocation
+  is traced while it runs, so it is too slow to leave on.
+
+RSS is per process, and so are the high-water mark and tracemalloc. Only a
+sandboxed worker, which parses one document at a time, marks itself exclusive
+(`set_exclusive`): there the peak is reset per document. With in-process
+parsing (PARSER_SANDBOX=0) concurrent extractions share the process, so the
+peak is left alone (growth is RSS after minus RSS before) and overlapping
+traced blocks share one tracemalloc session: the numbers are only indicative.
+
+PARSER_DOC_MEMORY_MB sets a per-document budget. The sandbox caps each job's
+address-space growth at it (the allocation that would exceed it fails), and
+`check_budget` rejects a document whose measured RSS growth exceeds it. The
+measured budget is only enforced in exclusive processes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import tracemalloc
+from typing import Any, NamedTuple, Optional
+
+from . import metrics
+
+_MB = 1024 * 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# (upper bound in bytes, label) for the document size label; larger is the last label.
+SIZE_BUCKETS = ((100 * 1024, "<100KB"), (_MB, "100KB-1MB"), (5 * _MB, "1MB-5MB"))
+LARGEST_SIZE_BUCKET = ">5MB"
+BYTE_BUCKETS = tuple(n * _MB for n in (1, 4, 16, 32, 64, 128, 256, 512, 1024))
+
+RSS_GROWTH_BYTES = metrics.histogram(
+    "resumeai_parse_rss_growth_bytes",
+    "Peak RSS growth of the parsing process during one extraction (format: file suffix, size: file size bucket).",
+    ("format", "size"),
+    BYTE_BUCKETS,
+)
+PYTHON_PEAK_BYTES = metrics.histogram(
+    "resumeai_parse_python_peak_bytes",
+    "Peak traced Python allocation during one extraction (MEMORY_TRACE=1 only).",
+    ("format", "size"),
+    BYTE_BUCKETS,
+)
+BUDGET_REJECTED_TOTAL = metrics.counter(
+    "resumeai_parse_memory_budget_rejected_total",
+    "Documents rejected for exceeding the per-document memory budget.",
+)
+
+
+# True in a process that handles one document at a time (a sandbox worker).
+_exclusive = False
+
+# Nested / concurrent traced blocks share one tracemalloc session.
+_trace_lock = threading.Lock()
+_tracers = 0
+_owns_trace = False
+
+
+def set_exclusive(value: bool = True) -> None:
+    """Declare that this process measures one document at a time (see module docstring)."""
+    global _exclusive
+    _exclusive = value
+
+
+def exclusive() -> bool:
+    return _exclusive
+
+
+class MemoryBudgetExceeded(ValueError):
+    """The document needed more memory than the per-document budget."""
+
+    code = "MEMORY_BUDGET_EXCEEDED"
+
+    def __init__(self, budget_bytes: int, used_bytes: Optional[int] = None) -> None:
+        super().__init__(budget_bytes, used_bytes)
+        self.budget_bytes = budget_bytes
+        self.used_bytes = used_bytes
+
+    def __str__(self) -> str:
+        budget = f"{self.budget_bytes / _MB:g}MB"
+        if self.used_bytes is None:
+            return f"Document exceeds the per-document memory budget of {budget}"
+        return f"Document used {self.used_bytes / _MB:.1f}MB, over the per-document memory budget of {budget}"
+
+
+class MemoryUsage(NamedTuple):
+    rss_growth_bytes: int
+    # None unless traced (MEMORY_TRACE=1)
+    python_peak_bytes: Optional[int] = None
+
+
+def trace_enabled() -> bool:
+    """
+    Environment variables:
+    - MEMORY_TRACE (default: 0): also trace Python allocations per extraction (slow; debugging only)
+    """
+    return os.getenv("MEMORY_TRACE", "0").strip().lower() not in ("0", "false", "no", "")
+
+
+def budget_bytes() -> int:
+    """
+    Environment variables:
+    - PARSER_DOC_MEMORY_MB (default: 0 = no budget): memory one document may take
+    """
+    return int(float(os.getenv("PARSER_DOC_MEMORY_MB") or 0) * _MB)
+
+
+def _statm(field: int) -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[field]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (None without /proc)."""
+    return _statm(1)
+
+
+def address_space_bytes() -> Optional[int]:
+    """Current virtual memory size (what RLIMIT_AS limits; None without /proc)."""
+    return _statm(0)
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class measure:
+    """
+    Measure the block's memory use; `usage` is set when it exits (also on error).
+
+    Args:
+        trace: Also trace Python allocations (default: MEMORY_TRACE)
+        exclusive: Nothing else runs in this process meanwhile, so the RSS
+            high-water mark may be reset (default: exclusive())
+    """
+
+    def __init__(self, trace: Optional[bool] = None, *, exclusive: Optional[bool] = None) -> None:
+        self.trace = trace_enabled() if trace is None else trace
+        self.exclusive = _exclusive if exclusive is None else exclusive
+        self.usage: Optional[MemoryUsage] = None
+
+    def __enter__(self) -> "measure":
+        global _tracers, _owns_trace
+        if self.trace:
+            with _trace_lock:
+                if _tracers == 0:
+                    # Only the session this module started is stopped again.
+                    _owns_trace = not tracemalloc.is_tracing()
+                    if _owns_trace:
+                        tracemalloc.start(1)
+                    else:
+                        tracemalloc.reset_peak()
+                _tracers += 1
+                self._traced_before = tracemalloc.get_traced_memory()[0]
+        self._peak_reset = self.exclusive and _reset_peak_rss()
+        self._rss_before = rss_bytes() or 0
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        global _tracers
+        python_peak = None
+        if self.trace:
+            with _trace_lock:
+                python_peak = max(0, tracemalloc.get_traced_memory()[1] - self._traced_before)
+                _tracers -= 1
+                if _tracers == 0 and _owns_trace:
+                    tracemalloc.stop()
+        after = (_peak_rss_bytes() if self._peak_reset else None) or rss_bytes() or 0
+        self.usage = MemoryUsage(max(0, after - self._rss_before), python_peak)
+
+
+def size_bucket(size_bytes: int) -> str:
+    for bound, label in SIZE_BUCKETS:
+        if size_bytes < bound:
+            return label
+    return LARGEST_SIZE_BUCKET
+
+
+def observe(usage: MemoryUsage, fmt: str, size_bytes: int) -> None:
+    """Record one extraction's usage in the histograms."""
+    labels = {"format": fmt, "size": size_bucket(size_bytes)}
+    RSS_GROWTH_BYTES.observe(usage.rss_growth_bytes, **labels)
+    if usage.python_peak_bytes is not None:
+        PYTHON_PEAK_BYTES.observe(usage.python_peak_bytes, **labels)
+
+
+def check_budget(usage: MemoryUsage, budget: Optional[int] = None) -> None:
+    """
+    Raises:
+        MemoryBudgetExceeded: The measured growth is over `budget` (default: budget_bytes())
+    """
+    budget = budget_bytes() if budget is None else budget
+    used = max(usage.rss_growth_bytes, usage.python_peak_bytes or 0)
+    if budget > 0 and used > budget:
+        BUDGET_REJECTED_TOTAL.inc()
+        raise MemoryBudgetExceeded(budget, used)
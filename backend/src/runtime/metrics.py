@@ -0,0 +1,214 @@
+"""
+In-process metrics (domain layer).
+
+Minimal, dependency-free counters and histograms rendered in the Prometheus
+text format. Metrics are per process; each API worker exposes its own values.
+
+Code running in a sandboxed parser worker records into a capture instead
+(see `capturing`); the parent replays the records into its own registry.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+# (metric name, counter increment / histogram observation, labels)
+Record = Tuple[str, float, Dict[str, str]]
+
+_capture: ContextVar[Optional[List[Record]]] = ContextVar("resumeai_metrics_capture", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        if _captured(self.name, amount, labels):
+            return
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, v in items:
+            yield self.name, _format_labels(self.labelnames, values), v
+
+
+class Histogram:
+    """Cumulative-bucket histogram; `buckets` are the finite upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Sequence[float] = ()
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(b for b in buckets if not math.isinf(b))) + (math.inf,)
+        # labels -> (count per bucket, sum of observations)
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    _key = Counter._key
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        if _captured(self.name, value, labels):
+            return
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            counts, _total = self._values.get(self._key(labels)) or ((), 0.0)
+            return sum(counts)
+
+    def sum(self, **labels: str) -> float:
+        with self._lock:
+            return (self._values.get(self._key(labels)) or ((), 0.0))[1]
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted((values, list(counts), total) for values, (counts, total) in self._values.items())
+        names = self.labelnames + ("le",)
+        for values, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                yield f"{self.name}_bucket", _format_labels(names, values + (le,)), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, values), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, values), cumulative
+
+
+Metric = Union[Counter, Histogram]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _declare(self, cls: Any, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter (idempotent, so modules can declare at import time)."""
+        return self._declare(Counter, name, help, labelnames)
+
+    def histogram(
+        self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Sequence[float] = ()
+    ) -> Histogram:
+        """Get or create a histogram (idempotent, like `counter`)."""
+        return self._declare(Histogram, name, help, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, v in metric.samples():
+                lines.append(f"{name}{labels} {v:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    return REGISTRY.counter(name, help, labelnames)
+
+
+def histogram(
+    name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Sequence[float] = ()
+) -> Histogram:
+    return REGISTRY.histogram(name, help, labelnames, buckets)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def _captured(name: str, value: float, labels: Dict[str, str]) -> bool:
+    records = _capture.get()
+    if records is None:
+        return False
+    records.append((name, value, dict(labels)))
+    return True
+
+
+class capturing:
+    """
+    Record counter increments and histogram observations made in the block
+    into a list (returned by __enter__) instead of applying them, so a worker
+    process can send them to the process that exposes /metrics.
+    """
+
+    def __enter__(self) -> List[Record]:
+        self.records: List[Record] = []
+        self._token = _capture.set(self.records)
+        return self.records
+
+    def __exit__(self, *_exc: Any) -> None:
+        _capture.reset(self._token)
+
+
+def replay(records: Sequence[Record], registry: Optional[Registry] = None) -> None:
+    """Apply captured records; metrics this process never declared are skipped."""
+    registry = registry or REGISTRY
+    for name, value, labels in records:
+        metric = registry.get(name)
+        if isinstance(metric, Counter):
+            metric.inc(value, **labels)
+        elif isinstance(metric, Histogram):
+            metric.observe(value, **labels)
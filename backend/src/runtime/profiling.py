@@ -0,0 +1,144 @@
+"""
+Profiling helpers (domain layer).
+
+- RequestProfile: cProfile for a single request. cProfile only sees the thread
+  it was enabled in, so it collects stats from every thread (and sandboxed
+  worker process) that did work for the request and renders one pstats report.
+- StackSampler: low-overhead sampling of all threads in the process.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+RawStats = Dict[tuple, tuple]
+
+
+class _Loaded:
+    # pstats.Stats accepts any object with create_stats() + a `stats` dict. It
+    # mutates the dict it loads, so give it a copy.
+    def __init__(self, stats: RawStats) -> None:
+        self.stats = dict(stats)
+
+    def create_stats(self) -> None:
+        pass
+
+
+class _Profiling:
+    # Not @contextmanager, so exceptions (e.g. frozen DomainError) pass through untouched.
+    def __init__(self, profile: "RequestProfile") -> None:
+        self._profile = profile
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> None:
+        self._profiler = self._profile.enable()
+
+    def __exit__(self, *_exc) -> None:
+        if self._profiler is not None:
+            self._profile.collect(self._profiler)
+
+
+class RequestProfile:
+    def __init__(self) -> None:
+        self._stats: List[RawStats] = []
+        self._lock = threading.Lock()
+
+    def enable(self) -> Optional[cProfile.Profile]:
+        """Start profiling the calling thread; None if another profiler is active there."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+        return profiler
+
+    def collect(self, profiler: cProfile.Profile) -> None:
+        profiler.disable()
+        profiler.create_stats()
+        self.add_stats([profiler.stats])  # type: ignore[attr-defined]
+
+    def profiling(self) -> "_Profiling":
+        """Context manager profiling the calling thread for the duration of the block."""
+        return _Profiling(self)
+
+    def add_stats(self, stats: List[RawStats]) -> None:
+        """Merge raw stats exported by export() (e.g. from a worker process)."""
+        with self._lock:
+            self._stats.extend(s for s in stats if s)
+
+    def export(self) -> List[RawStats]:
+        """Raw (picklable) stats, for sending to another process."""
+        with self._lock:
+            return list(self._stats)
+
+    def render(self, sort: str = "cumulative", limit: int = 60) -> str:
+        """Text report of the merged stats, like `python -m cProfile -s cumulative`."""
+        stats = self.export()
+        if not stats:
+            return "No profile data collected.\n"
+        out = io.StringIO()
+        merged = pstats.Stats(_Loaded(stats[0]), stream=out)
+        for extra in stats[1:]:
+            merged.add(_Loaded(extra))
+        merged.strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+class StackSampler:
+    """
+    Statistical profiler for the whole process: samples every thread's stack
+    (sys._current_frames) at a fixed rate, without tracing hooks, so it is
+    cheap enough to run against live traffic.
+
+    Samples aggregate into "collapsed" stacks (`thread;outer;...;inner count`),
+    the input format of flamegraph.pl / speedscope / inferno.
+    """
+
+    def __init__(self, interval: float = 0.01, *, max_depth: int = 128) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self._counts: Dict[str, int] = {}
+
+    def sample(self, *, skip_thread: Optional[int] = None) -> None:
+        """Take one sample of all threads (except `skip_thread`)."""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip_thread:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            key = ";".join(reversed(stack))
+            self._counts[key] = self._counts.get(key, 0) + 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> None:
+        """Sample from the calling thread (which is left out) for `seconds`."""
+        me = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        next_at = time.monotonic()
+        while next_at < deadline:
+            self.sample(skip_thread=me)
+            next_at += self.interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (e.g. the GIL was busy); don't try to catch up in a burst.
+                next_at = time.monotonic()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most frequent first."""
+        rows = sorted(self._counts.items(), key=lambda kv: -kv[1])
+        return "".join(f"{stack} {count}\n" for stack, count in rows)
@@ -0,0 +1,111 @@
+"""
+Per-request stage timings (domain layer).
+
+A Timings collector is bound to the current context (contextvars), so domain
+code marks stages with `with stage("extraction"):` without knowing about HTTP;
+outside a collecting request, stage() is a no-op. Work handed to other threads
+keeps the collector via bind(); sandboxed workers send their stages back to the
+parent, which merges them.
+
+The API renders the result as a Server-Timing header.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from .profiling import RequestProfile
+
+_current: contextvars.ContextVar[Optional["Timings"]] = contextvars.ContextVar("resumeai_timings", default=None)
+
+
+class Timings:
+    """Accumulated seconds per stage, in first-seen order, plus an optional profile."""
+
+    def __init__(self, profile: Optional[RequestProfile] = None) -> None:
+        self.profile = profile
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[name] = self._stages.get(name, 0.0) + seconds
+
+    def merge(self, stages: Mapping[str, float]) -> None:
+        for name, seconds in stages.items():
+            self.add(name, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stages)
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """Server-Timing header value (durations in milliseconds)."""
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.as_dict().items()]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def current() -> Optional[Timings]:
+    return _current.get()
+
+
+class collecting:
+    """Make `timings` (or a fresh collector) current for the duration of the block."""
+
+    def __init__(self, timings: Optional[Timings] = None) -> None:
+        self.timings = timings if timings is not None else Timings()
+
+    def __enter__(self) -> Timings:
+        self._token = _current.set(self.timings)
+        return self.timings
+
+    def __exit__(self, *_exc: Any) -> None:
+        _current.reset(self._token)
+
+
+class stage:
+    """Add the block's wall time to stage `name` of the current collector, if any."""
+
+    # Context managers here are classes rather than @contextmanager: exceptions
+    # pass through untouched (generator-based managers re-raise via throw(),
+    # which fails for frozen dataclass exceptions such as DomainError).
+    __slots__ = ("name", "_timings", "_start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self._timings = _current.get()
+        if self._timings is not None:
+            self._start = time.perf_counter()
+
+    def __exit__(self, *_exc: Any) -> None:
+        if self._timings is not None:
+            self._timings.add(self.name, time.perf_counter() - self._start)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap `fn` to run in a copy of the caller's context, for use from another
+    thread (executors don't propagate contextvars). When the current request is
+    being profiled, the call is profiled in that thread too.
+    """
+    ctx = contextvars.copy_context()
+
+    def _run(*args: Any, **kwargs: Any) -> Any:
+        return ctx.run(_call, fn, args, kwargs)
+
+    return _run
+
+
+def _call(fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    timings = _current.get()
+    if timings is None or timings.profile is None:
+        return fn(*args, **kwargs)
+    with timings.profile.profiling():
+        return fn(*args, **kwargs)
@@ -4,7 +4,7 @@ from backend.src.llm import analyze_service
 
 
 def test_analyze_service_returns_validated_output(monkeypatch):
-    def fake_generate(_prompt: str) -> str:
+    def fake_generate(_prompt: str, **_kwargs) -> str:
         return '{"score": 123, "tips": [{"id":"x","message":"y","severity":"GOOD"}], "analysis": {"a": 1}}'
 
     monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
@@ -15,7 +15,7 @@ def test_analyze_service_returns_validated_output(monkeypatch):
 
 
 def test_analyze_service_invalid_json_raises_domain_error(monkeypatch):
-    def fake_generate(_prompt: str) -> str:
+    def fake_generate(_prompt: str, **_kwargs) -> str:
         return "not json"
 
     monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
@@ -0,0 +1,78 @@
+import json
+import threading
+
+import docx
+import pytest
+
+from backend.src.resume import batch
+from backend.src.resume.__main__ import main
+
+
+def _docx(path, *lines):
+    doc = docx.Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_batch_parses_scores_and_resumes(tmp_path, capsys):
+    archive = tmp_path / "archive"
+    (archive / "nested").mkdir(parents=True)
+    _docx(archive / "a.docx", "Ada Lovelace", "ada@example.com", "Skills", "Python, Math")
+    _docx(archive / "nested" / "b.docx", "Alan Turing", "alan@example.com")
+    (archive / "copy.docx").write_bytes((archive / "a.docx").read_bytes())
+    (archive / "broken.docx").write_bytes(b"not a zip")
+    (archive / "notes.txt").write_text("ignored")
+    out = tmp_path / "out.jsonl"
+
+    assert main([str(archive), "-o", str(out), "--jobs", "2"]) == 0
+    records = _records(out)
+    assert len(records) == 3  # the copy is skipped by content hash
+    by_name = {r["path"].rsplit("/", 1)[-1]: r for r in records}
+    assert by_name["broken.docx"]["ok"] is False
+    assert by_name["broken.docx"]["error"]["code"] == "PARSING_FAILED"
+    ok = [r for r in records if r["ok"]]
+    assert {r["data"]["name"] for r in ok} == {"Ada Lovelace", "Alan Turing"}
+    assert all(isinstance(r["score"], int) and r["tips"] for r in ok)
+
+    # Simulate a run killed mid-write, then add one more file and resume.
+    with out.open("a") as f:
+        f.write('{"resume_id": "torn')
+    _docx(archive / "c.docx", "Grace Hopper")
+    assert main([str(archive), "-o", str(out), "--jobs", "2"]) == 0
+    records = _records(out)
+    assert len(records) == 4
+    assert records[-1]["data"]["name"] == "Grace Hopper"
+    assert "Resuming: 3 documents" in capsys.readouterr().err
+
+
+def test_load_checkpoint_retry_errors(tmp_path):
+    out = tmp_path / "out.jsonl"
+    out.write_text(
+        json.dumps({"resume_id": "a", "ok": True}) + "\n" + json.dumps({"resume_id": "b", "ok": False}) + "\n"
+    )
+    assert batch.load_checkpoint(str(out)) == {"a", "b"}
+    assert batch.load_checkpoint(str(out), retry_errors=True) == {"a"}
+    # The failed record is dropped, so the retry's record is the only one for "b".
+    assert [r["resume_id"] for r in _records(out)] == ["a"]
+
+
+def test_prefetch_thread_stops_when_the_run_fails(tmp_path, monkeypatch):
+    class _BrokenExecutor(batch.ThreadPoolExecutor):
+        def submit(self, *_args, **_kwargs):
+            raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(batch, "ThreadPoolExecutor", _BrokenExecutor)
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"{i}.docx"
+        path.write_bytes(b"x%d" % i)
+        paths.append(str(path))
+    with (tmp_path / "out.jsonl").open("w") as out, pytest.raises(RuntimeError):
+        batch.run_batch(paths, out, prefetch=1, pool=object())
+    # Not left blocked on the full prefetch queue.
+    assert not [t for t in threading.enumerate() if t.name == "batch-prefetch"]
@@ -0,0 +1,71 @@
+import multiprocessing
+import time
+
+import pytest
+
+from backend.src.runtime import cache as cache_mod
+from backend.src.runtime.cache import LRUCache, SQLiteCache
+
+
+def _write_entry(path):
+    SQLiteCache(path, "shared").set("k", {"from": "child", "n": [1, 2]})
+
+
+def test_sqlite_cache_roundtrip_and_namespaces(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    a = SQLiteCache(path, "a")
+    b = SQLiteCache(path, "b")
+    a.set("k", {"x": 1})
+    assert a.get("k") == {"x": 1}
+    assert b.get("k") is None
+    a.delete("k")
+    assert a.get("k") is None
+
+
+def test_sqlite_cache_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    reader = SQLiteCache(path, "shared")
+    proc = multiprocessing.get_context("spawn").Process(target=_write_entry, args=(path,))
+    proc.start()
+    proc.join(timeout=30)
+    assert proc.exitcode == 0
+    assert reader.get("k") == {"from": "child", "n": [1, 2]}
+
+
+def test_sqlite_cache_ttl_and_lru_bound(tmp_path, monkeypatch):
+    path = str(tmp_path / "c.sqlite3")
+    c = SQLiteCache(path, "lru", maxsize=2)
+    c.set("old", 1)
+    c.set("mid", 2)
+    c.set("new", 3)
+    assert len(c) == 2
+    assert c.get("old") is None
+
+    t = SQLiteCache(path, "ttl", ttl_seconds=10)
+    t.set("k", "v")
+    now = time.time()
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now + 11)
+    assert t.get("k") is None
+
+
+def test_get_cache_backend_from_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "_CACHES", {})
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "env.sqlite3"))
+    assert isinstance(cache_mod.get_cache("x"), SQLiteCache)
+    monkeypatch.delenv("CACHE_BACKEND")
+    assert isinstance(cache_mod.get_cache("y"), LRUCache)
+    monkeypatch.setenv("CACHE_BACKEND", "redis")
+    with pytest.raises(ValueError):
+        cache_mod.get_cache("z")
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache_items_since(tmp_path, backend):
+    cache = LRUCache() if backend == "memory" else SQLiteCache(str(tmp_path / "c.sqlite3"), "ns")
+    cache.set("old", 1)
+    time.sleep(0.01)
+    mark = time.time()
+    cache.set("new", 2)
+    assert sorted(key for key, _, _ in cache.items()) == ["new", "old"]
+    assert [(key, value) for key, value, _ in cache.items(mark)] == [("new", 2)]
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+
+from backend.src.llm import analyze_service, chunked_analysis
+from backend.src.runtime.cache import get_cache
+from backend.src.runtime.cancellation import Cancelled
+
+SECTIONS = ("Summary", "Experience", "Education", "Skills")
+
+
+def _long_cv(lines_per_section=60):
+    parts = ["Ada Lovelace", "ada@example.com"]
+    for name in SECTIONS:
+        parts.append(name)
+        parts.extend(f"{name} detail line {i} with some words." for i in range(lines_per_section))
+    return "\n".join(parts)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    get_cache("section_analysis").clear()
+    yield
+    get_cache("section_analysis").clear()
+
+
+def test_split_text_keeps_chunks_under_limit():
+    text = "\n\n".join("para %d " % i + "word " * 50 for i in range(20))
+    chunks = chunked_analysis.split_text(text, 600)
+    assert all(len(c) <= 600 for c in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+    assert chunked_analysis.split_text("x" * 25, 10) == ["x" * 10, "x" * 10, "x" * 5]
+    assert chunked_analysis.split_text("  ", 10) == []
+
+
+def test_resume_chunks_follow_sections():
+    from backend.src.pipeline.parser import index_sections
+
+    cv = _long_cv()
+    chunks = chunked_analysis.resume_chunks(cv, index_sections(cv), 2000)
+    assert len(chunks) > 1
+    assert all(len(text) <= 2000 for _names, text in chunks)
+    names = [name for chunk_names, _ in chunks for name in chunk_names]
+    # A long section spans consecutive chunks; sections keep document order.
+    collapsed = [name for i, name in enumerate(names) if i == 0 or names[i - 1] != name]
+    assert collapsed == ["other"] + [name.lower() for name in SECTIONS]
+
+
+def test_chunks_run_in_parallel_and_merge(monkeypatch):
+    calls = []
+
+    def fake_generate(prompt, **_kwargs):
+        calls.append(prompt)
+        time.sleep(0.2)
+        return '{"score": 400, "tips": [{"id": "shared", "message": "m", "severity": "WARNING"}]}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    started = time.perf_counter()
+    result = chunked_analysis.analyze_chunked(_long_cv(), "Python engineer", max_chars=2000, max_concurrency=8)
+    elapsed = time.perf_counter() - started
+    assert len(calls) > 2
+    # Bounded by the slowest chunk, not by the number of chunks.
+    assert elapsed < 0.2 * len(calls) / 2
+    assert result.score == 400
+    assert [t.id for t in result.tips] == ["shared"]
+    assert len(result.analysis["chunks"]) == len(calls)
+
+    # Chunk results are cached.
+    again = chunked_analysis.analyze_chunked(_long_cv(), "Python engineer", max_chars=2000, max_concurrency=8)
+    assert all(chunk["cached"] for chunk in again.analysis["chunks"])
+
+
+def test_chunks_get_the_whole_job_and_a_partial_resume_prompt(monkeypatch):
+    prompts = []
+    lock = threading.Lock()
+    running = [0, 0]  # now, most at once
+
+    def fake_generate(prompt, **_kwargs):
+        with lock:
+            prompts.append(prompt)
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return '{"score": 600, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    job = "\n".join(f"Requirement {i}: experience with system {i}." for i in range(150))
+    plan = chunked_analysis.plan_chunks(_long_cv(), job, max_chars=1000)
+    result = chunked_analysis.analyze_chunked(_long_cv(), job, plan=plan, max_concurrency=3)
+    # Chunks keep their size; the ones past the concurrency limit wait for a free slot.
+    assert all(len(text) <= 1000 for _names, text in plan.chunks)
+    assert len(prompts) == len(plan.chunks) > 3
+    assert running[1] <= 3
+    assert plan.prompt_chars == max(len(text) for _names, text in plan.chunks) + len(job)
+    assert all(job in p and "only part of a longer resume" in p for p in prompts)
+    assert result.analysis["chunks"][0]["sections"][0] == "other"
+    assert result.score == 600
+
+
+def test_oversized_inputs_are_rejected_before_any_prompt(monkeypatch):
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", pytest.fail)
+    with pytest.raises(chunked_analysis.InputTooLarge) as e:
+        chunked_analysis.analyze_chunked(_long_cv(), "x" * (chunked_analysis.job_chars() + 1))
+    assert e.value.code == "INPUT_TOO_LARGE"
+    assert "POST /jobs" in str(e.value)
+    monkeypatch.setenv("ANALYZE_MAX_CHUNKS", "2")
+    with pytest.raises(chunked_analysis.InputTooLarge):
+        chunked_analysis.analyze_chunked(_long_cv(), "Python", max_chars=1000)
+
+
+def test_short_input_is_one_plain_analysis(monkeypatch):
+    calls = []
+
+    def fake_generate(prompt, **_kwargs):
+        calls.append(prompt)
+        return '{"score": 100, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    result = chunked_analysis.analyze_chunked("Ada Lovelace\nPython", "Python")
+    assert len(calls) == 1
+    assert result.analysis is None
+
+
+def test_first_failure_cancels_other_chunks(monkeypatch):
+    cancelled = []
+    lock = threading.Lock()
+
+    def fake_generate(prompt, *, cancel=None, **_kwargs):
+        with lock:
+            first = not cancelled and not getattr(fake_generate, "failed", False)
+            fake_generate.failed = True
+        if first:
+            raise RuntimeError("OLLAMA_REQUEST_FAILED", "boom")
+        if cancel.wait(5):
+            cancelled.append(prompt)
+            raise Cancelled()
+        return '{"score": 1, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError) as e:
+        chunked_analysis.analyze_chunked(_long_cv(), "Python", max_chars=2000, max_concurrency=8)
+    assert e.value.args[0] == "OLLAMA_REQUEST_FAILED"
+    assert time.perf_counter() - started < 3
+    assert cancelled
@@ -0,0 +1,71 @@
+import pytest
+
+from backend.src.runtime.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail(breaker, times=1):
+    for _ in range(times):
+        breaker.acquire()
+        breaker.record_failure("boom")
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker("t", failure_threshold=3, open_seconds=10, clock=Clock())
+    _fail(breaker, 2)
+    breaker.acquire()
+    breaker.record_success()  # resets the streak
+    _fail(breaker, 2)
+    assert breaker.state == CLOSED
+    _fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen) as e:
+        breaker.acquire()
+    assert e.value.retry_after == 10
+    assert breaker.snapshot()["last_error"] == "boom"
+
+
+def test_half_open_admits_one_trial_and_closes_on_success():
+    clock = Clock()
+    breaker = CircuitBreaker("t", failure_threshold=1, open_seconds=5, clock=clock)
+    _fail(breaker)
+    clock.now = 5
+    assert breaker.state == HALF_OPEN
+    breaker.acquire()
+    with pytest.raises(CircuitOpen):
+        breaker.acquire()  # trial already in flight
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": CLOSED, "consecutive_failures": 0}
+
+
+def test_failed_or_abandoned_trial():
+    clock = Clock()
+    breaker = CircuitBreaker("t", failure_threshold=1, open_seconds=5, clock=clock)
+    _fail(breaker)
+    clock.now = 5
+    breaker.acquire()
+    breaker.release()  # e.g. cancelled: the slot is free again
+    _fail(breaker)
+    assert breaker.state == OPEN
+    clock.now = 9
+    assert breaker.snapshot()["retry_after_seconds"] == 1
+
+
+def test_slow_calls_count_as_failures():
+    clock = Clock()
+    breaker = CircuitBreaker("t", failure_threshold=2, slow_call_seconds=1.0, clock=clock)
+
+    def slow():
+        clock.now += 2
+        return "late"
+
+    assert breaker.call(slow) == "late"
+    assert breaker.call(slow) == "late"
+    assert breaker.state == OPEN
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from backend.src.llm import analyze_service, schema
+from backend.src.llm.requirements import extract_requirements
+from backend.src.resume import jobs
+from backend.src.runtime.cache import get_cache
+
+JOB = "Senior Backend Engineer. " + "We build payment systems at scale for merchants worldwide. " * 40 + (
+    "Must have: Python, PostgreSQL, Kafka. Nice to have: Go."
+)
+REQUIREMENTS = {
+    "title": "Senior Backend Engineer",
+    "seniority": "senior",
+    "min_years_experience": 5,
+    "must_have_skills": ["Python", "PostgreSQL", "Kafka"],
+    "nice_to_have_skills": ["Go"],
+    "keywords": ["payments"],
+}
+
+
+@pytest.fixture
+def model(monkeypatch):
+    get_cache("jobs").clear()
+    calls = []
+
+    def fake_generate(prompt, **kwargs):
+        calls.append((prompt, kwargs))
+        return json.dumps(REQUIREMENTS)
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    yield calls
+    get_cache("jobs").clear()
+
+
+def test_extract_requirements_validates_answer(model, monkeypatch):
+    result = extract_requirements(JOB)
+    assert result.must_have_skills == ["Python", "PostgreSQL", "Kafka"]
+    prompt, kwargs = model[0]
+    assert JOB in prompt
+    assert kwargs["stop_after_json"] is True
+
+    monkeypatch.setattr(
+        analyze_service.ollama_client, "generate", lambda _p, **_k: '{"seniority": "wizard"}'
+    )
+    with pytest.raises(analyze_service.DomainError) as e:
+        extract_requirements(JOB)
+    assert e.value.code == "INVALID_MODEL_OUTPUT"
+
+
+def test_minor_deviations_are_truncated_not_rejected(model, monkeypatch):
+    answer = {
+        **REQUIREMENTS,
+        "title": "Senior Backend Engineer " * 10,
+        "seniority": "Senior",
+        "keywords": [f"term {i}" for i in range(40)],
+        "must_have_skills": ["Python", "x" * 200],
+        "summary": "not in the schema",
+    }
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", lambda _p, **_k: json.dumps(answer))
+    result = extract_requirements(JOB)
+    assert len(result.title) == schema.REQUIREMENTS_MAX_ITEM_CHARS
+    assert result.seniority == "senior"
+    assert result.keywords == [f"term {i}" for i in range(schema.REQUIREMENTS_MAX_ITEMS)]
+    assert result.must_have_skills == ["Python", "x" * schema.REQUIREMENTS_MAX_ITEM_CHARS]
+
+
+def test_register_extracts_once(model):
+    job, created = jobs.register(JOB)
+    assert created
+    again, created = jobs.register("  " + JOB + "\n")
+    assert not created
+    assert again == job
+    assert len(model) == 1
+    assert jobs.get(job.job_id) == job
+    assert jobs.get("not-an-id") is None
+
+
+def test_prompt_text_is_much_shorter_than_posting(model):
+    job, _ = jobs.register(JOB)
+    text = jobs.prompt_text(job)
+    assert "Must have: Python, PostgreSQL, Kafka" in text
+    assert "Seniority: senior" in text
+    assert len(text) * 5 < len(JOB)
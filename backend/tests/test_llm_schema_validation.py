@@ -1,6 +1,9 @@
 import pytest
 from pydantic import ValidationError
 
+import json
+
+from backend.src.llm import schema
 from backend.src.llm.schema import validate_analyze_result
 
 
@@ -27,3 +30,14 @@ def test_missing_fields_fail():
         validate_analyze_result(data)
 
 
+
+
+def test_output_budget_covers_a_maximal_valid_answer():
+    tip = {
+        "id": "i" * schema.BUDGET_TIP_ID_CHARS,
+        "message": "m" * schema.BUDGET_TIP_MESSAGE_CHARS,
+        "severity": "NEEDS_WORK",
+    }
+    answer = {"score": 1000, "tips": [tip] * schema.BUDGET_MAX_TIPS, "analysis": {"notes": "n" * 1900}}
+    validate_analyze_result(answer)
+    assert len(json.dumps(answer, indent=2)) <= schema.max_output_tokens() * schema.BUDGET_CHARS_PER_TOKEN
@@ -0,0 +1,100 @@
+import tracemalloc
+
+import pytest
+
+from backend.src.runtime import memory, metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = metrics.Registry()
+    hist = registry.histogram("test_seconds", "Test.", ("kind",), buckets=(1, 5))
+    for value in (0.5, 2, 3, 10):
+        hist.observe(value, kind="a")
+    assert hist.count(kind="a") == 4
+    assert hist.sum(kind="a") == 15.5
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{kind="a",le="1"} 1' in text
+    assert 'test_seconds_bucket{kind="a",le="5"} 3' in text
+    assert 'test_seconds_bucket{kind="a",le="+Inf"} 4' in text
+    assert 'test_seconds_count{kind="a"} 4' in text
+
+
+def test_registry_rejects_kind_mismatch():
+    registry = metrics.Registry()
+    registry.counter("test_total", "Test.")
+    with pytest.raises(ValueError):
+        registry.histogram("test_total", "Test.")
+
+
+def test_captured_records_replay_into_registry():
+    registry = metrics.Registry()
+    total = registry.counter("test_total", "Test.", ("kind",))
+    hist = registry.histogram("test_bytes", "Test.", buckets=(10,))
+    with metrics.capturing() as records:
+        total.inc(kind="a")
+        hist.observe(4)
+    # Captured, not applied.
+    assert total.value(kind="a") == 0
+    assert hist.count() == 0
+    metrics.replay(records + [("undeclared_total", 1.0, {})], registry)
+    assert total.value(kind="a") == 1
+    assert hist.count() == 1
+
+
+def test_measure_counts_freed_spike():
+    with memory.measure(trace=False, exclusive=True) as measured:
+        block = bytearray(48 * 1024 * 1024)
+        block[::4096] = b"x" * len(range(0, len(block), 4096))
+        del block
+    assert measured.usage.python_peak_bytes is None
+    if memory.rss_bytes() is not None:
+        assert measured.usage.rss_growth_bytes >= 32 * 1024 * 1024
+
+
+def test_measure_traces_python_peak():
+    with memory.measure(trace=True) as measured:
+        block = bytearray(16 * 1024 * 1024)
+        del block
+    assert measured.usage.python_peak_bytes >= 16 * 1024 * 1024
+
+
+def test_overlapping_traced_blocks_share_one_session():
+    assert not memory.exclusive()
+    outer = memory.measure(trace=True)
+    with outer:
+        with memory.measure(trace=True) as inner:
+            block = bytearray(8 * 1024 * 1024)
+            del block
+        # The inner block ending does not stop the outer one's tracing.
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert inner.usage.python_peak_bytes >= 8 * 1024 * 1024
+    assert outer.usage.python_peak_bytes >= 8 * 1024 * 1024
+
+
+def test_trace_mode_follows_env(monkeypatch):
+    monkeypatch.setenv("MEMORY_TRACE", "1")
+    assert memory.measure().trace
+    monkeypatch.setenv("MEMORY_TRACE", "0")
+    assert not memory.measure().trace
+
+
+def test_observe_labels_by_format_and_size_bucket():
+    before = memory.RSS_GROWTH_BYTES.count(format=".pdf", size="100KB-1MB")
+    memory.observe(memory.MemoryUsage(3 * 1024 * 1024), ".pdf", 200 * 1024)
+    assert memory.RSS_GROWTH_BYTES.count(format=".pdf", size="100KB-1MB") == before + 1
+    assert memory.size_bucket(10) == "<100KB"
+    assert memory.size_bucket(50 * 1024 * 1024) == ">5MB"
+
+
+def test_budget_rejects_documents_over_it(monkeypatch):
+    usage = memory.MemoryUsage(rss_growth_bytes=40 * 1024 * 1024, python_peak_bytes=None)
+    memory.check_budget(usage)  # no budget configured
+    monkeypatch.setenv("PARSER_DOC_MEMORY_MB", "64")
+    memory.check_budget(usage)
+    monkeypatch.setenv("PARSER_DOC_MEMORY_MB", "32")
+    with pytest.raises(memory.MemoryBudgetExceeded) as e:
+        memory.check_budget(usage)
+    assert e.value.budget_bytes == 32 * 1024 * 1024
+    assert "32MB" in str(e.value)
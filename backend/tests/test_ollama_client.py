@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.src.llm import ollama_client
+from backend.src.runtime.cancellation import CancelToken, Cancelled
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    chunks = ["{\"score\": ", "1", "}"]
+    delay = 0.0
+    last_body = None
+
+    def do_POST(self):
+        type(self).last_body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for chunk in self.chunks:
+                time.sleep(self.delay)
+                self.wfile.write((json.dumps({"response": chunk, "done": False}) + "\n").encode())
+                self.wfile.flush()
+            self.wfile.write(b'{"response": "", "done": true}\n')
+        except OSError:
+            pass
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _settings(httpd):
+    host, port = httpd.server_address
+    return ollama_client.OllamaSettings(ollama_url=f"http://{host}:{port}", ollama_model="m")
+
+
+def test_generate_joins_streamed_chunks(server):
+    assert ollama_client.generate("p", settings=_settings(server)) == '{"score": 1}'
+
+
+def test_generate_cancel_aborts_stream(server, monkeypatch):
+    monkeypatch.setattr(_StreamingHandler, "delay", 1.0)
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel).start()
+    started = time.perf_counter()
+    with pytest.raises(Cancelled):
+        ollama_client.generate("p", settings=_settings(server), cancel=token)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_generate_unreachable():
+    settings = ollama_client.OllamaSettings(ollama_url="http://127.0.0.1:9", ollama_model="m")
+    with pytest.raises(RuntimeError) as e:
+        ollama_client.generate("p", settings=settings)
+    assert e.value.args[0] == "OLLAMA_UNREACHABLE"
+
+
+def test_generate_sends_num_predict(server):
+    ollama_client.generate("p", settings=_settings(server), num_predict=77)
+    assert _StreamingHandler.last_body["options"]["num_predict"] == 77
+
+
+def test_generate_stops_once_json_object_closes(server, monkeypatch):
+    # Braces and quotes inside strings don't end the object; the rambling after it is never read.
+    chunks = ['Sure! {"tips": [{"message": "use \\"{braces}\\" }', '"}], "score"', ": 3}", " Hope this helps"]
+    monkeypatch.setattr(_StreamingHandler, "chunks", chunks + ["!"] * 20)
+    monkeypatch.setattr(_StreamingHandler, "delay", 0.1)
+    early_stops = ollama_client.EARLY_STOP_TOTAL.value()
+    started = time.perf_counter()
+    raw = ollama_client.generate("p", settings=_settings(server), stop_after_json=True)
+    assert time.perf_counter() - started < 1.0
+    assert raw == 'Sure! {"tips": [{"message": "use \\"{braces}\\" }"}], "score": 3}'
+    assert json.loads(raw[len("Sure! "):])["score"] == 3
+    assert ollama_client.EARLY_STOP_TOTAL.value() == early_stops + 1
+
+
+def test_answer_ending_with_the_stream_is_not_an_early_stop(server):
+    early_stops = ollama_client.EARLY_STOP_TOTAL.value()
+    assert ollama_client.generate("p", settings=_settings(server), stop_after_json=True) == '{"score": 1}'
+    assert ollama_client.EARLY_STOP_TOTAL.value() == early_stops
+
+
+def test_generate_without_object_reads_whole_stream(server, monkeypatch):
+    monkeypatch.setattr(_StreamingHandler, "chunks", ["no ", "json ", "here"])
+    assert ollama_client.generate("p", settings=_settings(server), stop_after_json=True) == "no json here"
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    statuses = []  # statuses to answer before succeeding
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        cls = type(self)
+        cls.calls += 1
+        status = cls.statuses.pop(0) if cls.statuses else 200
+        body = b'{"response": "{}", "done": true}\n' if status == 200 else b"busy"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    monkeypatch.setattr(_FlakyHandler, "calls", 0)
+    monkeypatch.setattr(ollama_client, "RETRY_BASE_DELAY_SECONDS", 0.01)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_generate_retries_overloaded_ollama(flaky, monkeypatch):
+    monkeypatch.setattr(_FlakyHandler, "statuses", [503, 429])
+    assert ollama_client.generate("p", settings=_settings(flaky)) == "{}"
+    assert _FlakyHandler.calls == 3
+
+
+def test_generate_does_not_retry_server_errors(flaky, monkeypatch):
+    monkeypatch.setattr(_FlakyHandler, "statuses", [500])
+    with pytest.raises(RuntimeError) as e:
+        ollama_client.generate("p", settings=_settings(flaky))
+    assert e.value.args[0] == "OLLAMA_HTTP_ERROR"
+    assert _FlakyHandler.calls == 1
+
+
+def test_open_circuit_fails_fast_then_probes(flaky, monkeypatch):
+    host, port = flaky.server_address
+    settings = ollama_client.OllamaSettings(
+        ollama_url=f"http://{host}:{port}", ollama_model="m", retries=0, breaker_failures=2, breaker_open_seconds=0.2
+    )
+    monkeypatch.setattr(_FlakyHandler, "statuses", [500, 500])
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            ollama_client.generate("p", settings=settings)
+
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError) as e:
+        ollama_client.generate("p", settings=settings)
+    assert e.value.args[0] == "OLLAMA_CIRCUIT_OPEN"
+    assert time.perf_counter() - started < 0.01
+    assert _FlakyHandler.calls == 2
+
+    time.sleep(0.25)
+    assert ollama_client.generate("p", settings=settings) == "{}"  # half-open trial
+    assert ollama_client.breaker_for(settings).state == "closed"
+
+
+def test_client_errors_do_not_open_the_circuit(flaky, monkeypatch):
+    host, port = flaky.server_address
+    settings = ollama_client.OllamaSettings(
+        ollama_url=f"http://{host}:{port}", ollama_model="missing", retries=0, breaker_failures=2
+    )
+    monkeypatch.setattr(_FlakyHandler, "statuses", [404, 404, 404])
+    for _ in range(3):
+        with pytest.raises(RuntimeError) as e:
+            ollama_client.generate("p", settings=settings)
+        assert e.value.args[0] == "OLLAMA_HTTP_ERROR"
+    assert ollama_client.breaker_for(settings).state == "closed"
+    assert ollama_client.generate("p", settings=settings) == "{}"
@@ -9,3 +9,11 @@ def test_build_prompt_includes_resume_and_job_text():
     assert job in prompt
 
 
+
+
+def test_build_prompt_limits_resume_to_selected_sections():
+    cv = "SUMMARY TEXT\nEXPERIENCE TEXT"
+    sections = {"summary": {"start": 0, "end": 12}, "experience": {"start": 13, "end": 28}}
+    prompt = build_prompt(cv, "JOB", sections=sections, only=["experience"])
+    assert "Experience:\nEXPERIENCE TEXT" in prompt
+    assert "SUMMARY TEXT" not in prompt
@@ -0,0 +1,60 @@
+import pytest
+
+from backend.src.resume import ranking, store
+from backend.src.runtime.cache import LRUCache
+
+
+@pytest.fixture
+def resumes(monkeypatch):
+    cache = LRUCache(maxsize=100)
+    monkeypatch.setattr(store, "_cache", lambda: cache)
+    monkeypatch.setattr(ranking, "_INDEX", None)
+    return cache
+
+
+def _put(n, **fields):
+    store.put(f"{n:064x}", "text", {"name": f"cv{n}", **fields})
+    return f"{n:064x}"
+
+
+def test_rank_orders_by_weighted_overlap(resumes):
+    both = _put(1, skills=["Python", "Kubernetes"], designation=["Backend Engineer"])
+    python = _put(2, skills=["Python"], degree=["BSc"])
+    _put(3, skills=["COBOL"], company_names=["Backend Python Inc"], designation=["Engineer"])
+
+    candidates, indexed = ranking.rank("Backend engineer: Python and Kubernetes. BSc preferred.", k=2)
+
+    assert indexed == 3
+    assert [c.resume_id for c in candidates] == [both, python]
+    assert candidates[0].matched == {"skills": ["kubernetes", "python"]}
+    assert candidates[1].matched == {"skills": ["python"], "degree": ["bsc"]}
+
+
+def test_words_of_the_posting_do_not_match_company_names(resumes):
+    _put(1, skills=["COBOL"], company_names=["Data Cloud Inc"])
+    candidates, indexed = ranking.rank("Data engineer for our cloud platform")
+    assert indexed == 1
+    assert candidates == []
+
+
+def test_index_follows_new_and_evicted_resumes(resumes):
+    first = _put(1, skills=["Go"])
+    assert [c.resume_id for c in ranking.rank("Go developer")[0]] == [first]
+
+    second = _put(2, skills=["Go", "Rust"])
+    assert [c.resume_id for c in ranking.rank("Go and Rust")[0]] == [second, first]
+
+    resumes.delete(second)
+    candidates, indexed = ranking.rank("Go and Rust")
+    assert [c.resume_id for c in candidates] == [first]
+    assert indexed == 1
+
+
+def test_reindexing_replaces_old_terms():
+    index = ranking.CandidateIndex()
+    index.add("a", {"skills": ["Java"]})
+    index.add("a", {"skills": ["Scala"]})
+    assert index.search({"skills": frozenset({"java"})}) == []
+    assert [c.resume_id for c in index.search({"skills": frozenset({"scala"})})] == ["a"]
+    index.remove("a")
+    assert len(index) == 0 and not index._postings
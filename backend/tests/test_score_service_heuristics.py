@@ -124,3 +124,19 @@ def test_professional_summary_tip():
     assert tip_missing["severity"] == "WARNING"
 
 
+
+
+def test_sections_from_parser_index_drive_experience_and_summary():
+    text = "Summary\nBackend engineer.\nExperience\nCut p99 latency by 40%.\n"
+    normalized = {
+        "skills": ["Python", "SQL", "Docker", "AWS", "CI"],
+        "degree": ["BSc"],
+        "sections": {"summary": {"start": 8, "end": 25}, "experience": {"start": 37, "end": 60}},
+    }
+    _score, tips = score(normalized, text)
+    assert _tip_by_id(tips, "quantified_impact_good") is not None
+    assert _tip_by_id(tips, "summary_good") is not None
+    assert _tip_by_id(tips, "education_experience_balance_good") is not None
+    # The offsets point into the resume text: without it, the index is not used.
+    _score, tips = score(normalized)
+    assert _tip_by_id(tips, "summary_good") is None
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from backend.src.llm import analyze_service, section_analysis
+from backend.src.runtime.cache import get_cache
+
+CV = (
+    "Ada Lovelace\n"
+    "ada@example.com\n"
+    "Summary\n"
+    "Backend engineer.\n"
+    "Experience\n"
+    "Acme Inc - cut latency by 40%.\n"
+    "Skills\n"
+    "Python, SQL\n"
+)
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    get_cache("section_analysis").clear()
+    seen = []
+
+    def fake_generate(prompt, **_kwargs):
+        seen.append(prompt)
+        tip_id = f"tip{len(seen)}"
+        return '{"score": 500, "tips": [{"id": "%s", "message": "m", "severity": "WARNING"}]}' % tip_id
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    yield seen
+    get_cache("section_analysis").clear()
+
+
+def test_split_sections_covers_indexed_and_other_text():
+    from backend.src.pipeline.parser import index_sections
+
+    units = dict(section_analysis.split_sections(CV, index_sections(CV)))
+    assert set(units) == {"other", "summary", "experience", "skills"}
+    assert "ada@example.com" in units["other"]
+    assert units["experience"] == "Acme Inc - cut latency by 40%."
+
+
+def test_only_changed_sections_are_reanalysed(prompts):
+    first = section_analysis.analyze_incremental(CV, "job")
+    assert len(prompts) == 4
+    assert all(not s["cached"] for s in first.analysis["sections"].values())
+
+    edited = CV.replace("cut latency by 40%", "cut latency by 45%")
+    second = section_analysis.analyze_incremental(edited, "job")
+    assert len(prompts) == 5
+    assert "45%" in prompts[-1]
+    # Each section is sent with a prompt scoped to that section.
+    assert "only part of a longer resume: its Experience section(s)" in prompts[-1]
+    report = second.analysis["sections"]
+    assert report["experience"]["cached"] is False
+    assert report["summary"]["cached"] is True
+    # Cached tips for unchanged sections are merged with the fresh ones.
+    assert len(second.tips) == 4
+
+
+def test_cold_run_analyses_sections_concurrently(monkeypatch):
+    get_cache("section_analysis").clear()
+
+    def slow_generate(_prompt, **_kwargs):
+        time.sleep(0.2)
+        return '{"score": 500, "tips": []}'
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", slow_generate)
+    started = time.perf_counter()
+    result = section_analysis.analyze_incremental(CV, "job")
+    elapsed = time.perf_counter() - started
+    get_cache("section_analysis").clear()
+    assert len(result.analysis["sections"]) == 4
+    # Four cold sections cost about one generation, not four in a row.
+    assert elapsed < 0.2 * 2
+
+
+def test_job_change_invalidates_cache(prompts):
+    section_analysis.analyze_incremental(CV, "job A")
+    section_analysis.analyze_incremental(CV, "job B")
+    assert len(prompts) == 8
+
+
+def test_merge_results_weights_scores_and_dedupes_tips():
+    from backend.src.llm.schema import validate_analyze_result
+
+    a = validate_analyze_result({"score": 900, "tips": [{"id": "x", "message": "a", "severity": "GOOD"}]})
+    b = validate_analyze_result({"score": 300, "tips": [{"id": "x", "message": "b", "severity": "WARNING"}]})
+    c = validate_analyze_result({"score": 500, "tips": [{"id": "y", "message": "c", "severity": "GOOD"}]})
+    score, tips = section_analysis.merge_results([(3.0, a), (1.0, b)])
+    assert score == 750
+    assert [t.message for t in tips] == ["a"]
+    # A freshly analysed part's tip replaces a cached one with the same id, in place.
+    _score, tips = section_analysis.merge_results([(1.0, a), (1.0, c), (1.0, b)], cached=[True, True, False])
+    assert [t.message for t in tips] == ["b", "c"]
@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+
+from backend.src.llm import ollama_client
+from backend.src.resume import semantic, store
+from backend.src.runtime.cache import LRUCache
+from tools.fake_ollama import FakeOllama
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    with FakeOllama(embedding_dim=32) as server:
+        monkeypatch.setenv("OLLAMA_URL", server.url)
+        embeddings = LRUCache()
+        monkeypatch.setattr(semantic, "_cache", lambda: embeddings)
+        yield server
+
+
+@pytest.fixture
+def resumes(monkeypatch):
+    cache = LRUCache(maxsize=100)
+    monkeypatch.setattr(store, "_cache", lambda: cache)
+    monkeypatch.setattr(semantic, "_INDEX", None)
+    return cache
+
+
+def test_embed_calls_embeddings_api(fake):
+    settings = ollama_client.OllamaSettings(ollama_url=fake.url, ollama_model="m", embedding_model="e")
+    vector = ollama_client.embed("python developer", settings=settings)
+    assert len(vector) == 32
+    assert fake.embedding_requests == 1
+
+
+def test_embeddings_are_cached_by_content(fake):
+    first = semantic.embedding_for("Senior Python developer")
+    again = semantic.embedding_for("Senior Python developer")
+    assert fake.embedding_requests == 1
+    assert np.allclose(first, again)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+
+    semantic.embedding_for("Senior Go developer")
+    assert fake.embedding_requests == 2
+
+
+def test_rank_by_similarity_follows_the_store(fake, resumes):
+    store.put("a" * 64, "python django postgres backend", {"name": "Ada"})
+    store.put("b" * 64, "watercolour painting and illustration", {"name": "Bob"})
+
+    candidates, indexed = semantic.rank("backend python postgres", 2)
+    assert indexed == 2
+    assert [c.name for c in candidates] == ["Ada", "Bob"]
+    assert candidates[0].score > candidates[1].score
+
+    resumes.delete("a" * 64)
+    store.put("c" * 64, "python backend services", {"name": "Cy"})
+    candidates, _ = semantic.rank("backend python postgres", 2)
+    assert [c.name for c in candidates] == ["Cy", "Bob"]
+
+
+def test_rank_embeds_a_bounded_batch_and_queues_the_rest(fake, resumes, monkeypatch):
+    monkeypatch.setenv("SEMANTIC_SYNC_BATCH", "1")
+    monkeypatch.setattr(semantic.SemanticIndex, "_start_warmer", lambda self: None)
+    for i, text in enumerate(["python backend", "go services", "java platform"]):
+        store.put(str(i) * 64, text, {"name": str(i)})
+
+    _, indexed = semantic.rank("python", 5)
+    assert (indexed, semantic.get_index().pending()) == (1, 2)
+    assert fake.embedding_requests == 2  # the query, and one resume
+
+    index = semantic.get_index()
+    assert index.embed_pending() == 2
+    assert (len(index), index.pending()) == (3, 0)
+
+
+def test_warmer_embeds_the_backlog_in_the_background(fake, resumes, monkeypatch):
+    monkeypatch.setenv("SEMANTIC_SYNC_BATCH", "0")
+    for i in range(4):
+        store.put(str(i) * 64, f"resume {i}", {"name": str(i)})
+    _, indexed = semantic.rank("resume", 5)
+    assert indexed == 0
+    semantic.get_index()._warmer.join(5)
+    assert (len(semantic.get_index()), semantic.get_index().pending()) == (4, 0)
+
+
+def test_rank_survives_a_failing_resume_and_honours_the_deadline(fake, resumes, monkeypatch):
+    monkeypatch.setattr(semantic.SemanticIndex, "_start_warmer", lambda self: None)
+    embed = semantic.embedding_for
+
+    def flaky(text, **kwargs):
+        if "broken" in text:
+            raise RuntimeError("OLLAMA_REQUEST_FAILED", "timed out")
+        return embed(text, **kwargs)
+
+    monkeypatch.setattr(semantic, "embedding_for", flaky)
+    store.put("a" * 64, "broken upload", {"name": "Ada"})
+    store.put("b" * 64, "python backend", {"name": "Bob"})
+    candidates, indexed = semantic.rank("python", 5)
+    assert (candidates, indexed) == ([], 0)
+    assert semantic.get_index().pending() == 2  # stopped at the failure; both still queued
+
+    with pytest.raises(semantic.DeadlineExceeded):
+        semantic.rank("python", 5, deadline=semantic.Deadline.after(0))
+
+
+def test_embedding_finished_after_a_rebuild_is_queued_for_the_new_index(fake, resumes, monkeypatch):
+    index = semantic.SemanticIndex()
+    monkeypatch.setattr(index, "_start_warmer", lambda: None)
+    for i in range(3):
+        store.put(str(i) * 64, f"resume {i}", {"name": str(i)})
+    assert index.sync() == 3
+    late = store.put("d" * 64, "late resume", {"name": "d"})
+    for resume_id in ("1" * 64, "2" * 64, "d" * 64):
+        resumes.delete(resume_id)
+
+    old = index.vectors
+    embed = semantic.embedding_for
+
+    def rebuild_meanwhile(text, **kwargs):
+        index.sync(limit=0)  # 3 vectors, 1 stored resume: starts over
+        return embed(text, **kwargs)
+
+    monkeypatch.setattr(semantic, "embedding_for", rebuild_meanwhile)
+    index.add(late)
+    assert index.vectors is not old and "d" * 64 not in old
+    assert (len(index), index.pending()) == (0, 2)  # resume 0 from the feed, and the late one
+
+
+def _unit(rows):
+    return (rows / np.linalg.norm(rows, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_vector_index_remove_keeps_rows_consistent():
+    index = semantic.VectorIndex()
+    vectors = _unit(np.random.default_rng(1).normal(size=(5, 8)))
+    for i, v in enumerate(vectors):
+        index.add(str(i), v)
+    index.remove("1")
+    assert len(index) == 4
+    for i in (0, 2, 3, 4):
+        assert index.search(vectors[i], 1)[0][0] == str(i)
+
+
+def test_partitioned_search_matches_brute_force_on_clustered_data():
+    rng = np.random.default_rng(2)
+    centers = rng.normal(size=(20, 16))
+    vectors = _unit(np.repeat(centers, 100, axis=0) + 0.1 * rng.normal(size=(2000, 16)))
+    exact = semantic.VectorIndex(partition_threshold=10**9)
+    approx = semantic.VectorIndex(partition_threshold=500, nprobe=8)
+    for i, v in enumerate(vectors):
+        exact.add(str(i), v)
+        approx.add(str(i), v)
+
+    hits = 0
+    for q in vectors[::50]:
+        want = {item for item, _ in exact.search(q, 10)}
+        got = approx.search(q, 10)
+        hits += len(want & {item for item, _ in got})
+    assert approx.partitioned and not exact.partitioned
+    assert hits / (40 * 10) > 0.9
@@ -0,0 +1,69 @@
+import pytest
+
+from backend.src.llm import analyze_service, ollama_client, tiers
+
+ANSWER = '{"score": 500, "tips": []}'
+
+
+def _settings(**overrides):
+    values = dict(quick=tiers.ModelTier("quick", "small"), deep=tiers.ModelTier("deep", "large"))
+    values.update(overrides)
+    return tiers.TierSettings(**values)
+
+
+def test_auto_picks_by_input_size_and_queue_depth():
+    settings = _settings(auto_quick_chars=100, auto_busy_quick_chars=1000, auto_busy_depth=3)
+    assert tiers.choose(100, 0, settings) == tiers.QUICK
+    assert tiers.choose(500, 0, settings) == tiers.DEEP
+    # Busy: mid-sized inputs move to the quick model...
+    assert tiers.choose(500, 3, settings) == tiers.QUICK
+    # ...but not inputs it cannot take.
+    assert tiers.choose(5000, 3, settings) == tiers.DEEP
+
+
+def test_resolve_reads_tier_config(monkeypatch):
+    monkeypatch.setenv("OLLAMA_MODEL", "default-model")
+    monkeypatch.setenv("OLLAMA_QUICK_MODEL", "small")
+    monkeypatch.setenv("OLLAMA_QUICK_OPTIONS", '{"num_ctx": 2048}')
+    quick = tiers.resolve("quick", 10)
+    assert (quick.name, quick.model, quick.options) == ("quick", "small", {"num_ctx": 2048})
+    deep = tiers.resolve("DEEP", 10)
+    assert (deep.name, deep.model, deep.options) == ("deep", "default-model", {})
+    assert tiers.resolve(None, 10).name == "quick"
+    with pytest.raises(ValueError):
+        tiers.resolve("huge", 10)
+
+
+def test_options_must_be_json_object(monkeypatch):
+    monkeypatch.setenv("OLLAMA_DEEP_OPTIONS", "[1, 2]")
+    with pytest.raises(ValueError):
+        tiers.get_settings()
+
+
+def test_analyze_uses_tier_model_and_options(monkeypatch):
+    calls = []
+
+    def fake_generate(_prompt, **kwargs):
+        calls.append(kwargs)
+        return ANSWER
+
+    monkeypatch.setattr(analyze_service.ollama_client, "generate", fake_generate)
+    tier = tiers.ModelTier("quick", "small", {"temperature": 0.0, "num_ctx": 2048})
+    analyze_service.analyze("cv", "job", tier=tier)
+    assert calls[0]["settings"].ollama_model == "small"
+    assert calls[0]["options"] == {"temperature": 0.0, "num_ctx": 2048}
+
+
+def test_generate_counts_requests_in_flight(monkeypatch):
+    seen = []
+
+    def fake_generate_once(_prompt, **_kwargs):
+        seen.append(ollama_client.in_flight())
+        return ANSWER
+
+    monkeypatch.setattr(ollama_client, "_generate_once", fake_generate_once)
+    settings = ollama_client.OllamaSettings(ollama_url="http://127.0.0.1:9", ollama_model="m")
+    before = ollama_client.in_flight()
+    ollama_client.generate("p", settings=settings)
+    assert seen == [before + 1]
+    assert ollama_client.in_flight() == before
@@ -0,0 +1 @@
+"""Developer tools (load testing, fakes); not imported by the API or backend."""
@@ -0,0 +1,278 @@
+"""
+LLM analysis benchmark: models and prompt variants compared on a fixed corpus.
+
+    python -m tools.bench_llm corpus.jsonl --models small:latest,large:latest \\
+        --variant terse=prompts/terse.txt --repeat 3 --json report.json
+
+Every (CV, job) case of the corpus (JSONL: `cv_text`, `job_text`, optional
+`id`) goes through analyze_service.analyze once per model, prompt variant and
+repeat, one at a time. "default" is PROMPT_TEMPLATE; `--variant NAME=FILE`
+adds a template with the same {{RESUME_TEXT}} / {{JOB_TEXT}} placeholders.
+
+Per model and variant it reports wall time per analysis, prompt and eval
+tokens/sec (Ollama's own counters: streams are read to the end, unless
+`--early-stop` keeps production's cut-off at the closing brace, and eval
+tokens/sec is then estimated from streamed chunks), the INVALID_MODEL_OUTPUT
+rate and the score spread across repeats of a case (mean standard deviation).
+
+Runs against `--url` (default: OLLAMA_URL). `--record FILE` saves every model
+response; `--replay FILE` answers from such a recording through a local
+FakeOllama instead, so a comparison can be re-run without the models.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from backend.src.llm import analyze_service, ollama_client, tiers
+from backend.src.llm.prompt import build_prompt
+from .fake_ollama import FakeOllama, load_recordings
+from .loadtest import percentile
+
+DEFAULT_VARIANT = "default"
+PLACEHOLDERS = ("{{RESUME_TEXT}}", "{{JOB_TEXT}}")
+
+
+@dataclass(frozen=True)
+class Case:
+    case_id: str
+    cv_text: str
+    job_text: str
+
+
+@dataclass(frozen=True)
+class Run:
+    model: str
+    variant: str
+    case_id: str
+    seconds: float
+    error: Optional[str]  # None on success
+    score: Optional[int]
+    stats: Optional[ollama_client.GenerationStats]  # None if the generation itself failed
+
+
+def load_corpus(path: str) -> List[Case]:
+    cases: List[Case] = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                cases.append(Case(str(item.get("id") or number), item["cv_text"], item["job_text"]))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f"{path}:{number}: expected an object with cv_text and job_text: {e!r}") from None
+    if not cases:
+        raise ValueError(f"{path}: empty corpus")
+    return cases
+
+
+def load_variants(specs: Sequence[str]) -> Dict[str, Optional[str]]:
+    """`NAME=FILE` specs as templates by name, after "default" (None: PROMPT_TEMPLATE)."""
+    variants: Dict[str, Optional[str]] = {DEFAULT_VARIANT: None}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        if not sep or not name or not path:
+            raise ValueError(f"Invalid variant {spec!r} (expected NAME=FILE)")
+        template = Path(path).read_text(encoding="utf-8")
+        missing = [p for p in PLACEHOLDERS if p not in template]
+        if missing:
+            raise ValueError(f"Variant {name!r} lacks {', '.join(missing)}")
+        variants[name] = template
+    return variants
+
+
+def run_matrix(
+    cases: Sequence[Case],
+    models: Sequence[str],
+    variants: Mapping[str, Optional[str]],
+    *,
+    repeat: int = 1,
+    options: Optional[Mapping] = None,
+    early_stop: bool = False,
+) -> List[Run]:
+    """
+    Analyse every case with every model and variant, `repeat` times, sequentially.
+    Circuit breakers are reset per (model, variant), so a broken one cannot fail
+    the next ones fast.
+    """
+    runs: List[Run] = []
+    for model in models:
+        tier = tiers.ModelTier("bench", model, dict(options or {}))
+        for variant, template in variants.items():
+            ollama_client.reset_breakers()
+            for case in cases:
+                for _ in range(max(1, repeat)):
+                    runs.append(_run_once(case, tier, variant, template, early_stop))
+    return runs
+
+
+def _run_once(case: Case, tier: tiers.ModelTier, variant: str, template: Optional[str], early_stop: bool) -> Run:
+    error, score = None, None
+    with ollama_client.collecting_stats(drain=not early_stop) as stats:
+        started = time.perf_counter()
+        try:
+            score = analyze_service.analyze(case.cv_text, case.job_text, tier=tier, template=template).score
+        except analyze_service.DomainError as e:
+            error = e.code
+        except RuntimeError as e:
+            error = str(e.args[0]) if e.args else type(e).__name__
+        seconds = time.perf_counter() - started
+    return Run(tier.model, variant, case.case_id, seconds, error, score, stats[-1] if stats else None)
+
+
+def _mean(values: Sequence[float]) -> Optional[float]:
+    return statistics.fmean(values) if values else None
+
+
+def summarize(runs: Sequence[Run]) -> List[dict]:
+    """One report row per (model, variant), in run order."""
+    groups: Dict[Tuple[str, str], List[Run]] = {}
+    for run in runs:
+        groups.setdefault((run.model, run.variant), []).append(run)
+    report = []
+    for (model, variant), group in groups.items():
+        wall = sorted(r.seconds for r in group)
+        errors: Dict[str, int] = {}
+        scores: Dict[str, List[int]] = {}
+        for r in group:
+            if r.error is not None:
+                errors[r.error] = errors.get(r.error, 0) + 1
+            if r.score is not None:
+                scores.setdefault(r.case_id, []).append(r.score)
+        stats = [r.stats for r in group if r.stats is not None]
+        prompt_rates = [s.prompt_tokens_per_second for s in stats if s.prompt_tokens_per_second is not None]
+        eval_rates = [s.eval_tokens_per_second for s in stats if s.eval_tokens_per_second is not None]
+        spreads = [statistics.pstdev(values) for values in scores.values() if len(values) > 1]
+        report.append(
+            {
+                "model": model,
+                "variant": variant,
+                "runs": len(group),
+                "ok": sum(1 for r in group if r.error is None),
+                "invalid_output_rate": errors.get("INVALID_MODEL_OUTPUT", 0) / len(group),
+                "errors": dict(sorted(errors.items(), key=lambda kv: -kv[1])),
+                "wall_mean_s": statistics.fmean(wall),
+                "wall_p50_s": percentile(wall, 50),
+                "wall_p95_s": percentile(wall, 95),
+                "first_chunk_mean_s": _mean([s.first_chunk_seconds for s in stats]),
+                "prompt_tokens_per_s": _mean(prompt_rates),
+                "eval_tokens_per_s": _mean(eval_rates),
+                "score_mean": _mean([v for values in scores.values() for v in values]),
+                # Mean over cases of the score's standard deviation across repeats.
+                "score_stdev": _mean(spreads),
+                "case_scores": scores,
+            }
+        )
+    return report
+
+
+def recordings(runs: Sequence[Run], cases: Sequence[Case], variants: Mapping[str, Optional[str]]) -> List[dict]:
+    """Replayable responses (see fake_ollama.load_recordings) of the runs whose generation succeeded."""
+    by_id = {case.case_id: case for case in cases}
+    items = []
+    for run in runs:
+        if run.stats is None:
+            continue
+        case = by_id[run.case_id]
+        prompt = build_prompt(case.cv_text, case.job_text, template=variants[run.variant])
+        item = {
+            "model": run.model,
+            "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "response": run.stats.response,
+        }
+        for key, value in (
+            ("prompt_eval_count", run.stats.prompt_tokens),
+            ("prompt_eval_duration", run.stats.prompt_seconds),
+            ("eval_count", run.stats.eval_tokens),
+            ("eval_duration", run.stats.eval_seconds),
+        ):
+            if value is not None:
+                item[key] = int(value * 1e9) if key.endswith("duration") else value
+        items.append(item)
+    return items
+
+
+def _fmt(value: Optional[float], spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def print_report(report: Sequence[dict]) -> None:
+    print(
+        f"{'model':<24} {'variant':<12} {'runs':>5} {'invalid':>8} {'errors':>7} {'p50 s':>7} {'p95 s':>7}"
+        f" {'prompt t/s':>11} {'eval t/s':>9} {'score':>7} {'sd':>6}"
+    )
+    for row in report:
+        other_errors = sum(n for code, n in row["errors"].items() if code != "INVALID_MODEL_OUTPUT")
+        print(
+            f"{row['model']:<24} {row['variant']:<12} {row['runs']:>5} {row['invalid_output_rate']:>8.1%}"
+            f" {other_errors:>7} {row['wall_p50_s']:>7.2f} {row['wall_p95_s']:>7.2f}"
+            f" {_fmt(row['prompt_tokens_per_s'], '.1f'):>11} {_fmt(row['eval_tokens_per_s'], '.1f'):>9}"
+            f" {_fmt(row['score_mean'], '.0f'):>7} {_fmt(row['score_stdev'], '.1f'):>6}"
+        )
+    for row in report:
+        for code, count in row["errors"].items():
+            print(f"{row['model']} / {row['variant']}: {count} x {code}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="JSONL file of {id?, cv_text, job_text}")
+    parser.add_argument("--models", help="Comma-separated Ollama models (default: OLLAMA_MODEL)")
+    parser.add_argument("--variant", action="append", default=[], help="NAME=FILE prompt template (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Analyses per case, model and variant")
+    parser.add_argument("--options", help='Ollama options for every model, as JSON (e.g. {"num_ctx": 8192})')
+    parser.add_argument("--early-stop", action="store_true", help="Close streams at the JSON answer, like production")
+    parser.add_argument("--url", help="Ollama URL (default: OLLAMA_URL)")
+    parser.add_argument("--replay", help="Answer from this recording instead of Ollama")
+    parser.add_argument("--record", help="Write every response to this JSONL recording")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        cases = load_corpus(args.corpus)
+        variants = load_variants(args.variant)
+        options = json.loads(args.options) if args.options else {}
+        if not isinstance(options, dict):
+            raise ValueError("--options must be a JSON object")
+        replay = load_recordings(args.replay) if args.replay else None
+    except (OSError, ValueError) as e:
+        print(f"bench_llm: {e}", file=sys.stderr)
+        return 2
+
+    fake = FakeOllama(replay=replay).start() if replay is not None else None
+    if fake is not None or args.url:
+        os.environ["OLLAMA_URL"] = fake.url if fake is not None else args.url
+    # A slow model is what is being measured, not a reason to fail fast.
+    os.environ.setdefault("OLLAMA_BREAKER_SLOW_SECONDS", "0")
+    models = [m for m in (args.models or "").split(",") if m] or [ollama_client.get_settings().ollama_model]
+    try:
+        runs = run_matrix(cases, models, variants, repeat=args.repeat, options=options, early_stop=args.early_stop)
+    finally:
+        if fake is not None:
+            fake.stop()
+
+    report = summarize(runs)
+    print(f"{len(cases)} cases x {len(variants)} variants x {len(models)} models, {args.repeat} run(s) each")
+    print_report(report)
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            for item in recordings(runs, cases, variants):
+                f.write(json.dumps(item) + "\n")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"cases": len(cases), "repeat": args.repeat, "results": report}, f, indent=2)
+    return 0 if any(row["ok"] for row in report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
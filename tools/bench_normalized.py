@@ -0,0 +1,98 @@
+"""
+Memory and throughput of normalized resumes: plain dicts vs NormalizedResume.
+
+    python -m tools.bench_normalized --count 50000
+
+Synthetic resumes are decoded from JSON one by one (like loading the bulk CLI's
+JSONL output), so every resume starts with its own string objects. Retained
+memory is measured with tracemalloc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Sequence
+
+from backend.src.pipeline.normalizer import normalize_extracted_data, normalize_resume
+
+SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "SQL", "PostgreSQL", "MySQL", "Docker",
+    "Kubernetes", "AWS", "GCP", "Azure", "React", "Vue", "Django", "FastAPI", "Flask", "Spark",
+    "Pandas", "NumPy", "TensorFlow", "PyTorch", "Git", "Linux", "Terraform", "Kafka", "Redis", "GraphQL",
+)
+DEGREES = ("B.Sc Computer Science", "M.Sc Data Science", "B.Eng Software Engineering", "MBA")
+TITLES = ("Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer")
+
+
+def synthetic_raw(rng: random.Random, i: int, *, section_chars: int) -> str:
+    """One raw (parser output) resume, serialized as JSON."""
+    summary = ("Engineer focused on reliable services. " * (section_chars // 40 + 1))[:section_chars]
+    skills = rng.sample(SKILLS, rng.randint(5, 15))
+    return json.dumps(
+        {
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "mobile_number": f"+1 555 {i:07d}",
+            "skills": skills,
+            "total_experience": rng.randint(0, 20),
+            "degree": [rng.choice(DEGREES)],
+            "college_name": [],
+            "designation": [rng.choice(TITLES)],
+            "company_names": [f"Company {rng.randint(1, 500)}"],
+            "no_of_pages": rng.randint(1, 3),
+            "sections": {
+                "summary": {"start": 0, "end": len(summary)},
+                "skills": {"start": len(summary), "end": len(summary) + 40},
+            },
+        }
+    )
+
+
+def measure(raws: Sequence[str], build: Callable[[dict], object]) -> tuple[float, int]:
+    """(resumes per second, bytes retained) for building every resume with `build`."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept: List[object] = [build(json.loads(raw)) for raw in raws]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return len(raws) / elapsed, retained
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--section-chars", type=int, default=0, help="Summary section length (0: fields only)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    raws = [synthetic_raw(rng, i, section_chars=args.section_chars) for i in range(args.count)]
+    # Throughput is timed without tracemalloc overhead; memory separately.
+    results = {}
+    for label, build in (("dict", normalize_extracted_data), ("NormalizedResume", normalize_resume)):
+        start = time.perf_counter()
+        for raw in raws:
+            build(json.loads(raw))
+        rate = args.count / (time.perf_counter() - start)
+        _traced_rate, retained = measure(raws, build)
+        results[label] = (rate, retained)
+
+    print(f"{args.count} resumes, section text {args.section_chars} chars")
+    print(f"{'representation':<18} {'resumes/s':>12} {'retained MB':>12} {'bytes/resume':>13}")
+    for label, (rate, retained) in results.items():
+        print(f"{label:<18} {rate:>12.0f} {retained / 1e6:>12.1f} {retained / args.count:>13.0f}")
+    base = results["dict"][1]
+    print(f"NormalizedResume retains {100 * (1 - results['NormalizedResume'][1] / base):.0f}% less memory")
+
+
+if __name__ == "__main__":
+    main()
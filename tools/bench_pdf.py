@@ -0,0 +1,107 @@
+"""
+PDF text backends compared on a corpus: time per document and field parity.
+
+    python -m tools.bench_pdf resumes/ --repeat 3
+
+Every installed backend (see extractors.PDF_BACKENDS) extracts every PDF; the
+fields derived from its text are compared with pdfminer's, the reference, up
+to runs of whitespace (pdfium collapses the spacing pdfminer keeps from the
+layout). Exits non-zero if any document differs, so it can gate a backend change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from backend.src.pipeline import extractors
+from backend.src.pipeline.parser import derive_fields, section_text
+
+REFERENCE = "pdfminer"
+# Fields compared between backends (sections by name and text).
+PARITY_FIELDS = ("name", "email", "mobile_number", "skills", "degree", "company_names", "sections")
+
+
+def find_pdfs(paths: Sequence[str]) -> List[Path]:
+    found: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        found.extend(sorted(path.rglob("*.pdf")) if path.is_dir() else [path])
+    return found
+
+
+def _fold(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, list):
+        return [_fold(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _fold(v) for k, v in value.items()}
+    return value
+
+
+def fields(text: str) -> dict:
+    """The compared fields derived from `text`, whitespace-folded."""
+    data = derive_fields(text)
+    data["sections"] = {name: section_text(text, span) for name, span in data["sections"].items()}
+    return {key: _fold(data[key]) for key in PARITY_FIELDS}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="PDF files or directories (searched recursively)")
+    parser.add_argument("--repeat", type=int, default=1, help="Extractions per document and backend")
+    args = parser.parse_args(argv)
+
+    pdfs = find_pdfs(args.paths)
+    backends = {name: extractors.get_pdf_backend(name) for name in extractors.PDF_BACKENDS}
+    installed = {name: extract for name, extract in backends.items() if extract is not None}
+    if REFERENCE not in installed:
+        sys.exit("pdfminer is not installed")
+    times: Dict[str, List[float]] = {name: [] for name in installed}
+    failures: Dict[str, int] = {name: 0 for name in installed}
+    mismatches: Dict[str, List[str]] = {name: [] for name in installed}
+
+    for pdf in pdfs:
+        derived = {}
+        for name, extract in installed.items():
+            try:
+                for _ in range(max(1, args.repeat)):
+                    start = time.perf_counter()
+                    text = extract(str(pdf))
+                    times[name].append(time.perf_counter() - start)
+            except Exception as e:
+                failures[name] += 1
+                print(f"{name}: {pdf}: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            derived[name] = fields(text)
+        for name, data in derived.items():
+            if REFERENCE in derived and data != derived[REFERENCE]:
+                diff = sorted(k for k in PARITY_FIELDS if data[k] != derived[REFERENCE][k])
+                mismatches[name].append(f"{pdf} ({', '.join(diff)})")
+
+    skipped = sorted(set(backends) - set(installed))
+    print(f"{len(pdfs)} PDFs, {args.repeat} run(s) each" + (f"; not installed: {', '.join(skipped)}" if skipped else ""))
+    print(f"{'backend':<10} {'mean ms':>9} {'p50 ms':>9} {'max ms':>9} {'failed':>7} {'differs':>8}")
+    for name, samples in times.items():
+        if samples:
+            mean, p50, worst = statistics.fmean(samples), statistics.median(samples), max(samples)
+        else:
+            mean = p50 = worst = float("nan")
+        print(
+            f"{name:<10} {mean * 1000:>9.1f} {p50 * 1000:>9.1f} {worst * 1000:>9.1f}"
+            f" {failures[name]:>7} {len(mismatches[name]):>8}"
+        )
+    for name, items in mismatches.items():
+        for item in items:
+            print(f"differs from {REFERENCE}: {name}: {item}")
+    if any(mismatches.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
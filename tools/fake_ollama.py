@@ -0,0 +1,307 @@
+"""
+Offline stand-in for Ollama's `/api/generate` and `/api/embeddings`.
+
+Speaks the same protocol as the real server (NDJSON chunks with `response` /
+`done`, or a single JSON object when `"stream": false`) and returns output that
+passes AnalyzeResult validation. Embeddings are hashed bags of words: texts
+sharing words get similar vectors, which is enough to exercise vector search. Latency, chunking and failures are injectable,
+so the API can be load-tested without a model:
+
+    python -m tools.fake_ollama --port 11434 --latency lognormal:-1.5,0.5 --failure-rate 0.02
+
+With `--replay`, generations answer from responses recorded off a real Ollama
+(tools/bench_llm.py --record), looked up by model and prompt, with the recorded
+token counts and durations in the final chunk; unrecorded prompts get a 404.
+
+Latency specs (seconds, total time to generate one response):
+    fixed:0.2   uniform:0.1,0.5   exp:0.3 (mean)   lognormal:MU,SIGMA
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+FAILURE_MODES = ("http_500", "disconnect", "invalid_json")
+DEFAULT_EMBEDDING_DIM = 64
+# Ollama's final-chunk counters kept in recordings (durations in nanoseconds).
+RECORDED_COUNTERS = ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration")
+
+DEFAULT_OUTPUT = {
+    "score": 712,
+    "tips": [
+        {"id": "keywords", "message": "Mirror more of the job's required skills", "severity": "WARNING"},
+        {"id": "impact", "message": "Experience bullets show measurable impact", "severity": "GOOD"},
+    ],
+}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Turn a latency spec (see module docstring) into a sampler."""
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(",")] if params else []
+        if kind == "fixed" and len(values) == 1:
+            return lambda _rng: values[0]
+        if kind == "uniform" and len(values) == 2:
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == "exp" and len(values) == 1:
+            return lambda rng: rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+        if kind == "lognormal" and len(values) == 2:
+            return lambda rng: rng.lognormvariate(values[0], values[1])
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency spec: {spec!r} (e.g. fixed:0.2, uniform:0.1,0.5, exp:0.3, lognormal:-1.5,0.5)")
+
+
+def recording_key(model: str, prompt: str) -> str:
+    return f"{model}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}"
+
+
+def load_recordings(path: str) -> Dict[str, List[dict]]:
+    """
+    Recordings from a JSONL file, by recording_key. Each line: `model`,
+    `prompt_sha256`, `response` and optionally RECORDED_COUNTERS.
+    """
+    recordings: Dict[str, List[dict]] = {}
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                key = f"{item['model']}:{item['prompt_sha256']}"
+                if not isinstance(item["response"], str):
+                    raise TypeError("response must be a string")
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{number}: not a recording: {e!r}") from None
+            recordings.setdefault(key, []).append(item)
+    return recordings
+
+
+class FakeOllama:
+    """
+    A threaded fake Ollama server on 127.0.0.1; use as a context manager.
+
+    Args:
+        latency: Latency spec or sampler returning seconds per response
+        chunks: Number of streamed chunks the output is split into
+        failure_rate: Probability (0-1) that a request fails
+        failure_modes: Failure kinds to pick from (see FAILURE_MODES)
+        output: JSON object the "model" returns
+        seed: Seed for latency and failure sampling
+        embedding_dim: Length of /api/embeddings vectors (not subject to latency or failures)
+        replay: Recorded responses by recording_key (see load_recordings) to
+            answer with instead of `output`; a prompt recorded several times
+            gets its responses in turn
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: str | Callable[[random.Random], float] = "fixed:0",
+        chunks: int = 8,
+        failure_rate: float = 0.0,
+        failure_modes: Sequence[str] = FAILURE_MODES,
+        output: Optional[dict] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+        embedding_dim: int = DEFAULT_EMBEDDING_DIM,
+        replay: Optional[Mapping[str, Sequence[dict]]] = None,
+    ) -> None:
+        unknown = set(failure_modes) - set(FAILURE_MODES)
+        if unknown:
+            raise ValueError(f"Unknown failure modes: {sorted(unknown)}")
+        self.sample_latency = parse_latency(latency) if isinstance(latency, str) else latency
+        self.chunks = max(1, chunks)
+        self.failure_rate = failure_rate
+        self.failure_modes = tuple(failure_modes)
+        self.output = json.dumps(output if output is not None else DEFAULT_OUTPUT)
+        self.embedding_dim = embedding_dim
+        self.replay = replay
+        self._replayed: Dict[str, int] = {}
+        self.requests = 0
+        self.embedding_requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def _plan(self) -> tuple[float, Optional[str]]:
+        """Latency and failure mode (or None) for the next request."""
+        with self._lock:
+            self.requests += 1
+            latency = max(0.0, self.sample_latency(self._rng))
+            failure = None
+            if self.failure_modes and self._rng.random() < self.failure_rate:
+                failure = self._rng.choice(self.failure_modes)
+        return latency, failure
+
+    def embedding(self, text: str) -> list[float]:
+        """Unit-length hashed bag of words of `text`."""
+        with self._lock:
+            self.embedding_requests += 1
+        vector = [0.0] * self.embedding_dim
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.embedding_dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def recorded(self, model: str, prompt: str) -> Optional[dict]:
+        """The next recorded response for `model` and `prompt` (None if there is none)."""
+        key = recording_key(model, prompt)
+        items = (self.replay or {}).get(key)
+        if not items:
+            return None
+        with self._lock:
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+        return items[index % len(items)]
+
+    def _pieces(self, text: str) -> list[str]:
+        size = max(1, -(-len(text) // self.chunks))
+        return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _handler_for(fake: FakeOllama):
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path not in ("/api/generate", "/api/embeddings"):
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": "invalid request body"})
+                return
+            if self.path == "/api/embeddings":
+                self._send_json(200, {"embedding": fake.embedding(str(body.get("prompt") or ""))})
+                return
+            model, prompt = str(body.get("model") or ""), str(body.get("prompt") or "")
+            if fake.replay is not None:
+                recording = fake.recorded(model, prompt)
+                if recording is None:
+                    self._send_json(404, {"error": f"fake ollama: no recording for model {model!r} and this prompt"})
+                    return
+                output = str(recording["response"])
+                counters = {k: recording[k] for k in RECORDED_COUNTERS if k in recording}
+            else:
+                output = fake.output
+                counters = {"prompt_eval_count": max(1, len(prompt) // 4)}
+            latency, failure = fake._plan()
+            text = "this is not json" if failure == "invalid_json" else output
+            if fake.replay is None:
+                counters.update(eval_count=len(fake._pieces(text)), eval_duration=int(latency * 1e9))
+            if failure == "http_500":
+                time.sleep(latency)
+                self._send_json(500, {"error": "fake ollama: injected failure"})
+                return
+            if not body.get("stream", True):
+                time.sleep(latency)
+                self._send_json(200, {"model": model, "response": text, "done": True, **counters})
+                return
+            self._stream(text, latency, disconnect=failure == "disconnect", final={"model": model, **counters})
+
+        def _stream(self, text: str, latency: float, *, disconnect: bool, final: dict) -> None:
+            pieces = fake._pieces(text)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                for i, piece in enumerate(pieces):
+                    time.sleep(latency / len(pieces))
+                    if disconnect and i >= len(pieces) // 2:
+                        return
+                    self.wfile.write((json.dumps({"response": piece, "done": False}) + "\n").encode())
+                    self.wfile.flush()
+                self.wfile.write((json.dumps({"response": "", "done": True, **final}) + "\n").encode())
+            except OSError:
+                # Client aborted (cancellation / deadline).
+                pass
+
+        def _send_json(self, status: int, payload: dict) -> None:
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *_args):
+            pass
+
+    return _Handler
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", default="fixed:0.5")
+    parser.add_argument("--chunks", type=int, default=8)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-modes", default=",".join(FAILURE_MODES))
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--embedding-dim", type=int, default=DEFAULT_EMBEDDING_DIM)
+    parser.add_argument("--replay", help="JSONL recordings to answer from (see tools/bench_llm.py --record)")
+    args = parser.parse_args(argv)
+
+    fake = FakeOllama(
+        latency=args.latency,
+        chunks=args.chunks,
+        failure_rate=args.failure_rate,
+        failure_modes=[m for m in args.failure_modes.split(",") if m],
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        embedding_dim=args.embedding_dim,
+        replay=load_recordings(args.replay) if args.replay else None,
+    )
+    print(f"Fake Ollama listening on {fake.url}")
+    try:
+        fake._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
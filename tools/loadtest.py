@@ -0,0 +1,356 @@
+"""
+Load generator for `/parse` and `/analyze`.
+
+By default everything runs in this process and offline: a FakeOllama server,
+and the API itself under uvicorn (with PARSE_WORKERS / OLLAMA_URL pointing at
+the fake). Use `--target` to drive an already running deployment instead.
+
+    python -m tools.loadtest --requests 300 --concurrency 16 --rate 25 \\
+        --mix analyze=3,parse=1 --latency lognormal:-1.2,0.5 --failure-rate 0.02 --workers 2
+
+`--rate` > 0 is open-loop (Poisson arrivals, latency measured from the arrival
+time, so queueing shows up in the tail); `--rate 0` is closed-loop with
+`--concurrency` clients back to back. Reports throughput, p50/p95/p99 and an
+error breakdown per endpoint (`--json` writes the same report as JSON).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .fake_ollama import FAILURE_MODES, FakeOllama
+
+ENDPOINTS = ("parse", "analyze")
+DEFAULT_JOB_TEXT = "Backend engineer: Python, FastAPI, PostgreSQL, Docker, AWS. 3+ years building APIs."
+DEFAULT_CV_TEXT = """Jane Doe
+jane.doe@example.com | +1 555 0100
+
+Summary
+Backend engineer focused on Python services.
+
+Experience
+Acme Corp - Software Engineer (2019-2024)
+- Cut API latency by 40% serving 2M requests/day
+
+Education
+B.Sc. Computer Science
+
+Skills
+Python, FastAPI, PostgreSQL, Docker, AWS
+"""
+
+
+@dataclass(frozen=True)
+class Sample:
+    endpoint: str
+    status: int  # 0: transport error
+    error: Optional[str]  # None on success
+    seconds: float
+    degraded: bool = False
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(min(rank, len(sorted_values))) - 1]
+
+
+def summarize(samples: Sequence[Sample], wall_seconds: float) -> Dict[str, dict]:
+    """Per-endpoint (and "all") throughput, latency percentiles and error counts."""
+    groups: Dict[str, List[Sample]] = {"all": list(samples)}
+    for s in samples:
+        groups.setdefault(s.endpoint, []).append(s)
+    report: Dict[str, dict] = {}
+    for name, group in groups.items():
+        latencies = sorted(s.seconds for s in group)
+        errors: Dict[str, int] = {}
+        for s in group:
+            if s.error is not None:
+                errors[s.error] = errors.get(s.error, 0) + 1
+        ok = sum(1 for s in group if s.error is None)
+        report[name] = {
+            "requests": len(group),
+            "ok": ok,
+            "degraded": sum(1 for s in group if s.degraded),
+            "throughput_rps": ok / wall_seconds if wall_seconds > 0 else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+            "errors": dict(sorted(errors.items(), key=lambda kv: -kv[1])),
+        }
+    return report
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """"analyze=3,parse=1" -> [("analyze", 3.0), ("parse", 1.0)]"""
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name!r} (expected one of {', '.join(ENDPOINTS)})")
+        mix.append((name, float(weight or 1)))
+    if not mix or sum(w for _, w in mix) <= 0:
+        raise ValueError("Mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+def make_docx(cv_text: str, marker: str = "") -> bytes:
+    """A DOCX resume built from `cv_text`; `marker` makes the bytes (and resume_id) unique."""
+    import docx  # type: ignore
+
+    doc = docx.Document()
+    for line in cv_text.splitlines():
+        doc.add_paragraph(line)
+    if marker:
+        doc.add_paragraph(marker)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _error_key(status: int, body: bytes) -> str:
+    try:
+        code = (json.loads(body).get("error") or {}).get("code")
+    except Exception:
+        code = None
+    return f"{status} {code}" if code else str(status)
+
+
+async def _send(client, endpoint: str, payload) -> Tuple[int, Optional[str], bool]:
+    if endpoint == "parse":
+        filename, content = payload
+        resp = await client.post("/parse", files={"file": (filename, content)})
+    else:
+        resp = await client.post("/analyze", json=payload)
+    if resp.status_code != 200:
+        return resp.status_code, _error_key(resp.status_code, resp.content), False
+    body = resp.json()
+    degraded = bool(body.get("degraded")) if isinstance(body, dict) else False
+    return 200, None, degraded
+
+
+async def run_load(
+    base_url: str,
+    *,
+    requests: int,
+    concurrency: int,
+    rate: float = 0.0,
+    mix: Sequence[Tuple[str, float]] = (("analyze", 1.0),),
+    payloads: Dict[str, Callable[[int], object]],
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 300.0,
+    seed: Optional[int] = None,
+) -> Tuple[List[Sample], float]:
+    """
+    Issue `requests` requests against `base_url` and return (samples, wall seconds).
+
+    `payloads[endpoint](i)` builds the body for the i-th request: a
+    (filename, bytes) upload for parse, a JSON dict for analyze.
+    """
+    import httpx
+
+    rng = random.Random(seed)
+    names = [name for name, _ in mix]
+    weights = [w for _, w in mix]
+    plan = [(i, rng.choices(names, weights)[0]) for i in range(requests)]
+    bodies = [payloads[endpoint](i) for i, endpoint in plan]
+    samples: List[Sample] = []
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max(1, concurrency)),
+    ) as client:
+
+        async def one(i: int, endpoint: str, arrived: float) -> None:
+            async with limit:
+                try:
+                    status, error, degraded = await _send(client, endpoint, bodies[i])
+                except Exception as e:
+                    status, error, degraded = 0, type(e).__name__, False
+            samples.append(Sample(endpoint, status, error, time.perf_counter() - arrived, degraded))
+
+        started = time.perf_counter()
+        if rate > 0:
+            tasks = []
+            next_at = started
+            for i, endpoint in plan:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(one(i, endpoint, next_at)))
+                next_at += rng.expovariate(rate)
+            await asyncio.gather(*tasks)
+        else:
+            queue = iter(plan)
+
+            async def client_loop() -> None:
+                for i, endpoint in queue:
+                    await one(i, endpoint, time.perf_counter())
+
+            await asyncio.gather(*(client_loop() for _ in range(max(1, concurrency))))
+        wall = time.perf_counter() - started
+    return samples, wall
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api(*, ollama_url: str, workers: Optional[int] = None) -> Tuple[str, Callable[[], None]]:
+    """
+    Serve the API in a background thread; returns (base_url, stop).
+
+    Settings come from the environment, so this must run before `api.src.main`
+    is first imported in this process for `workers` to take effect. `stop`
+    restores the OLLAMA_URL / PARSE_WORKERS values it replaced.
+    """
+    import uvicorn
+
+    overrides = {"OLLAMA_URL": ollama_url}
+    if workers is not None:
+        overrides["PARSE_WORKERS"] = str(workers)
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    from api.src.main import app  # type: ignore
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="loadtest-api", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 60
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("API server failed to start")
+        time.sleep(0.05)
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join(timeout=30)
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def format_report(report: Dict[str, dict], wall_seconds: float) -> str:
+    lines = [
+        f"wall time: {wall_seconds:.2f}s",
+        f"{'endpoint':<10} {'reqs':>6} {'ok':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for name, r in report.items():
+        lines.append(
+            f"{name:<10} {r['requests']:>6} {r['ok']:>6} {r['throughput_rps']:>8.2f} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}"
+        )
+    for name, r in report.items():
+        if name == "all":
+            continue
+        if r["degraded"]:
+            lines.append(f"{name}: {r['degraded']} degraded (heuristic fallback)")
+        for key, count in r["errors"].items():
+            lines.append(f"{name}: {count} x {key}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="Base URL of a running API (default: start one in-process)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight")
+    parser.add_argument("--rate", type=float, default=0.0, help="Arrivals per second (0: closed loop)")
+    parser.add_argument("--mix", default="analyze=3,parse=1")
+    parser.add_argument("--workers", type=int, default=None, help="PARSE_WORKERS for the in-process API")
+    parser.add_argument("--latency", default="lognormal:-1.5,0.5", help="Fake Ollama latency spec")
+    parser.add_argument("--chunks", type=int, default=8, help="Fake Ollama stream chunks per response")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-modes", default=",".join(FAILURE_MODES))
+    parser.add_argument("--resume", help="Resume file to upload to /parse (default: generated DOCX)")
+    parser.add_argument("--cache-hits", action="store_true", help="Upload identical bytes (store hits after the first)")
+    parser.add_argument("--deadline-ms", type=int, default=None, help="Send X-Request-Deadline-Ms")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    if args.resume:
+        with open(args.resume, "rb") as f:
+            resume_bytes = f.read()
+        resume_name = os.path.basename(args.resume)
+
+        def parse_payload(_i: int):
+            return resume_name, resume_bytes
+
+    else:
+        shared = make_docx(DEFAULT_CV_TEXT)
+
+        def parse_payload(i: int):
+            # Unique bytes per request so every upload is really extracted.
+            return "resume.docx", shared if args.cache_hits else make_docx(DEFAULT_CV_TEXT, f"ref {i}")
+
+    def analyze_payload(_i: int):
+        return {"cv_text": DEFAULT_CV_TEXT, "job_text": DEFAULT_JOB_TEXT}
+
+    fake = None
+    stop_api = None
+    base_url = args.target
+    if base_url is None:
+        fake = FakeOllama(
+            latency=args.latency,
+            chunks=args.chunks,
+            failure_rate=args.failure_rate,
+            failure_modes=[m for m in args.failure_modes.split(",") if m],
+            seed=args.seed,
+        ).start()
+        base_url, stop_api = start_api(ollama_url=fake.url, workers=args.workers)
+    headers = {"X-Request-Deadline-Ms": str(args.deadline_ms)} if args.deadline_ms else None
+    try:
+        samples, wall = asyncio.run(
+            run_load(
+                base_url.rstrip("/"),
+                requests=args.requests,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                mix=mix,
+                payloads={"parse": parse_payload, "analyze": analyze_payload},
+                headers=headers,
+                seed=args.seed,
+            )
+        )
+    finally:
+        if stop_api is not None:
+            stop_api()
+        if fake is not None:
+            fake.stop()
+
+    report = summarize(samples, wall)
+    print(format_report(report, wall))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"wall_seconds": wall, "endpoints": report}, f, indent=2)
+    return 0 if report["all"]["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import json
+
+import pytest
+
+from backend.src.llm import ollama_client
+from backend.src.llm.prompt import build_prompt
+from tools import bench_llm
+from tools.fake_ollama import FakeOllama, load_recordings
+
+CASES = [bench_llm.Case("a", "Python developer, 5 years", "Python backend role"), bench_llm.Case("b", "cv", "job")]
+OUTPUT = {"score": 480, "tips": [{"id": "keywords", "message": "Add FastAPI", "severity": "WARNING"}]}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers():
+    ollama_client.reset_breakers()
+    yield
+    ollama_client.reset_breakers()
+
+
+def _settings(fake):
+    return ollama_client.OllamaSettings(ollama_url=fake.url, ollama_model="m")
+
+
+def test_collecting_stats_reads_ollama_counters_when_draining():
+    with FakeOllama(chunks=4, latency="fixed:0.02") as fake:
+        with ollama_client.collecting_stats(drain=True) as stats:
+            raw = ollama_client.generate("p" * 40, settings=_settings(fake), stop_after_json=True)
+        with ollama_client.collecting_stats() as early:
+            ollama_client.generate("p" * 40, settings=_settings(fake), stop_after_json=True)
+    assert json.loads(raw)["score"] == 712
+    (s,) = stats
+    assert (s.model, s.prompt_tokens, s.eval_tokens, s.chunks, s.response) == ("m", 10, 4, 4, raw)
+    assert s.eval_tokens_per_second == pytest.approx(4 / s.eval_seconds)
+    # Closed at the JSON object, before the final chunk: rate estimated from chunks.
+    assert early[0].eval_tokens is None
+    assert early[0].eval_tokens_per_second is not None
+
+
+def test_record_then_replay_reproduces_scores_and_counters(tmp_path, monkeypatch):
+    variants = {bench_llm.DEFAULT_VARIANT: None, "short": "CV: {{RESUME_TEXT}}\nJob: {{JOB_TEXT}}"}
+    with FakeOllama(output=OUTPUT) as fake:
+        monkeypatch.setenv("OLLAMA_URL", fake.url)
+        runs = bench_llm.run_matrix(CASES, ["m1"], variants, repeat=2)
+    recording = tmp_path / "rec.jsonl"
+    recording.write_text("".join(json.dumps(i) + "\n" for i in bench_llm.recordings(runs, CASES, variants)))
+
+    with FakeOllama(replay=load_recordings(str(recording))) as replay:
+        monkeypatch.setenv("OLLAMA_URL", replay.url)
+        replayed = bench_llm.run_matrix(CASES, ["m1"], variants, repeat=2)
+        unrecorded = bench_llm.run_matrix(CASES[:1], ["other-model"], variants, repeat=1)
+
+    assert [r.score for r in replayed] == [r.score for r in runs] == [480] * 8
+    assert [r.stats.eval_tokens for r in replayed] == [r.stats.eval_tokens for r in runs]
+    assert [r.stats.prompt_tokens for r in replayed] == [r.stats.prompt_tokens for r in runs]
+    assert {r.error for r in unrecorded} == {"OLLAMA_HTTP_ERROR"}
+
+
+def test_breakers_are_reset_per_model_and_variant(monkeypatch):
+    with FakeOllama(output=OUTPUT) as fake:
+        monkeypatch.setenv("OLLAMA_URL", fake.url)
+        # Left open by an earlier (model, variant), e.g. one that kept timing out.
+        breaker = ollama_client.breaker_for(ollama_client.get_settings())
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure("timeout")
+        runs = bench_llm.run_matrix(CASES, ["m1"], {"default": None})
+    assert [r.error for r in runs] == [None, None]
+
+
+def test_summarize_invalid_rate_and_score_spread(monkeypatch):
+    with FakeOllama(failure_rate=1.0, failure_modes=["invalid_json"]) as fake:
+        monkeypatch.setenv("OLLAMA_URL", fake.url)
+        invalid = bench_llm.run_matrix(CASES, ["m1"], {"default": None}, repeat=2)
+    stats = invalid[0].stats
+    valid = [
+        bench_llm.Run("m2", "default", "a", 1.0, None, 400, stats),
+        bench_llm.Run("m2", "default", "a", 3.0, None, 600, stats),
+        bench_llm.Run("m2", "default", "b", 2.0, None, 500, None),
+    ]
+    bad, good = bench_llm.summarize(invalid + valid)
+    assert (bad["model"], bad["runs"], bad["invalid_output_rate"], bad["score_mean"]) == ("m1", 4, 1.0, None)
+    assert bad["eval_tokens_per_s"] is not None
+    assert good["invalid_output_rate"] == 0.0
+    assert good["wall_p50_s"] == 2.0
+    assert good["score_mean"] == 500
+    assert good["score_stdev"] == 100  # case "a" only: "b" ran once
+    assert good["case_scores"] == {"a": [400, 600], "b": [500]}
+
+
+def test_main_replays_recording_and_writes_json(tmp_path, capsys, monkeypatch):
+    # main() points OLLAMA_URL at the replay server; restore it afterwards.
+    monkeypatch.setenv("OLLAMA_URL", "http://unused")
+    monkeypatch.setenv("OLLAMA_BREAKER_SLOW_SECONDS", "0")
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("".join(json.dumps({"cv_text": c.cv_text, "job_text": c.job_text}) + "\n" for c in CASES))
+    variant = tmp_path / "terse.txt"
+    variant.write_text("Score {{RESUME_TEXT}} for {{JOB_TEXT}} as JSON")
+    variants = bench_llm.load_variants([f"terse={variant}"])
+    cases = bench_llm.load_corpus(str(corpus))
+    runs = [
+        bench_llm.Run("m1", name, case.case_id, 0.1, None, 480, _stats(case, template))
+        for case in cases
+        for name, template in variants.items()
+    ]
+    recording = tmp_path / "rec.jsonl"
+    recording.write_text("".join(json.dumps(i) + "\n" for i in bench_llm.recordings(runs, cases, variants)))
+
+    report_path = tmp_path / "report.json"
+    code = bench_llm.main(
+        [
+            str(corpus),
+            *("--models", "m1", "--variant", f"terse={variant}", "--repeat", "2"),
+            *("--replay", str(recording), "--json", str(report_path)),
+        ]
+    )
+    assert code == 0
+    report = json.loads(report_path.read_text())
+    rows = [(r["variant"], r["ok"], r["score_stdev"]) for r in report["results"]]
+    assert rows == [("default", 4, 0), ("terse", 4, 0)]
+    assert report["results"][0]["prompt_tokens_per_s"] == pytest.approx(100.0)
+    assert "terse" in capsys.readouterr().out
+
+
+def _stats(case, template):
+    return ollama_client.GenerationStats(
+        model="m1",
+        prompt_chars=len(build_prompt(case.cv_text, case.job_text, template=template)),
+        response=json.dumps(OUTPUT),
+        first_chunk_seconds=0.05,
+        seconds=0.1,
+        chunks=3,
+        prompt_tokens=50,
+        prompt_seconds=0.5,
+        eval_tokens=3,
+        eval_seconds=0.05,
+    )
+
+
+def test_load_variants_rejects_templates_without_placeholders(tmp_path):
+    bad = tmp_path / "bad.txt"
+    bad.write_text("no placeholders")
+    with pytest.raises(ValueError, match="RESUME_TEXT"):
+        bench_llm.load_variants([f"bad={bad}"])
+    with pytest.raises(ValueError, match="NAME=FILE"):
+        bench_llm.load_variants(["bad"])
@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import pytest
+
+from backend.src.llm import ollama_client
+from tools import loadtest
+from tools.fake_ollama import FakeOllama, parse_latency
+
+
+def _settings(fake):
+    return ollama_client.OllamaSettings(ollama_url=fake.url, ollama_model="m")
+
+
+def test_fake_ollama_streams_valid_output():
+    with FakeOllama(chunks=5) as fake:
+        raw = ollama_client.generate("p", settings=_settings(fake))
+    assert raw.startswith('{"score": 712')
+    assert fake.requests == 1
+
+
+def test_fake_ollama_injected_failures():
+    with FakeOllama(failure_rate=1.0, failure_modes=["http_500"]) as fake:
+        with pytest.raises(RuntimeError) as exc:
+            ollama_client.generate("p", settings=_settings(fake))
+    assert exc.value.args[0] == "OLLAMA_HTTP_ERROR"
+
+
+def test_parse_latency_specs():
+    import random
+
+    rng = random.Random(0)
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2
+    with pytest.raises(ValueError):
+        parse_latency("normal:1")
+
+
+def test_summarize_percentiles_and_errors():
+    samples = [loadtest.Sample("analyze", 200, None, i / 100) for i in range(1, 101)]
+    samples.append(loadtest.Sample("parse", 504, "504 DEADLINE_EXCEEDED", 2.0))
+    report = loadtest.summarize(samples, wall_seconds=10.0)
+    assert report["analyze"]["p50_ms"] == pytest.approx(500)
+    assert report["analyze"]["p99_ms"] == pytest.approx(990)
+    assert report["analyze"]["throughput_rps"] == pytest.approx(10.0)
+    assert report["parse"]["errors"] == {"504 DEADLINE_EXCEEDED": 1}
+    assert report["all"]["requests"] == 101
+
+
+def test_run_load_against_in_process_api(monkeypatch):
+    # Half the answers are 500s: keep the circuit closed so every request reaches the fake.
+    monkeypatch.setenv("OLLAMA_BREAKER_FAILURES", "1000")
+    monkeypatch.setenv("OLLAMA_URL", "http://before")
+    with FakeOllama(latency="fixed:0.01", failure_rate=0.5, failure_modes=["http_500"], seed=3) as fake:
+        base_url, stop = loadtest.start_api(ollama_url=fake.url)
+        try:
+            samples, wall = asyncio.run(
+                loadtest.run_load(
+                    base_url,
+                    requests=20,
+                    concurrency=4,
+                    mix=loadtest.parse_mix("analyze=1"),
+                    payloads={"analyze": lambda _i: {"cv_text": "cv", "job_text": "job"}},
+                    seed=3,
+                )
+            )
+        finally:
+            stop()
+    assert os.environ["OLLAMA_URL"] == "http://before"
+    report = loadtest.summarize(samples, wall)["analyze"]
+    assert report["requests"] == 20
+    assert report["ok"] + report["errors"].get("502 OLLAMA_HTTP_ERROR", 0) == 20
+    assert 0 < report["ok"] < 20